@@ -1,14 +1,20 @@
 """Dictionary-backed translation agent implementations."""
 from __future__ import annotations
 
-import difflib
 import re
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Mapping, Optional, Union
 
 from .base import AgentDescription, TranslationAgent
+from .fuzzy_index import FuzzyIndex
+from .lexicon import TOKEN_RE, Lexicon, open_lexicon
+from .phrase_matcher import PhraseMatcher
+from .token_cache import TokenCache, dictionary_fingerprint
 
-_WORD_RE = re.compile(r"(\w+|[^\w\s])", re.UNICODE)
+_WORD_RE = TOKEN_RE
+
+FUZZY_CUTOFF = 0.75
 
 
 @dataclass
@@ -18,13 +24,105 @@ class DictionaryTranslationAgent:
     name: str
     source_language: str
     target_language: str
-    dictionary: Dict[str, str]
+    dictionary: Mapping[str, str]
     description: str
+    token_cache: Optional[TokenCache] = field(default=None, repr=False, compare=False)
+    _fuzzy: Optional[FuzzyIndex] = field(default=None, init=False, repr=False, compare=False)
+    _phrases: Optional[PhraseMatcher] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_tsv(
+        cls,
+        tsv_path: Union[str, Path],
+        name: str,
+        source_language: str,
+        target_language: str,
+        description: str = "",
+        lexicon_path: Optional[Union[str, Path]] = None,
+    ) -> "DictionaryTranslationAgent":
+        """Create an agent over a memory-mapped lexicon compiled from a TSV file."""
+        return cls(
+            name=name,
+            source_language=source_language,
+            target_language=target_language,
+            dictionary=open_lexicon(tsv_path, lexicon_path),
+            description=description or f"Dictionary agent ({Path(tsv_path).name})",
+        )
+
+    @property
+    def fuzzy_index(self) -> FuzzyIndex:
+        """Index over the dictionary keys, built on the first fuzzy lookup.
+
+        A Lexicon maps the tables stored in its file instead of building them.
+        """
+        if self._fuzzy is None:
+            if isinstance(self.dictionary, Lexicon):
+                self._fuzzy = self.dictionary.fuzzy_index()
+            else:
+                self._fuzzy = FuzzyIndex(self.dictionary.keys())
+        return self._fuzzy
+
+    @property
+    def fingerprint(self) -> str:
+        """Identity of the dictionary and fuzzy cutoff that token caches are keyed by."""
+        return dictionary_fingerprint(self.dictionary, FUZZY_CUTOFF)
+
+    def token_cache_path(self, cache_dir: Union[str, Path]) -> Path:
+        """Cache file for this agent's dictionary inside cache_dir."""
+        slug = re.sub(r"\W+", "_", f"{self.source_language}_{self.target_language}").strip("_").lower()
+        return Path(cache_dir) / f"{slug}-{self.fingerprint[:16]}.json"
+
+    def load_token_cache(self, cache_dir: Union[str, Path], maxsize: int = 100_000) -> int:
+        """Attach a token cache, restoring entries saved for the same dictionary; returns how many."""
+        if self.token_cache is None:
+            self.token_cache = TokenCache(maxsize)
+        return self.token_cache.load(self.token_cache_path(cache_dir), self.fingerprint)
+
+    def save_token_cache(self, cache_dir: Union[str, Path]) -> None:
+        """Persist the attached token cache."""
+        if self.token_cache is not None:
+            self.token_cache.save(self.token_cache_path(cache_dir), self.fingerprint)
+
+    @property
+    def phrase_matcher(self) -> PhraseMatcher:
+        """Automaton over keys that span several tokens, built on first use.
+
+        A Lexicon lists its phrases in the file; other mappings are scanned.
+        """
+        if self._phrases is None:
+            if isinstance(self.dictionary, Lexicon):
+                candidates = self.dictionary.phrases()
+            else:
+                candidates = ((key, self.dictionary[key]) for key in self.dictionary)
+            phrases = []
+            for key, value in candidates:
+                key_tokens = _WORD_RE.findall(key.lower())
+                if len(key_tokens) > 1:
+                    phrases.append((key_tokens, value))
+            self._phrases = PhraseMatcher(phrases)
+        return self._phrases
 
     def translate(self, text: str) -> str:
         tokens = _WORD_RE.findall(text)
-        translated_tokens = [self._translate_token(token) for token in tokens]
-        return self._reconstruct_text(tokens, translated_tokens)
+        matcher = self.phrase_matcher
+        if not matcher:
+            translated_tokens = [self._translate_token(token) for token in tokens]
+            return self._reconstruct_text(tokens, translated_tokens)
+
+        # Multi-token keys are matched leftmost-longest in one pass; only the
+        # tokens outside a phrase go through the dictionary probe and fuzzy lookup
+        spans = matcher.find([token.lower() for token in tokens])
+        originals, translated_tokens = [], []
+        position = 0
+        for start, end, translation in spans + [(len(tokens), len(tokens), None)]:
+            for token in tokens[position:start]:
+                originals.append(token)
+                translated_tokens.append(self._translate_token(token))
+            if end > start:
+                originals.append(" ".join(tokens[start:end]))
+                translated_tokens.append(translation)
+            position = end
+        return self._reconstruct_text(originals, translated_tokens)
 
     def _translate_token(self, token: str) -> str:
         lower = token.lower()
@@ -34,10 +132,20 @@ class DictionaryTranslationAgent:
         if lower.strip() == "":
             return token
 
-        candidates = difflib.get_close_matches(lower, self.dictionary.keys(), n=1, cutoff=0.75)
+        if self.token_cache is None:
+            translation = self._fuzzy_translation(lower)
+        else:
+            found, translation = self.token_cache.get(lower)
+            if not found:
+                translation = self._fuzzy_translation(lower)
+                self.token_cache.put(lower, translation)
+        return token if translation is None else translation
+
+    def _fuzzy_translation(self, lower: str) -> Optional[str]:
+        candidates = self.fuzzy_index.get_close_matches(lower, n=1, cutoff=FUZZY_CUTOFF)
         if candidates:
             return self.dictionary[candidates[0]]
-        return token
+        return None
 
     @staticmethod
     def _reconstruct_text(original_tokens, translated_tokens) -> str:
@@ -51,18 +159,25 @@ class DictionaryTranslationAgent:
             else:
                 pieces.append(translated if translated != original else original)
 
-        text = ""
+        # Parts are joined once at the end; trailing whitespace is trimmed
+        # across part boundaries exactly like rstrip() on the joined text
+        parts = []
         for piece in pieces:
             if not piece:
                 continue
-            if not text:
-                text = piece
+            if not parts:
+                parts.append(piece)
                 continue
             if any(ch.isalnum() for ch in piece):
-                text += " " + piece
+                parts.append(" ")
+                parts.append(piece)
             else:
-                text = text.rstrip() + piece
-        return text.strip()
+                while parts and not parts[-1].rstrip():
+                    parts.pop()
+                if parts:
+                    parts[-1] = parts[-1].rstrip()
+                parts.append(piece)
+        return "".join(parts).strip()
 
     def describe(self) -> AgentDescription:
         return AgentDescription(
@@ -0,0 +1,99 @@
+"""Fused multi-hop dictionary translation with per-token composition."""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .dictionary_agent import _WORD_RE, DictionaryTranslationAgent
+
+# Per hop: the tokens that hop sees and the pieces it produces for them
+Trajectory = Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...]
+
+
+def _merges_with_neighbours(piece: str) -> bool:
+    """True for a piece that _reconstruct_text glues on without a space yet holds a word character.
+
+    Such a piece ("_") can fuse with the previous token when the next hop
+    re-tokenizes the text, so per-token composition would not be exact.
+    """
+    return "_" in piece and not any(ch.isalnum() for ch in piece)
+
+
+class FusedDictionaryChain:
+    """Run a chain of dictionary agents from a single tokenization of the input.
+
+    Each hop translates token by token and joins the pieces with
+    _reconstruct_text, and the next hop re-tokenizes the joined text into
+    exactly the concatenation of the pieces' tokens. A token's path through
+    the whole chain is therefore independent of its context. It is composed
+    once, with every hop's own exact and fuzzy lookup, and memoized, so
+    repeated tokens cost one dictionary probe in total. All intermediate
+    outputs are rebuilt from the composed pieces. Texts that the per-token
+    view cannot reproduce exactly (agents with multi-word keys, or pieces
+    made only of "_" and punctuation) fall back to running the agents one
+    after another.
+    """
+
+    def __init__(self, agents: Sequence[DictionaryTranslationAgent]):
+        self.agents = list(agents)
+        self._table: Dict[str, Optional[Trajectory]] = {}
+        self._fusable: Optional[bool] = None
+
+    @property
+    def fusable(self) -> bool:
+        """Whether no agent has multi-token keys (checked on first use)."""
+        if self._fusable is None:
+            self._fusable = not any(len(agent.phrase_matcher) for agent in self.agents)
+        return self._fusable
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def precompose(self) -> int:
+        """Compose every key of the first dictionary up front; returns the table size."""
+        if self.fusable and self.agents:
+            for key in self.agents[0].dictionary:
+                self._compose(key)
+        return len(self._table)
+
+    def run(self, text: str) -> List[str]:
+        """[text, output of hop 1, ..., output of the last hop], as the sequential chain gives."""
+        if not self.fusable:
+            return self._run_sequential(text)
+
+        trajectories = []
+        for token in _WORD_RE.findall(text):
+            trajectory = self._compose(token)
+            if trajectory is None:
+                return self._run_sequential(text)
+            trajectories.append(trajectory)
+
+        outputs = [text]
+        for hop in range(len(self.agents)):
+            originals = [token for trajectory in trajectories for token in trajectory[hop][0]]
+            pieces = [piece for trajectory in trajectories for piece in trajectory[hop][1]]
+            outputs.append(DictionaryTranslationAgent._reconstruct_text(originals, pieces))
+        return outputs
+
+    def _compose(self, token: str) -> Optional[Trajectory]:
+        """Memoized path of one input token through every hop, or None if not composable."""
+        if token in self._table:
+            return self._table[token]
+
+        trajectory = []
+        tokens: Tuple[str, ...] = (token,)
+        for agent in self.agents:
+            pieces = tuple(agent._translate_token(current) for current in tokens)
+            if any(_merges_with_neighbours(piece) for piece in pieces):
+                self._table[token] = None
+                return None
+            trajectory.append((tokens, pieces))
+            tokens = tuple(t for piece in pieces for t in _WORD_RE.findall(piece))
+
+        self._table[token] = tuple(trajectory)
+        return self._table[token]
+
+    def _run_sequential(self, text: str) -> List[str]:
+        outputs = [text]
+        for agent in self.agents:
+            outputs.append(agent.translate(outputs[-1]))
+        return outputs
@@ -0,0 +1,104 @@
+"""Indexed fuzzy lookup with the exact semantics of difflib.get_close_matches."""
+from __future__ import annotations
+
+import difflib
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Slack on the prefilter bounds so float rounding can never drop a true match
+_EPSILON = 1e-9
+
+
+def count_dtype(length: int) -> np.dtype:
+    """Smallest count type for keys of `length` characters (no character occurs more often)."""
+    return np.dtype(np.uint8 if length <= np.iinfo(np.uint8).max else np.uint16)
+
+
+def char_counts(bucket: Sequence[str], columns: Dict[str, int], length: int) -> np.ndarray:
+    """(keys x characters) column-major count matrix for keys that all have `length` characters."""
+    counts = np.zeros((len(bucket), len(columns)), dtype=count_dtype(length), order="F")
+    if length:
+        codes = np.fromiter(
+            (columns[ch] for key in bucket for ch in key),
+            dtype=np.int64,
+            count=len(bucket) * length,
+        )
+        np.add.at(counts, (np.repeat(np.arange(len(bucket)), length), codes), 1)
+    return counts
+
+
+class FuzzyIndex:
+    """Candidate pruning for get_close_matches over a fixed set of keys.
+
+    get_close_matches only accepts x when real_quick_ratio, quick_ratio and
+    ratio are all >= cutoff. The first two depend only on lengths and on
+    character counts, so keys are bucketed by length and each bucket keeps a
+    (keys x characters) count matrix. A lookup skips buckets whose length
+    bound fails, computes quick_ratio for a whole bucket with one numpy
+    reduction, and hands the survivors to difflib.get_close_matches. The
+    result, including tie-breaking, is identical to a full scan.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        keys = list(keys)
+        chars = sorted({ch for key in keys for ch in key})
+        columns = {ch: i for i, ch in enumerate(chars)}
+
+        by_length: Dict[int, List[str]] = {}
+        for key in keys:
+            by_length.setdefault(len(key), []).append(key)
+
+        self._size = len(keys)
+        self._columns = columns
+        self._buckets: Dict[int, Tuple[Sequence[str], np.ndarray]] = {
+            length: (bucket, char_counts(bucket, columns, length))
+            for length, bucket in sorted(by_length.items())
+        }
+
+    @classmethod
+    def from_buckets(cls, chars: str, buckets: Dict[int, Tuple[Sequence[str], np.ndarray]]) -> "FuzzyIndex":
+        """Index over precomputed buckets: length -> (keys, char_counts matrix over sorted `chars`).
+
+        Lexicon.fuzzy_index() passes memory-mapped matrices and lazily decoded
+        keys, so no process holds its own copy of the keys.
+        """
+        index = cls.__new__(cls)
+        index._size = sum(len(bucket) for bucket, _ in buckets.values())
+        index._columns = {ch: i for i, ch in enumerate(chars)}
+        index._buckets = dict(sorted(buckets.items()))
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def candidates(self, word: str, cutoff: float) -> List[str]:
+        """Keys whose real_quick_ratio and quick_ratio against word reach cutoff."""
+        query = Counter(ch for ch in word if ch in self._columns)
+        columns = np.array([self._columns[ch] for ch in query], dtype=np.int64)
+        query_counts = np.array(list(query.values()), dtype=np.uint16)
+
+        found: List[str] = []
+        for length, (bucket, counts) in self._buckets.items():
+            total = len(word) + length
+            if total == 0:
+                found.extend(bucket)
+                continue
+            if 2.0 * min(len(word), length) / total < cutoff - _EPSILON:
+                continue
+            if len(columns):
+                matches = np.minimum(counts[:, columns], query_counts).sum(axis=1)
+            else:
+                matches = np.zeros(len(bucket))
+            keep = np.flatnonzero(2.0 * matches / total >= cutoff - _EPSILON)
+            found.extend(bucket[i] for i in keep)
+        return found
+
+    def get_close_matches(self, word: str, n: int = 3, cutoff: float = 0.6) -> List[str]:
+        """Same result as difflib.get_close_matches(word, keys, n, cutoff)."""
+        if not n > 0:
+            raise ValueError("n must be > 0: %r" % (n,))
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
+        return difflib.get_close_matches(word, self.candidates(word, cutoff), n=n, cutoff=cutoff)
@@ -0,0 +1,277 @@
+"""Memory-mapped sorted string table for large bilingual dictionaries."""
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import re
+import struct
+import sys
+from pathlib import Path
+from typing import Iterator, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from .fuzzy_index import FuzzyIndex, char_counts, count_dtype
+
+MAGIC = b"LEXSST03"
+# magic, entry count, key blob size, value blob size, phrase count,
+# fuzzy character blob size, fuzzy bucket count, fuzzy count blob size
+_HEADER = struct.Struct("<8sQQQQQQQ")
+
+# How the agent splits text; keys with more than one token are phrases
+TOKEN_RE = re.compile(r"(\w+|[^\w\s])", re.UNICODE)
+
+PathLike = Union[str, Path]
+
+
+def read_tsv(tsv_path: PathLike) -> List[Tuple[str, str]]:
+    """(source, target) pairs from a two-column TSV; blank and # lines are skipped."""
+    pairs = []
+    with open(tsv_path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            columns = line.split("\t")
+            if len(columns) < 2:
+                raise ValueError(f"{tsv_path}:{line_number}: expected 'source<TAB>target'")
+            pairs.append((columns[0], columns[1]))
+    return pairs
+
+
+def build_lexicon(tsv_path: PathLike, out_path: PathLike) -> int:
+    """Compile a TSV dictionary into the binary format; returns the entry count.
+
+    Source words are lowercased, since the agent looks tokens up lowercased.
+    When a source word appears more than once, its first translation wins.
+    The indices of keys that span several tokens are stored too, so the
+    agent's phrase matcher never has to scan all keys, and so are the
+    FuzzyIndex tables (keys bucketed by length, with their character
+    counts), so no process has to build them. The file is written to a
+    temporary name and renamed into place.
+    """
+    entries = {}
+    for source, target in read_tsv(tsv_path):
+        entries.setdefault(source.lower().encode("utf-8"), target.encode("utf-8"))
+
+    keys = sorted(entries)
+    values = [entries[key] for key in keys]
+    key_offsets = np.zeros(len(keys) + 1, dtype="<u8")
+    value_offsets = np.zeros(len(keys) + 1, dtype="<u8")
+    np.cumsum([len(key) for key in keys], out=key_offsets[1:])
+    np.cumsum([len(value) for value in values], out=value_offsets[1:])
+    strings = [key.decode("utf-8") for key in keys]
+    phrase_indices = np.array([i for i, key in enumerate(strings) if len(TOKEN_RE.findall(key)) > 1], dtype="<u8")
+
+    chars = "".join(sorted({ch for key in strings for ch in key})).encode("utf-8")
+    columns = {ch: i for i, ch in enumerate(chars.decode("utf-8"))}
+    lengths = np.array([len(key) for key in strings], dtype=np.int64)
+    order = np.argsort(lengths, kind="stable").astype("<u8")
+    bucket_lengths, bucket_starts = np.unique(lengths[order], return_index=True)
+    bucket_ends = list(bucket_starts[1:]) + [len(keys)]
+    buckets, count_blobs, counts_size = [], [], 0
+    for length, start, end in zip(bucket_lengths.tolist(), bucket_starts.tolist(), bucket_ends):
+        blob = char_counts([strings[i] for i in order[start:end]], columns, length).tobytes(order="F")
+        blob += b"\0" * _padding(len(blob))
+        buckets.append((length, start, counts_size))
+        count_blobs.append(blob)
+        counts_size += len(blob)
+    bucket_table = np.array(buckets, dtype="<u8").reshape(-1, 3)
+
+    out_path = Path(out_path)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, len(keys), int(key_offsets[-1]), int(value_offsets[-1]), len(phrase_indices),
+            len(chars), len(bucket_table), counts_size,
+        ))
+        f.write(key_offsets.tobytes())
+        f.write(value_offsets.tobytes())
+        f.write(b"".join(keys))
+        f.write(b"".join(values))
+        f.write(phrase_indices.tobytes())
+        # The fuzzy sections start 8-byte aligned so numpy can map them directly
+        f.write(b"\0" * _padding(f.tell()))
+        f.write(chars)
+        f.write(b"\0" * _padding(f.tell()))
+        f.write(bucket_table.tobytes())
+        f.write(order.tobytes())
+        f.write(b"".join(count_blobs))
+    os.replace(tmp_path, out_path)
+    return len(keys)
+
+
+def _padding(position: int) -> int:
+    """Bytes needed to align `position` to 8."""
+    return -position % 8
+
+
+class _SortedKeys:
+    """Sequence view of the encoded keys, for bisect."""
+
+    def __init__(self, lexicon: "Lexicon"):
+        self._lexicon = lexicon
+
+    def __len__(self) -> int:
+        return len(self._lexicon)
+
+    def __getitem__(self, i: int) -> bytes:
+        return self._lexicon._key_bytes(i)
+
+
+class _KeyView(Sequence[str]):
+    """Keys at the given entry indices, decoded on access."""
+
+    def __init__(self, lexicon: "Lexicon", indices: np.ndarray):
+        self._lexicon = lexicon
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, i: int) -> str:
+        return self._lexicon._key_bytes(int(self._indices[i])).decode("utf-8")
+
+
+class Lexicon(Mapping[str, str]):
+    """Read-only str -> str mapping backed by a memory-mapped sorted string table.
+
+    Layout: header, key offsets (count + 1 uint64), value offsets
+    (count + 1 uint64), the UTF-8 keys concatenated in byte order, the
+    values, the indices of multi-token keys (uint64), then the fuzzy
+    tables: the sorted distinct key characters, a (length, start, blob
+    offset) row per key length, the entry indices ordered by key length,
+    and one column-major count matrix per length. Opening maps the file
+    without reading it, so startup does not depend on the lexicon size,
+    and processes that open the same file share its pages through the OS
+    page cache. Lookups are binary searches.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, count, key_size, value_size, phrase_count,
+         chars_size, bucket_count, counts_size) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a lexicon file")
+
+        # Offsets are read through memoryviews: indexing yields plain ints, which
+        # keeps each binary-search probe cheap
+        if sys.byteorder != "little":
+            raise OSError("Lexicon files store little-endian offsets")
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+        self._count = count
+        self._key_offsets = view[offset:offset + 8 * (count + 1)].cast("Q")
+        offset += 8 * (count + 1)
+        self._value_offsets = view[offset:offset + 8 * (count + 1)].cast("Q")
+        offset += 8 * (count + 1)
+        self._keys_start = offset
+        self._values_start = offset + key_size
+        phrases_start = self._values_start + value_size
+        offset = phrases_start + 8 * phrase_count
+        self._chars_start = offset + _padding(offset)
+        self._chars_end = self._chars_start + chars_size
+        self._table_start = self._chars_end + _padding(self._chars_end)
+        self._order_start = self._table_start + 24 * bucket_count
+        self._counts_start = self._order_start + 8 * count
+        self._counts_size = counts_size
+        if self._counts_start + counts_size > len(self._mmap):
+            raise ValueError(f"{self.path} is truncated")
+        self._phrase_indices = view[phrases_start:phrases_start + 8 * phrase_count].cast("Q")
+        self._sorted_keys = _SortedKeys(self)
+
+    def __reduce__(self):
+        # Workers reopen the file instead of receiving a copy of its contents
+        return (type(self), (self.path,))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._key_bytes(i).decode("utf-8")
+
+    def __getitem__(self, key: str) -> str:
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        start, end = self._value_offsets[i], self._value_offsets[i + 1]
+        return self._mmap[self._values_start + start:self._values_start + end].decode("utf-8")
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) >= 0
+
+    def phrases(self) -> Iterator[Tuple[str, str]]:
+        """(key, value) pairs of the keys that span several tokens, read from the file."""
+        for i in self._phrase_indices:
+            start, end = self._value_offsets[i], self._value_offsets[i + 1]
+            value = self._mmap[self._values_start + start:self._values_start + end].decode("utf-8")
+            yield self._key_bytes(i).decode("utf-8"), value
+
+    def fuzzy_index(self) -> FuzzyIndex:
+        """FuzzyIndex over the keys, from the tables stored in the file.
+
+        The key order and count matrices are numpy memmaps of the file rather
+        than copies, so processes share them and a lookup reads only the
+        count columns of the query's characters.
+        """
+        chars = self._mmap[self._chars_start:self._chars_end].decode("utf-8")
+        if not self._count:
+            return FuzzyIndex.from_buckets(chars, {})
+        table = np.frombuffer(self._mmap[self._table_start:self._order_start], dtype="<u8").reshape(-1, 3)
+        order = np.memmap(self.path, dtype="<u8", mode="r", offset=self._order_start, shape=(self._count,))
+        counts = (
+            np.memmap(self.path, dtype=np.uint8, mode="r", offset=self._counts_start, shape=(self._counts_size,))
+            if self._counts_size else np.zeros(0, dtype=np.uint8)
+        )
+        ends = table[1:, 1].tolist() + [self._count]
+        buckets = {}
+        for (length, start, offset), end in zip(table.tolist(), ends):
+            dtype = count_dtype(length)
+            size = (end - start) * len(chars) * dtype.itemsize
+            matrix = counts[offset:offset + size].view(dtype).reshape((end - start, len(chars)), order="F")
+            buckets[length] = (_KeyView(self, order[start:end]), matrix)
+        return FuzzyIndex.from_buckets(chars, buckets)
+
+    def close(self) -> None:
+        """Release the mapping; the lexicon cannot be used afterwards."""
+        self._key_offsets.release()
+        self._value_offsets.release()
+        self._phrase_indices.release()
+        self._mmap.close()
+
+    def _key_bytes(self, i: int) -> bytes:
+        start, end = self._key_offsets[i], self._key_offsets[i + 1]
+        return self._mmap[self._keys_start + start:self._keys_start + end]
+
+    def _find(self, key: str) -> int:
+        """Index of key, or -1."""
+        encoded = key.encode("utf-8")
+        i = bisect.bisect_left(self._sorted_keys, encoded)
+        return i if i < self._count and self._key_bytes(i) == encoded else -1
+
+
+def _read_magic(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC))
+
+
+def open_lexicon(tsv_path: PathLike, lexicon_path: PathLike = None) -> Lexicon:
+    """Open the compiled form of a TSV dictionary, compiling it when missing or stale.
+
+    The binary file defaults to the TSV path with a `.lex` suffix and is
+    rebuilt whenever the TSV is newer or the file has an older format.
+    """
+    tsv_path = Path(tsv_path)
+    lexicon_path = Path(lexicon_path) if lexicon_path else tsv_path.with_suffix(".lex")
+    if (
+        not lexicon_path.exists()
+        or lexicon_path.stat().st_mtime < tsv_path.stat().st_mtime
+        or _read_magic(lexicon_path) != MAGIC
+    ):
+        build_lexicon(tsv_path, lexicon_path)
+    return Lexicon(lexicon_path)
@@ -0,0 +1,84 @@
+"""Word-level Aho-Corasick automaton for multi-token dictionary phrases."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class PhraseMatcher:
+    """Leftmost-longest matching of token sequences in one pass over the input.
+
+    The automaton's alphabet is whole tokens. Each node has a goto table, a
+    failure link to its longest proper suffix in the trie, and an output link
+    to the nearest suffix that ends a phrase. Scanning a text visits every
+    phrase occurrence once, so time is linear in the number of tokens plus
+    matches, regardless of how many phrases the table holds.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[Sequence[str], str]]):
+        """Build from (tokens, translation) pairs; the first pair for a token sequence wins."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._depth = [0]
+        self._value: List[Optional[str]] = [None]
+        self._count = 0
+
+        for tokens, value in phrases:
+            if not tokens:
+                continue
+            node = 0
+            for token in tokens:
+                child = self._goto[node].get(token)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][token] = child
+                    self._goto.append({})
+                    self._depth.append(self._depth[node] + 1)
+                    self._value.append(None)
+                node = child
+            if self._value[node] is None:
+                self._value[node] = value
+                self._count += 1
+
+        self._fail = [0] * len(self._goto)
+        self._output = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(token, 0)
+                self._fail[child] = fail
+                self._output[child] = fail if self._value[fail] is not None else self._output[fail]
+                queue.append(child)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def find(self, tokens: Sequence[str]) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, translation) spans, leftmost first, longest at each start."""
+        longest: Dict[int, Tuple[int, str]] = {}
+        node = 0
+        for end, token in enumerate(tokens, 1):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+
+            match = node if self._value[node] is not None else self._output[node]
+            while match:
+                start = end - self._depth[match]
+                if start not in longest or longest[start][0] < end:
+                    longest[start] = (end, self._value[match])
+                match = self._output[match]
+
+        spans = []
+        position = 0
+        while position < len(tokens):
+            if position in longest:
+                end, value = longest[position]
+                spans.append((position, end, value))
+                position = end
+            else:
+                position += 1
+        return spans
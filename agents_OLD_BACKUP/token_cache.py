@@ -0,0 +1,140 @@
+"""Bounded, persistable cache of fuzzy token resolutions."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from .lexicon import Lexicon
+
+# Bump when the meaning of cached entries changes
+CACHE_VERSION = 1
+
+_MISSING = object()
+
+
+def dictionary_fingerprint(dictionary: Mapping[str, str], cutoff: float) -> str:
+    """Identity of a dictionary plus matching cutoff; cached resolutions are only valid for it.
+
+    Lexicons are identified by their file's path, size and modification
+    time, so a recompiled lexicon invalidates its caches without rehashing
+    the file. In-memory dictionaries are hashed by content.
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}:cutoff={cutoff!r}:".encode("utf-8"))
+    if isinstance(dictionary, Lexicon):
+        stat = dictionary.path.stat()
+        digest.update(f"lexicon:{dictionary.path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    else:
+        digest.update(json.dumps(sorted(dictionary.items()), ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class TokenCache:
+    """LRU map from a lowercased token to its fuzzy translation, or None for "no match".
+
+    Negative results are stored too, since unmatched corrupted tokens are
+    the most expensive to resolve. Counters track lookups, and save/load
+    persist the entries tagged with a dictionary fingerprint. With
+    `track_updates`, stored entries are also kept for take_updates() until
+    the next call; only worker caches that report back need that.
+    """
+
+    def __init__(self, maxsize: int = 100_000, track_updates: bool = False):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.track_updates = track_updates
+        self._entries: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._updates: Dict[str, Optional[str]] = {}
+        self._reported = (0, 0, 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Tuple[bool, Optional[str]]:
+        """(found, translation) for a token; translation is None for a cached "no match"."""
+        value = self._entries.get(token, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return True, value
+
+    def put(self, token: str, translation: Optional[str]) -> None:
+        """Store a resolution, evicting the least recently used entry when full."""
+        self._entries[token] = translation
+        self._entries.move_to_end(token)
+        if self.track_updates:
+            self._updates[token] = translation
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def take_updates(self) -> Dict[str, Any]:
+        """Entries stored and counter increments since the previous call.
+
+        Lets a worker process ship what it learned back to the parent, which
+        applies it with merge_updates().
+        """
+        counters = (self.hits, self.misses, self.evictions)
+        updates = {
+            "entries": list(self._updates.items()),
+            "hits": counters[0] - self._reported[0],
+            "misses": counters[1] - self._reported[1],
+            "evictions": counters[2] - self._reported[2],
+        }
+        self._updates = {}
+        self._reported = counters
+        return updates
+
+    def merge_updates(self, updates: Dict[str, Any]) -> None:
+        """Apply another cache's take_updates() result."""
+        for token, translation in updates["entries"]:
+            self.put(token, translation)
+        self.hits += updates["hits"]
+        self.misses += updates["misses"]
+        self.evictions += updates["evictions"]
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Size and lookup counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "no_match_entries": sum(1 for value in self._entries.values() if value is None),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path: Union[str, Path], fingerprint: str) -> None:
+        """Write the entries in LRU order (atomically, via a temporary file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "entries": list(self._entries.items())}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path: Union[str, Path], fingerprint: str) -> int:
+        """Add entries saved for the same fingerprint; returns how many were loaded."""
+        path = Path(path)
+        if not path.exists():
+            return 0
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("fingerprint") != fingerprint:
+            return 0
+        for token, translation in data["entries"]:
+            self.put(token, translation)
+        # Entries read from disk are not news to other processes
+        self._updates = {}
+        return len(data["entries"])
@@ -0,0 +1,46 @@
+"""Fused vs sequential dictionary chain on main.py's corrupted sentences.
+
+Usage:
+    python benchmarks/fused_chain_benchmark.py [--texts 2000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+from agents_OLD_BACKUP.fused_chain import FusedDictionaryChain
+
+
+def main_benchmark() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000, help="Corrupted sentences to translate")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rates = [0.0, 0.15, 0.25, 0.35, 0.45, 0.5]
+    texts = [main.introduce_typos(main.DEFAULT_SENTENCE, rng.choice(rates), seed) for seed in range(args.texts)]
+
+    agents = main.build_agents()
+    start = time.perf_counter()
+    sequential = [main.run_pipeline(text, agents) for text in texts]
+    sequential_time = time.perf_counter() - start
+
+    fused = FusedDictionaryChain(main.build_agents())
+    start = time.perf_counter()
+    fused_outputs = [fused.run(text) for text in texts]
+    fused_time = time.perf_counter() - start
+
+    if fused_outputs != sequential:
+        raise SystemExit("Fused outputs differ from the sequential chain")
+    print(f"texts:       {len(texts)}")
+    print(f"sequential:  {1000 * sequential_time / len(texts):.3f} ms/text")
+    print(f"fused:       {1000 * fused_time / len(texts):.3f} ms/text ({len(fused)} composed tokens)")
+    print(f"speedup:     {sequential_time / fused_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,66 @@
+"""Fuzzy lookup benchmark: FuzzyIndex vs difflib.get_close_matches as the dictionary grows.
+
+Usage:
+    python benchmarks/fuzzy_index_benchmark.py [--sizes 1000 10000 100000] [--queries 200]
+"""
+import argparse
+import difflib
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents_OLD_BACKUP.fuzzy_index import FuzzyIndex
+from src.utils.typo_engine import DEFAULT_ENGINE
+
+CUTOFF = 0.75
+# Rough English letter frequencies, so synthetic words share realistic character counts
+LETTERS = "eeeeeeeeeeeettttttttaaaaaaaaoooooooiiiiiiinnnnnnnssssssrrrrrrhhhhhllllddddcccuuummwwffggyyppbbvkjxqz"
+
+
+def make_dictionary(size: int, rng: random.Random) -> list:
+    """`size` distinct pseudo-words of 2-14 letters."""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(LETTERS) for _ in range(rng.randint(2, 14))))
+    return sorted(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200, help="Misspelled lookups per size")
+    args = parser.parse_args()
+
+    print(f"{'keys':>8} {'build s':>8} {'difflib ms/q':>13} {'index ms/q':>11} {'speedup':>8} {'candidates':>11}")
+    for size in args.sizes:
+        rng = random.Random(size)
+        keys = make_dictionary(size, rng)
+        words = [DEFAULT_ENGINE.corrupt_word(word, rng) for word in rng.sample(keys, args.queries)]
+
+        start = time.perf_counter()
+        index = FuzzyIndex(keys)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [index.get_close_matches(word, n=1, cutoff=CUTOFF) for word in words]
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned = [difflib.get_close_matches(word, keys, n=1, cutoff=CUTOFF) for word in words]
+        scan_time = time.perf_counter() - start
+
+        if indexed != scanned:
+            raise SystemExit(f"Mismatch at {size} keys")
+
+        candidates = sum(len(index.candidates(word, CUTOFF)) for word in words) / len(words)
+        print(
+            f"{size:>8} {build:>8.2f} {1000 * scan_time / len(words):>13.3f} "
+            f"{1000 * index_time / len(words):>11.3f} {scan_time / index_time:>7.1f}x {candidates:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Phrase matching benchmark: time per token as the text and phrase table grow.
+
+Usage:
+    python benchmarks/phrase_matcher_benchmark.py [--phrases 1000 100000] [--tokens 1000 10000 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents_OLD_BACKUP.phrase_matcher import PhraseMatcher
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--phrases", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--vocabulary", type=int, default=5_000, help="Distinct words")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f"w{i}" for i in range(args.vocabulary)]
+    print(f"{'phrases':>8} {'build s':>8} {'tokens':>8} {'matches':>8} {'us/token':>9}")
+    for size in args.phrases:
+        phrases = [([rng.choice(vocabulary) for _ in range(rng.randint(2, 5))], str(i)) for i in range(size)]
+        start = time.perf_counter()
+        matcher = PhraseMatcher(phrases)
+        build = time.perf_counter() - start
+
+        for length in args.tokens:
+            # Half the text is planted phrases, half random words
+            tokens = []
+            while len(tokens) < length:
+                tokens.extend(rng.choice(phrases)[0] if rng.random() < 0.5 else [rng.choice(vocabulary)])
+            start = time.perf_counter()
+            spans = matcher.find(tokens)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>8} {build:>8.2f} {len(tokens):>8} {len(spans):>8} {1e6 * elapsed / len(tokens):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
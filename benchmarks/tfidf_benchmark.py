@@ -0,0 +1,70 @@
+"""Sparse TF-IDF distances vs the dense pure-Python version main.py used before.
+
+The documents are the base sentence with typos and no translation, so every
+new typo adds a vocabulary term: the case where dense vectors grow with the
+corpus.
+
+Usage:
+    python benchmarks/tfidf_benchmark.py [--documents 2000]
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main
+from src.utils.tfidf import tfidf_distances, tokenize
+
+
+def dense_distances(original, finals):
+    """The previous compute_distances: one dense list per document."""
+    corpus = [original, *finals]
+    tokenized = [tokenize(text) for text in corpus]
+    vocabulary = sorted({token for tokens in tokenized for token in tokens})
+    vocab_index = {term: idx for idx, term in enumerate(vocabulary)}
+    doc_freq = Counter()
+    for tokens in tokenized:
+        doc_freq.update(set(tokens))
+    idf = {term: math.log((1 + len(corpus)) / (1 + doc_freq[term])) + 1.0 for term in vocabulary}
+    vectors = []
+    for tokens in tokenized:
+        vector = [0.0] * len(vocabulary)
+        for term, count in Counter(tokens).items():
+            vector[vocab_index[term]] = count / max(len(tokens), 1) * idf[term]
+        vectors.append(vector)
+    return [math.sqrt(sum((a - b) ** 2 for a, b in zip(vectors[0], vector))) for vector in vectors[1:]]
+
+
+def main_benchmark() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000, help="Final sentences to score")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rates = [0.15, 0.25, 0.35, 0.45, 0.5]
+    finals = [main.introduce_typos(main.DEFAULT_SENTENCE, rng.choice(rates), seed) for seed in range(args.documents)]
+
+    start = time.perf_counter()
+    dense = dense_distances(main.DEFAULT_SENTENCE, finals)
+    dense_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sparse = tfidf_distances(main.DEFAULT_SENTENCE, finals)
+    sparse_time = time.perf_counter() - start
+
+    if sparse != dense:
+        raise SystemExit("Sparse distances differ from the dense version")
+    vocabulary = len({token for text in [main.DEFAULT_SENTENCE, *finals] for token in tokenize(text)})
+    print(f"documents:   {len(finals)} ({vocabulary} terms)")
+    print(f"dense:       {dense_time:.3f} s")
+    print(f"sparse:      {sparse_time:.3f} s")
+    print(f"speedup:     {dense_time / sparse_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,102 @@
+"""Throughput benchmark: TypoEngine tables vs the per-character dict lookups.
+
+Usage:
+    python benchmarks/typo_engine_benchmark.py [--n 200000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.typo_engine import ALPHABET, DEFAULT_ENGINE, KEYBOARD_NEIGHBORS
+
+WORDS = (
+    "international collaboration requires consistent communication schedules to support remote "
+    "scientific projects across multiple time zones and languages"
+).split()
+
+
+def legacy_substitute(chars, rng):
+    """Previous inject_typo path: dict lookup + random.choice per character."""
+    out = []
+    for char in chars:
+        if char in KEYBOARD_NEIGHBORS and KEYBOARD_NEIGHBORS[char]:
+            out.append(rng.choice(KEYBOARD_NEIGHBORS[char]))
+    return out
+
+
+def legacy_corrupt_word(word, rng):
+    """Previous main._corrupt_word: uniform operation and uniform random letters."""
+    operation = rng.choice(["substitute", "delete", "insert", "transpose"])
+    chars = list(word)
+    if operation == "substitute":
+        chars[rng.randrange(len(chars))] = rng.choice(ALPHABET)
+    elif operation == "delete" and len(chars) > 1:
+        del chars[rng.randrange(len(chars))]
+    elif operation == "insert":
+        chars.insert(rng.randrange(len(chars) + 1), rng.choice(ALPHABET))
+    elif operation == "transpose" and len(chars) > 1:
+        pos = rng.randrange(len(chars) - 1)
+        chars[pos], chars[pos + 1] = chars[pos + 1], chars[pos]
+    else:
+        chars[rng.randrange(len(chars))] = rng.choice(ALPHABET)
+    return "".join(chars)
+
+
+def timed(n, candidates, repeat):
+    """Best time of each (label, fn) over `repeat` rounds.
+
+    Rounds run every candidate once in turn, so drift in machine load hits
+    all of them alike. Every path draws its random numbers inside fn.
+    """
+    best = {label: float("inf") for label, _ in candidates}
+    for _ in range(repeat):
+        for label, fn in candidates:
+            start = time.perf_counter()
+            fn()
+            best[label] = min(best[label], time.perf_counter() - start)
+    for label, elapsed in best.items():
+        print(f"  {label:<38} {n / elapsed:>14,.0f} /s  ({elapsed:.3f}s)")
+    return list(best.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=50_000, help="Samples per measurement")
+    parser.add_argument("--repeat", type=int, default=30, help="Rounds per measurement (the best is reported)")
+    args = parser.parse_args()
+    n, repeat = args.n, args.repeat
+
+    rng = random.Random(0)
+    chars = [rng.choice(ALPHABET) for _ in range(n)]
+    codes = np.array([ALPHABET.index(c) for c in chars])
+
+    print(f"Neighbour sampling ({n:,} characters)")
+    rng = random.Random(1)
+    generator = np.random.default_rng(1)
+    legacy, scalar, vectorized = timed(n, [
+        ("dict lookup + random.choice", lambda: legacy_substitute(chars, rng)),
+        ("alias table, scalar", lambda: [DEFAULT_ENGINE.sample_neighbor(c, rng.random()) for c in chars]),
+        ("alias table, vectorized", lambda: DEFAULT_ENGINE.sample_neighbor_codes(codes, generator.random(n))),
+    ], repeat)
+    print(f"  scalar speedup over dict lookups: {legacy / scalar:.2f}x")
+    print(f"  vectorized speedup over dict lookups: {legacy / vectorized:.1f}x")
+
+    # TypoEngine.corrupt_word is what inject_typo, inject_errors and main.introduce_typos call
+    words = [WORDS[i % len(WORDS)] for i in range(n)]
+    print(f"\nWhole-word typos ({n:,} words)")
+    rng = random.Random(2)
+    legacy, engine = timed(n, [
+        ("main._corrupt_word (previous)", lambda: [legacy_corrupt_word(w, rng) for w in words]),
+        ("TypoEngine.corrupt_word", lambda: [DEFAULT_ENGINE.corrupt_word(w, rng) for w in words]),
+    ], repeat)
+    print(f"  speedup: {legacy / engine:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
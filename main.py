@@ -5,13 +5,22 @@ import argparse
 import json
 import math
 import random
-import re
-from collections import Counter
+import statistics
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict
 from pathlib import Path
-from typing import List, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from agents import DictionaryTranslationAgent
+from scipy import sparse
+
+from agents_OLD_BACKUP import DictionaryTranslationAgent
+from agents_OLD_BACKUP.fused_chain import FusedDictionaryChain
+from agents_OLD_BACKUP.lexicon import open_lexicon
+from agents_OLD_BACKUP.token_cache import TokenCache
+from src.utils import tfidf
+from src.utils.hashing_scorer import DEFAULT_FEATURES, HashingScorer
+from src.utils.tfidf import METRICS, tfidf_distances
+from src.utils.typo_engine import DEFAULT_ENGINE
 
 
 EN_FR_DICTIONARY = {
@@ -183,27 +192,35 @@ HE_EN_DICTIONARY = {
     "באופן_קבוע": "steadily",
 }
 
-def build_agents() -> List[DictionaryTranslationAgent]:
-    """Create the three-agent translation chain."""
+def build_agents(lexicon_dir: Optional[Path] = None) -> List[DictionaryTranslationAgent]:
+    """Create the three-agent translation chain.
+
+    With `lexicon_dir`, the dictionaries are read from en_fr.tsv, fr_he.tsv and
+    he_en.tsv in that directory (compiled to memory-mapped .lex files on first
+    use) instead of the built-in tables.
+    """
+    def dictionary(table, file_name):
+        return open_lexicon(lexicon_dir / file_name) if lexicon_dir else table
+
     agent1 = DictionaryTranslationAgent(
         name="English→French Agent",
         source_language="English",
         target_language="French",
-        dictionary=EN_FR_DICTIONARY,
+        dictionary=dictionary(EN_FR_DICTIONARY, "en_fr.tsv"),
         description="Word-level dictionary translator from English to French with fuzzy typo handling.",
     )
     agent2 = DictionaryTranslationAgent(
         name="French→Hebrew Agent",
         source_language="French",
         target_language="Hebrew",
-        dictionary=FR_HE_DICTIONARY,
+        dictionary=dictionary(FR_HE_DICTIONARY, "fr_he.tsv"),
         description="Word-level dictionary translator from French to Hebrew with fuzzy typo handling.",
     )
     agent3 = DictionaryTranslationAgent(
         name="Hebrew→English Agent",
         source_language="Hebrew",
         target_language="English",
-        dictionary=HE_EN_DICTIONARY,
+        dictionary=dictionary(HE_EN_DICTIONARY, "he_en.tsv"),
         description="Word-level dictionary translator from Hebrew back to English with fuzzy typo handling.",
     )
     return [agent1, agent2, agent3]
@@ -241,25 +258,7 @@ def introduce_typos(sentence: str, error_rate: float, seed: int) -> str:
 
 
 def _corrupt_word(word: str, rng: random.Random) -> str:
-    operations = ["substitute", "delete", "insert", "transpose"]
-    operation = rng.choice(operations)
-    chars = list(word)
-    if operation == "substitute":
-        position = rng.randrange(len(chars))
-        chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz")
-    elif operation == "delete" and len(chars) > 1:
-        position = rng.randrange(len(chars))
-        del chars[position]
-    elif operation == "insert":
-        position = rng.randrange(len(chars) + 1)
-        chars.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz"))
-    elif operation == "transpose" and len(chars) > 1:
-        position = rng.randrange(len(chars) - 1)
-        chars[position], chars[position + 1] = chars[position + 1], chars[position]
-    else:  # fallback to substitution when delete/transpose not applicable
-        position = rng.randrange(len(chars))
-        chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz")
-    return "".join(chars)
+    return DEFAULT_ENGINE.corrupt_word(word, rng)
 
 
 def run_pipeline(text: str, agents: Sequence[DictionaryTranslationAgent]) -> List[str]:
@@ -271,55 +270,147 @@ def run_pipeline(text: str, agents: Sequence[DictionaryTranslationAgent]) -> Lis
     return outputs
 
 
-def compute_distances(original: str, finals: Sequence[str]) -> List[float]:
-    """Compute Euclidean distances using a simple TF-IDF embedding implementation."""
-    corpus = [original, *finals]
-    tokenized = [tokenize(text) for text in corpus]
-    vocabulary = sorted({token for tokens in tokenized for token in tokens})
-    if not vocabulary:
-        return [0.0 for _ in finals]
+def translate_cell(
+    sentence: str,
+    rate: float,
+    seed: int,
+    agents: Sequence[DictionaryTranslationAgent],
+    fused: Optional[FusedDictionaryChain] = None,
+) -> Dict:
+    """Corrupt the sentence with one seed and run it through the chain."""
+    corrupted = introduce_typos(sentence, rate, seed=seed)
+    pipeline_outputs = fused.run(corrupted) if fused else run_pipeline(corrupted, agents)
+    final_sentence = pipeline_outputs[-1]
+    return {
+        "error_rate": rate,
+        "seed": seed,
+        "input_sentence": corrupted,
+        "french_translation": pipeline_outputs[1],
+        "hebrew_translation": pipeline_outputs[2],
+        "final_sentence": final_sentence,
+        "input_length": count_words(corrupted),
+        "final_length": count_words(final_sentence),
+    }
 
-    vocab_index = {term: idx for idx, term in enumerate(vocabulary)}
-    document_count = len(corpus)
-    doc_freq = Counter()
-    for tokens in tokenized:
-        doc_freq.update(set(tokens))
 
-    idf = {
-        term: math.log((1 + document_count) / (1 + doc_freq[term])) + 1.0
-        for term in vocabulary
-    }
+_WORKER: Dict = {}
+
+
+def _init_sweep_worker(
+    lexicon_dir: Optional[Path],
+    token_cache_dir: Optional[Path],
+    cache_sizes: Sequence[Optional[int]],
+    fused: bool,
+) -> None:
+    """Build the agents once per worker process, with token caches where the parent has them."""
+    agents = build_agents(lexicon_dir)
+    for agent, maxsize in zip(agents, cache_sizes):
+        if maxsize:
+            agent.token_cache = TokenCache(maxsize, track_updates=True)
+            if token_cache_dir:
+                agent.load_token_cache(token_cache_dir)
+    _WORKER["agents"] = agents
+    _WORKER["fused"] = FusedDictionaryChain(agents) if fused else None
+
+
+def _sweep_task(task: Tuple[str, float, int]) -> Tuple[Dict, List[Optional[Dict]]]:
+    """Translate one cell in a worker; also returns the token cache updates it made."""
+    sentence, rate, seed = task
+    agents = _WORKER["agents"]
+    run = translate_cell(sentence, rate, seed, agents, _WORKER["fused"])
+    updates = [agent.token_cache.take_updates() if agent.token_cache is not None else None for agent in agents]
+    return run, updates
+
+
+def sweep(
+    sentence: str,
+    error_rates: Sequence[float],
+    base_seed: int,
+    num_seeds: int,
+    agents: Sequence[DictionaryTranslationAgent],
+    fused: Optional[FusedDictionaryChain] = None,
+    workers: int = 1,
+    lexicon_dir: Optional[Path] = None,
+    token_cache_dir: Optional[Path] = None,
+) -> List[Dict]:
+    """Translate every (rate, seed) cell, ordered by rate then seed.
+
+    Seed k of rate i uses base_seed + k * len(error_rates) + i, so the first
+    seed reproduces the single-seed sweep. With several workers, cells are
+    spread over a process pool whose workers build their own agents; results
+    come back in task order, and token cache updates are merged into `agents`.
+    """
+    tasks = [
+        (sentence, rate, base_seed + seed_idx * len(error_rates) + idx)
+        for idx, rate in enumerate(error_rates)
+        for seed_idx in range(num_seeds)
+    ]
+    if workers <= 1:
+        return [translate_cell(*task, agents, fused) for task in tasks]
 
-    vectors: List[List[float]] = []
-    for tokens in tokenized:
-        counts = Counter(tokens)
-        length = max(len(tokens), 1)
-        vector = [0.0] * len(vocabulary)
-        for term, count in counts.items():
-            idx = vocab_index[term]
-            tf = count / length
-            vector[idx] = tf * idf[term]
-        vectors.append(vector)
+    runs = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_sweep_worker,
+        initargs=(
+            lexicon_dir,
+            token_cache_dir,
+            [agent.token_cache.maxsize if agent.token_cache is not None else None for agent in agents],
+            fused is not None,
+        ),
+    ) as executor:
+        for run, updates in executor.map(_sweep_task, tasks, chunksize=max(1, len(tasks) // (4 * workers))):
+            runs.append(run)
+            for agent, agent_updates in zip(agents, updates):
+                if agent_updates and agent.token_cache is not None:
+                    agent.token_cache.merge_updates(agent_updates)
+    return runs
+
+
+def summarize_by_rate(error_rates: Sequence[float], runs: Sequence[Dict], confidence: float = 0.95) -> List[Dict]:
+    """Mean distance per error rate with a Student-t confidence interval over seeds.
+
+    Rates without runs get n=0 and None for every statistic.
+    """
+    from scipy import stats
+
+    summary = []
+    for rate in error_rates:
+        distances = [run["distance"] for run in runs if run["error_rate"] == rate]
+        n = len(distances)
+        mean = statistics.fmean(distances) if n else None
+        entry = {"error_rate": rate, "n": n, "mean_distance": mean, "std": None, "ci_low": None, "ci_high": None}
+        if n > 1:
+            std = statistics.stdev(distances)
+            half_width = float(stats.t.ppf(0.5 + confidence / 2, n - 1)) * std / math.sqrt(n)
+            entry.update(std=std, ci_low=mean - half_width, ci_high=mean + half_width)
+        summary.append(entry)
+    return summary
 
-    original_vec = vectors[0]
-    distances = [euclidean_distance(original_vec, vectors[i]) for i in range(1, len(vectors))]
-    return distances
 
+def tokenize(text: str) -> List[str]:
+    """The tokenizer compute_distances uses."""
+    return tfidf.tokenize(text)
 
-def count_words(text: str) -> int:
-    return sum(1 for token in text.split() if any(ch.isalpha() for ch in token))
 
+def euclidean_distance(vec1: Sequence[float], vec2: Sequence[float]) -> float:
+    """Distance between two dense vectors, over their common length."""
+    length = min(len(vec1), len(vec2))
+    matrix = sparse.csr_matrix([list(vec1[:length]), list(vec2[:length])], dtype=float)
+    return float(tfidf.distances_to_first(matrix, "euclidean")[0])
 
-def save_json(data, path: Path) -> None:
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
 
+def compute_distances(original: str, finals: Sequence[str], metric: str = "euclidean") -> List[float]:
+    """Distances from the original to each final sentence in a TF-IDF space fitted over all of them."""
+    return tfidf_distances(original, finals, metric)
 
-def tokenize(text: str) -> List[str]:
-    return re.findall(r"[a-zA-Z_]+", text.lower())
 
+def count_words(text: str) -> int:
+    return sum(1 for token in text.split() if any(ch.isalpha() for ch in token))
 
-def euclidean_distance(vec1: Sequence[float], vec2: Sequence[float]) -> float:
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(vec1, vec2)))
+
+def save_json(data, path: Path) -> None:
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
 
 
 def plot_results(error_rates: Sequence[float], distances: Sequence[float], output_path: Path) -> None:
@@ -373,6 +464,14 @@ DEFAULT_SENTENCE = (
 )
 
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run the multi-agent translation typo robustness experiment.")
     parser.add_argument(
@@ -397,56 +496,109 @@ def parse_arguments() -> argparse.Namespace:
         default=Path("results"),
         help="Directory where experiment artifacts will be saved.",
     )
+    parser.add_argument(
+        "--lexicon-dir",
+        type=Path,
+        default=None,
+        help="Directory with en_fr.tsv, fr_he.tsv and he_en.tsv dictionaries to use instead of the built-in ones.",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=METRICS,
+        default="euclidean",
+        help="Distance between TF-IDF vectors of the base and final sentences.",
+    )
+    parser.add_argument(
+        "--scorer",
+        choices=("tfidf", "hashing"),
+        default="tfidf",
+        help="tfidf fits the vocabulary over all finals; hashing scores each final as it arrives in fixed memory.",
+    )
+    parser.add_argument(
+        "--hash-features", type=int, default=DEFAULT_FEATURES, help="Hash buckets for --scorer hashing."
+    )
+    parser.add_argument(
+        "--num-seeds", type=positive_int, default=1, help="Typo seeds per error rate; >1 adds mean and 95% CI per rate."
+    )
+    parser.add_argument(
+        "--workers", type=positive_int, default=1, help="Worker processes for the (rate, seed) sweep."
+    )
+    parser.add_argument(
+        "--token-cache-dir",
+        type=Path,
+        default=None,
+        help="Directory where per-agent fuzzy token caches are loaded from and saved to.",
+    )
+    parser.add_argument(
+        "--fused",
+        action="store_true",
+        help="Translate through the fused, per-token composed chain (same outputs, fewer lookups).",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_arguments()
-    agents = build_agents()
+    agents = build_agents(args.lexicon_dir)
+    if args.token_cache_dir:
+        for agent in agents:
+            agent.load_token_cache(args.token_cache_dir)
+    fused = FusedDictionaryChain(agents) if args.fused else None
     args.output_dir.mkdir(parents=True, exist_ok=True)
 
-    runs = []
-    final_sentences = []
-
-    for idx, rate in enumerate(args.error_rates):
-        corrupted = introduce_typos(args.sentence, rate, seed=args.seed + idx)
-        pipeline_outputs = run_pipeline(corrupted, agents)
-        final_sentence = pipeline_outputs[-1]
-        final_sentences.append(final_sentence)
-        runs.append(
-            {
-                "error_rate": rate,
-                "input_sentence": corrupted,
-                "french_translation": pipeline_outputs[1],
-                "hebrew_translation": pipeline_outputs[2],
-                "final_sentence": final_sentence,
-                "input_length": count_words(corrupted),
-                "final_length": count_words(final_sentence),
-            }
-        )
-
-    distances = compute_distances(args.sentence, final_sentences)
+    runs = sweep(
+        args.sentence,
+        args.error_rates,
+        args.seed,
+        args.num_seeds,
+        agents,
+        fused=fused,
+        workers=args.workers,
+        lexicon_dir=args.lexicon_dir,
+        token_cache_dir=args.token_cache_dir,
+    )
+
+    finals = [run["final_sentence"] for run in runs]
+    if args.scorer == "hashing":
+        scorer = HashingScorer(args.hash_features, metric=args.metric)
+        distances = list(scorer.stream_distances(args.sentence, finals))
+    else:
+        distances = compute_distances(args.sentence, finals, args.metric)
     for run, distance in zip(runs, distances):
         run["distance"] = distance
+    summary = summarize_by_rate(args.error_rates, runs)
 
     plot_path = args.output_dir / "spelling_error_distance.svg"
-    plot_results(args.error_rates, distances, plot_path)
+    plotted = [entry for entry in summary if entry["n"]]
+    plot_results([entry["error_rate"] for entry in plotted], [entry["mean_distance"] for entry in plotted], plot_path)
 
     report = {
         "base_sentence": args.sentence,
         "base_length": count_words(args.sentence),
         "agents": [asdict(agent.describe()) for agent in agents],
+        "num_seeds": args.num_seeds,
+        "scorer": args.scorer,
+        "metric": args.metric,
         "runs": runs,
+        "summary": summary,
         "plot_path": str(plot_path),
     }
+    if args.token_cache_dir:
+        report["token_cache"] = {agent.name: agent.token_cache.stats() for agent in agents}
+        for agent in agents:
+            agent.save_token_cache(args.token_cache_dir)
 
     save_json(report, args.output_dir / "experiment_report.json")
 
+    def seed_label(run: Dict) -> str:
+        return f" (seed {run['seed']})" if args.num_seeds > 1 else ""
+
     sentences_log = "\n\n".join(
         [
             "Base sentence:\n" + args.sentence,
             *[
-                f"Error rate {run['error_rate']:.2f} input:\n{run['input_sentence']}\nFinal output:\n{run['final_sentence']}"
+                f"Error rate {run['error_rate']:.2f}{seed_label(run)} input:\n"
+                f"{run['input_sentence']}\nFinal output:\n{run['final_sentence']}"
                 for run in runs
             ],
         ]
@@ -455,8 +607,20 @@ def main() -> None:
 
     print("Experiment completed. Report saved to", args.output_dir)
     print("Vector distances:")
-    for run in runs:
-        print(f"  error_rate={run['error_rate']:.2f} -> distance={run['distance']:.4f}")
+    for entry in summary:
+        if entry["n"] == 0:
+            print(f"  error_rate={entry['error_rate']:.2f} -> no runs")
+        elif entry["n"] > 1:
+            print(
+                f"  error_rate={entry['error_rate']:.2f} -> mean distance={entry['mean_distance']:.4f} "
+                f"(95% CI {entry['ci_low']:.4f}-{entry['ci_high']:.4f}, n={entry['n']})"
+            )
+        else:
+            print(f"  error_rate={entry['error_rate']:.2f} -> distance={entry['mean_distance']:.4f}")
+    if args.token_cache_dir:
+        print("Token caches:")
+        for name, stats in report["token_cache"].items():
+            print(f"  {name}: {stats['size']} entries, hit rate {stats['hit_rate']:.1%}")
 
 
 if __name__ == "__main__":
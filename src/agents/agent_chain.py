@@ -1,6 +1,6 @@
 """Agent chain orchestrator for multi-stage translation."""
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
 from .translator_agent import (
     EnglishToFrenchAgent,
     FrenchToHebrewAgent,
@@ -9,27 +9,78 @@ from .translator_agent import (
 
 logger = logging.getLogger(__name__)
 
+AGENT_CLASSES = (EnglishToFrenchAgent, FrenchToHebrewAgent, HebrewToEnglishAgent)
+STAGE_SETTINGS = ("model", "temperature", "base_url")
+
 
 class TranslationChain:
     """Orchestrates the 3-stage translation chain: EN → FR → HE → EN."""
     
-    def __init__(self, model: str = "llama3.2:3b", temperature: float = 0.3):
-        """Initialize the translation chain."""
-        self.agents = [
-            EnglishToFrenchAgent(model=model, temperature=temperature),
-            FrenchToHebrewAgent(model=model, temperature=temperature),
-            HebrewToEnglishAgent(model=model, temperature=temperature)
-        ]
+    def __init__(
+        self,
+        model: str = "llama3.2:3b",
+        temperature: float = 0.3,
+        stages: Optional[Sequence[Dict[str, Any]]] = None,
+        base_url: str = "http://localhost:11434"
+    ):
+        """Initialize the translation chain.
+        
+        `stages` optionally overrides model, temperature or base_url for
+        each stage in order; stages without an entry use the shared values.
+        """
+        stages = list(stages or [])
+        if len(stages) > len(AGENT_CLASSES):
+            raise ValueError(f"Got settings for {len(stages)} stages, the chain has {len(AGENT_CLASSES)}")
+        self.agents = []
+        for i, agent_class in enumerate(AGENT_CLASSES):
+            settings = {"model": model, "temperature": temperature, "base_url": base_url}
+            overrides = (stages[i] if i < len(stages) else None) or {}
+            unknown = sorted(set(overrides) - set(STAGE_SETTINGS))
+            if unknown:
+                raise ValueError(f"Unknown settings {unknown} for stage {i + 1}, expected some of {STAGE_SETTINGS}")
+            settings.update(overrides)
+            self.agents.append(agent_class(**settings))
         logger.info("TranslationChain initialized with 3 agents")
+    
+    @classmethod
+    def from_config(cls, ollama_config: Dict[str, Any]) -> "TranslationChain":
+        """Chain from the `ollama` section of config.yaml, with its optional per-stage `stages` list."""
+        return cls(
+            model=ollama_config.get('model', "llama3.2:3b"),
+            temperature=ollama_config.get('temperature', 0.3),
+            stages=ollama_config.get('stages'),
+            base_url=ollama_config.get('base_url', "http://localhost:11434")
+        )
+    
+    def stage_specs(self) -> List[Dict[str, Any]]:
+        """Per stage, everything besides its input that determines its output."""
+        return [agent.spec() for agent in self.agents]
+    
+    def run(self, input_text: str, done: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Run full translation chain.
         
-    def run(self, input_text: str) -> Dict[str, Any]:
-        """Run full translation chain."""
+        `done` holds outputs already computed for the leading stages; those
+        stages are not called again and the chain continues from the last one.
+        """
         logger.info(f"Starting translation chain | Input length: {len(input_text)} chars")
         
         stages: List[Dict[str, Any]] = []
         current_text = input_text
+        done = list(done or [])
         
         for i, agent in enumerate(self.agents, 1):
+            if i <= len(done):
+                stages.append({
+                    "input": current_text,
+                    "output": done[i - 1],
+                    "agent": agent.__class__.__name__,
+                    "model": agent.model,
+                    "source_lang": agent.get_source_language(),
+                    "target_lang": agent.get_target_language(),
+                    "reused": True
+                })
+                current_text = done[i - 1]
+                continue
             logger.info(f"Stage {i}/3: {agent.__class__.__name__}")
             result = agent.translate(current_text)
             stages.append(result)
@@ -41,4 +92,4 @@ class TranslationChain:
             "original": input_text,
             "final": current_text,
             "stages": stages
-        }
\ No newline at end of file
+        }
@@ -10,6 +10,8 @@ logger = logging.getLogger(__name__)
 class BaseAgent(ABC):
     """Abstract base class for translation agents."""
     
+    num_predict = 300
+    
     def __init__(
         self,
         model: str = "llama3.2:3b",
@@ -38,6 +40,16 @@ class BaseAgent(ABC):
         """Return target language code (e.g., 'fr')."""
         pass
     
+    def spec(self) -> Dict[str, Any]:
+        """Everything that determines this agent's output for a given input."""
+        return {
+            "agent": self.__class__.__name__,
+            "model": self.model,
+            "temperature": self.temperature,
+            "num_predict": self.num_predict,
+            "system_prompt": self.get_system_prompt(),
+        }
+    
     def translate(self, text: str) -> Dict[str, Any]:
         """Translate text using this agent."""
         logger.info(
@@ -55,7 +67,7 @@ class BaseAgent(ABC):
                 ],
                 stream=False,
                 options={"temperature": self.temperature,
-			 "num_predict": 300,
+			 "num_predict": self.num_predict,
 			 "timeout": 60.0}
             )
             
@@ -0,0 +1,8 @@
+"""Statistical analysis of experiment results."""
+from .bootstrap import bootstrap_report
+from .report import build_report
+from .streaming import QuantileSketch, StreamingGroupStats
+from .summary_cube import SummaryCube
+from .variance import curve_statistics, variance_reduction_report
+
+__all__ = ["QuantileSketch", "bootstrap_report", "build_report", "StreamingGroupStats", "SummaryCube", "curve_statistics", "variance_reduction_report"]
@@ -0,0 +1,112 @@
+"""Bootstrap confidence intervals for group mean distances and the distance-vs-rate slope."""
+from typing import Any, Dict, Tuple
+import numpy as np
+import pandas as pd
+
+# Upper bound on the elements of one resample index matrix
+BLOCK_ELEMENTS = 1 << 22
+
+
+def bootstrap_means(
+    codes: np.ndarray,
+    values: np.ndarray,
+    n_resamples: int = 10_000,
+    seed: int = 0,
+    block_elements: int = BLOCK_ELEMENTS,
+) -> np.ndarray:
+    """(groups x n_resamples) means of each group's values resampled with replacement.
+
+    `codes` assigns each value to a group 0..G-1. Each group draws one
+    (resamples x size) index matrix, split into blocks of at most
+    `block_elements` so memory stays bounded for large groups.
+    """
+    codes = np.asarray(codes)
+    values = np.asarray(values, dtype=float)
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be at least 1")
+    rng = np.random.default_rng(seed)
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes, minlength=codes.max() + 1 if len(codes) else 0)
+    starts = np.concatenate([[0], np.cumsum(sizes)])
+
+    replicates = np.empty((len(sizes), n_resamples))
+    for group, size in enumerate(sizes):
+        if size == 0:
+            replicates[group] = np.nan
+            continue
+        members = values[order[starts[group]:starts[group + 1]]]
+        block = max(1, block_elements // size)
+        # 32-bit draws are cheaper than 64-bit ones
+        index_dtype = np.int32 if size < 2**31 else np.int64
+        for begin in range(0, n_resamples, block):
+            end = min(begin + block, n_resamples)
+            index = rng.integers(0, size, size=(end - begin, size), dtype=index_dtype)
+            replicates[group, begin:end] = members.take(index).mean(axis=1)
+    return replicates
+
+
+def percentile_interval(replicates: np.ndarray, confidence: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """Lower and upper percentile bounds along the last axis."""
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(replicates, [tail, 1 - tail], axis=-1)
+    return low, high
+
+
+def _slopes(rates: np.ndarray, counts: np.ndarray, means: np.ndarray) -> np.ndarray:
+    """Least-squares slopes over all rows, from group rates, sizes and (replicated) means."""
+    centered = rates - np.average(rates, weights=counts)
+    weights = counts * centered
+    return weights @ means / (weights @ centered)
+
+
+def bootstrap_report(
+    df: pd.DataFrame,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Bootstrap CIs for mean distance per (error_rate, sentence_id) and for the slope vs error rate.
+
+    Rows are resampled within each (error_rate, sentence_id) group, since
+    the rates and sentences are fixed by the experiment design. The
+    least-squares slope of distance on rate is linear in the group means,
+    so the slope replicates come from the group mean replicates with no
+    further resampling: pooled over sentences and per sentence.
+    """
+    if df.empty:
+        raise ValueError("No results to bootstrap")
+    grouper = df.groupby(["error_rate", "sentence_id"], sort=True)
+    codes = grouper.ngroup().to_numpy()
+    groups = grouper.size().reset_index()[["error_rate", "sentence_id"]]
+    distances = df["distance"].to_numpy(dtype=float)
+
+    replicates = bootstrap_means(codes, distances, n_resamples, seed)
+    low, high = percentile_interval(replicates, confidence)
+    counts = np.bincount(codes, minlength=len(groups)).astype(float)
+    means = np.bincount(codes, weights=distances, minlength=len(groups)) / counts
+    rates = groups["error_rate"].to_numpy(dtype=float)
+    groups = groups.assign(count=counts.astype(np.int64), mean=means, ci_low=low, ci_high=high)
+
+    def slope_row(mask: np.ndarray) -> Dict[str, float]:
+        if np.unique(rates[mask]).size < 2:
+            return {"slope": np.nan, "ci_low": np.nan, "ci_high": np.nan}
+        slope_low, slope_high = percentile_interval(_slopes(rates[mask], counts[mask], replicates[mask]), confidence)
+        return {
+            "slope": float(_slopes(rates[mask], counts[mask], means[mask])),
+            "ci_low": float(slope_low),
+            "ci_high": float(slope_high),
+        }
+
+    sentence_ids = groups["sentence_id"].to_numpy()
+    sentence_slopes = pd.DataFrame([
+        {"sentence_id": sid, **slope_row(sentence_ids == sid)} for sid in np.unique(sentence_ids)
+    ])
+    return {
+        "n_resamples": n_resamples,
+        "confidence": confidence,
+        "groups": groups,
+        "slope": slope_row(np.ones(len(groups), dtype=bool)),
+        "sentence_slopes": sentence_slopes,
+    }
@@ -0,0 +1,288 @@
+"""Report figures from experiment results: one-pass statistics, parallel rendering, input stamps."""
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when a figure's drawing code changes, so stamped figures are redrawn
+REPORT_VERSION = 1
+
+COLUMNS = ["error_rate", "sentence_id", "distance"]
+FIGURES = {
+    "detailed": "error_impact_detailed.png",
+    "by_sentence": "error_impact_graph.png",
+}
+STAMP_FILE = ".report_stamps.json"
+
+SENTENCE_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
+
+PathLike = Union[str, Path]
+
+
+def file_digest(path: PathLike, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def summarize(df: pd.DataFrame) -> Dict[str, Any]:
+    """Everything the figures draw, from one sort of the rows by error rate.
+
+    Per rate: the distances themselves (for box and scatter plots) and their
+    mean, sample std, min, max and count. Per (rate, sentence): mean and std.
+    """
+    if df.empty:
+        raise ValueError("No results to report")
+    rates = df["error_rate"].to_numpy(dtype=float)
+    distances = df["distance"].to_numpy(dtype=float)
+    order = np.argsort(rates, kind="stable")
+    sorted_rates = rates[order]
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(sorted_rates)) + 1])
+    groups = np.split(distances[order], starts[1:])
+
+    by_rate = {
+        "error_rate": sorted_rates[starts],
+        "mean": np.array([group.mean() for group in groups]),
+        "std": np.array([group.std(ddof=1) if len(group) > 1 else np.nan for group in groups]),
+        "min": np.array([group.min() for group in groups]),
+        "max": np.array([group.max() for group in groups]),
+        "count": np.array([len(group) for group in groups], dtype=np.int64),
+    }
+    by_sentence = df.groupby(["error_rate", "sentence_id"])["distance"].agg(["mean", "std"]).reset_index()
+    return {
+        "rows": len(df),
+        "by_rate": by_rate,
+        "values": groups,
+        "points": (rates, distances),
+        "by_sentence": by_sentence,
+    }
+
+
+def plot_by_sentence(ax, grouped: pd.DataFrame) -> None:
+    """Mean distance per rate for each sentence, with a ±1 std band.
+
+    If `grouped` has ci_low/ci_high columns (bootstrap.bootstrap_report),
+    the band is that confidence interval instead.
+    """
+    for i, sid in enumerate(sorted(grouped['sentence_id'].unique())):
+        subset = grouped[grouped['sentence_id'] == sid].sort_values('error_rate')
+        color = SENTENCE_COLORS[i % len(SENTENCE_COLORS)]
+
+        ax.plot(
+            subset['error_rate'] * 100,
+            subset['mean'],
+            marker='o',
+            label=f'Sentence {sid + 1}',
+            linewidth=2.5,
+            markersize=8,
+            color=color
+        )
+
+        if 'ci_low' in subset:
+            ax.fill_between(subset['error_rate'] * 100, subset['ci_low'], subset['ci_high'], alpha=0.2, color=color)
+        elif (subset['std'] > 0).any():
+            ax.fill_between(
+                subset['error_rate'] * 100,
+                subset['mean'] - subset['std'],
+                subset['mean'] + subset['std'],
+                alpha=0.2,
+                color=color
+            )
+
+    ax.set_xlabel('Spelling Error Rate (%)', fontsize=13, fontweight='bold')
+    ax.set_ylabel('Cosine Distance', fontsize=13, fontweight='bold')
+    ax.set_title('Impact of Spelling Errors on Semantic Preservation', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=11)
+    ax.grid(True, alpha=0.3)
+
+
+def _new_figure(figsize):
+    # Figures are built without pyplot, so rendering never touches the
+    # interactive backend and is safe in worker processes
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def render_by_sentence(data: Dict[str, Any], path: PathLike, dpi: int = 300) -> None:
+    """Per-sentence curves (the `analyze` graph)."""
+    figure = _new_figure((12, 7))
+    plot_by_sentence(figure.add_subplot(), data["by_sentence"])
+    figure.tight_layout()
+    figure.savefig(path, dpi=dpi, bbox_inches='tight')
+
+
+def render_detailed(data: Dict[str, Any], path: PathLike, dpi: int = 300) -> None:
+    """Mean with error bars, all points, per-rate boxes and a statistics table."""
+    from matplotlib import colormaps
+
+    by_rate = data["by_rate"]
+    error_rates, means, stds = by_rate["error_rate"], by_rate["mean"], by_rate["std"]
+    rates, distances = data["points"]
+    labels = [f'{int(rate * 100)}%' for rate in error_rates]
+
+    figure = _new_figure((14, 10))
+    axes = figure.subplots(2, 2)
+    figure.suptitle(
+        f'Translation Error Impact Analysis ({data["rows"]} Experiments)', fontsize=16, fontweight='bold'
+    )
+
+    ax1 = axes[0, 0]
+    ax1.errorbar(error_rates * 100, means, yerr=stds,
+                 marker='o', markersize=8, capsize=5, linewidth=2,
+                 color='#2E86AB', ecolor='#A23B72')
+    ax1.set_xlabel('Error Rate (%)', fontsize=12)
+    ax1.set_ylabel('Semantic Distance', fontsize=12)
+    ax1.set_title('Mean Distance vs Error Rate', fontsize=14, fontweight='bold')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(0, max(means) * 1.2)
+
+    ax2 = axes[0, 1]
+    max_rate = rates.max() if rates.max() > 0 else 1.0
+    ax2.scatter(rates * 100, distances,
+                c=colormaps['viridis'](rates / max_rate), alpha=0.6, s=50, edgecolors='black', linewidth=0.5)
+    ax2.set_xlabel('Error Rate (%)', fontsize=12)
+    ax2.set_ylabel('Semantic Distance', fontsize=12)
+    ax2.set_title(f'All {len(distances)} Individual Measurements', fontsize=14, fontweight='bold')
+    ax2.grid(True, alpha=0.3)
+
+    ax3 = axes[1, 0]
+    bp = ax3.boxplot(data["values"], patch_artist=True)
+    ax3.set_xticks(range(1, len(labels) + 1), labels)
+    for patch in bp['boxes']:
+        patch.set_facecolor('#A8DADC')
+        patch.set_alpha(0.7)
+    ax3.set_xlabel('Error Rate', fontsize=12)
+    ax3.set_ylabel('Semantic Distance', fontsize=12)
+    ax3.set_title('Distribution by Error Rate', fontsize=14, fontweight='bold')
+    ax3.grid(True, alpha=0.3, axis='y')
+
+    ax4 = axes[1, 1]
+    ax4.axis('off')
+    table_data = [
+        [label, f"{mean:.3f}", f"{std:.3f}", f"{count}"]
+        for label, mean, std, count in zip(labels, means, stds, by_rate["count"])
+    ]
+    table = ax4.table(cellText=table_data,
+                      colLabels=['Error Rate', 'Mean', 'Std Dev', 'N'],
+                      cellLoc='center',
+                      loc='center',
+                      colWidths=[0.25, 0.25, 0.25, 0.25])
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 2)
+    for i in range(len(table_data) + 1):
+        for j in range(4):
+            if i == 0:
+                table[(i, j)].set_facecolor('#457B9D')
+                table[(i, j)].set_text_props(weight='bold', color='white')
+            else:
+                table[(i, j)].set_facecolor('#F1FAEE' if i % 2 == 0 else 'white')
+    ax4.set_title('Summary Statistics', fontsize=14, fontweight='bold', pad=20)
+
+    figure.tight_layout()
+    figure.savefig(path, dpi=dpi, bbox_inches='tight')
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any], PathLike, int], None]] = {
+    "detailed": render_detailed,
+    "by_sentence": render_by_sentence,
+}
+
+
+def _render_job(job) -> str:
+    name, data, path, dpi = job
+    RENDERERS[name](data, path, dpi)
+    return name
+
+
+def _stamp(digest: str, dpi: int) -> Dict[str, Any]:
+    return {"input": digest, "dpi": dpi, "version": REPORT_VERSION}
+
+
+def _read_stamps(output_dir: Path) -> Dict[str, Any]:
+    try:
+        with open(output_dir / STAMP_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_current(stamp: Dict[str, Any], digest: str, dpi: int, path: Path) -> bool:
+    """Whether a figure was drawn from this input and settings, and its file is still the one drawn."""
+    expected = _stamp(digest, dpi)
+    if {key: stamp.get(key) for key in expected} != expected or not path.exists():
+        return False
+    return stamp.get("figure") == file_digest(path)
+
+
+def stale_figures(output_dir: PathLike, digest: str, figures: Sequence[str], dpi: int = 300) -> List[str]:
+    """Figures whose file is missing, was overwritten, or was drawn from other input or settings."""
+    output_dir = Path(output_dir)
+    stamps = _read_stamps(output_dir)
+    return [
+        name for name in figures
+        if not _is_current(stamps.get(name, {}), digest, dpi, output_dir / FIGURES[name])
+    ]
+
+
+def build_report(
+    input_path: PathLike,
+    output_dir: PathLike,
+    load: Callable[[PathLike, Sequence[str]], pd.DataFrame],
+    figures: Optional[Sequence[str]] = None,
+    workers: int = 1,
+    dpi: int = 300,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Render the report figures that are out of date; returns what was rendered and skipped.
+
+    `load(path, columns)` reads the results (results_io.load_results_frame).
+    Figures are stamped with the SHA-256 of the input file, the dpi,
+    REPORT_VERSION and the SHA-256 of the figure file itself, so a figure
+    another command overwrote (analyze draws error_impact_graph.png too) is
+    redrawn. When every stamp matches, the results are not even loaded.
+    Stale figures render in up to `workers` processes.
+    """
+    figures = list(FIGURES if figures is None else figures)
+    unknown = [name for name in figures if name not in FIGURES]
+    if unknown:
+        raise ValueError(f"Unknown figures {unknown}, expected some of {list(FIGURES)}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    digest = file_digest(input_path)
+    todo = figures if force else stale_figures(output_dir, digest, figures, dpi)
+    paths = {name: output_dir / FIGURES[name] for name in figures}
+    if not todo:
+        return {"rendered": [], "skipped": figures, "paths": paths}
+
+    data = summarize(load(input_path, COLUMNS))
+    jobs = [(name, data, paths[name], dpi) for name in todo]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            list(pool.map(_render_job, jobs))
+    else:
+        for job in jobs:
+            _render_job(job)
+
+    stamps = _read_stamps(output_dir)
+    stamps.update({name: {**_stamp(digest, dpi), "figure": file_digest(paths[name])} for name in todo})
+    tmp_path = output_dir / (STAMP_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stamps, f, indent=2)
+    os.replace(tmp_path, output_dir / STAMP_FILE)
+    logger.info(f"Rendered {todo} from {input_path}")
+    return {"rendered": todo, "skipped": [name for name in figures if name not in todo], "paths": paths}
@@ -0,0 +1,194 @@
+"""Constant-memory grouped statistics over results read in chunks."""
+import math
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class QuantileSketch:
+    """KLL-style mergeable quantile sketch.
+
+    Values enter level 0. A level holding more than its capacity is sorted
+    and every second value (from a random start) moves up one level with
+    twice the weight, so total weight is preserved exactly. Capacities shrink
+    by 2/3 per level below the top, which keeps the size at
+    O(k log(n / k)) and the rank error around 1/k of the count. Up to k
+    values nothing is compacted and quantiles are exact.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0):
+        if k < 2:
+            raise ValueError(f"k must be at least 2, got {k}")
+        self.k = k
+        self.count = 0
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        """Number of values retained."""
+        return sum(len(level) for level in self._levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                even = len(items) - len(items) % 2
+                promoted = items[int(self._rng.integers(2)):even:2]
+                self._levels[level] = items[even:]
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values."""
+        values = np.asarray(values, dtype=float).ravel()
+        self.count += len(values)
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch into this one."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state (the random stream restarts on reload)."""
+        return {"k": self.k, "count": self.count, "levels": [level.tolist() for level in self._levels]}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any], seed: int = 0) -> "QuantileSketch":
+        """Sketch restored from to_dict()."""
+        sketch = cls(state["k"], seed=seed)
+        sketch.count = state["count"]
+        sketch._levels = [np.asarray(level, dtype=float) for level in state["levels"]] or [np.empty(0)]
+        return sketch
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Estimated quantiles: the smallest retained value whose weighted rank reaches q."""
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(qs, dtype=float) * cumulative[-1], side="left")
+        return values[order][np.minimum(positions, len(values) - 1)]
+
+
+class StreamingGroupStats:
+    """Per-group count, mean, variance, range and quantile sketch, updated chunk by chunk.
+
+    Each chunk is reduced per group with bincounts, then merged into the
+    running moments with Chan et al.'s pairwise update (Welford's method
+    for blocks). Memory grows with the number of groups, not rows. Key
+    columns must be numeric.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str] = ("error_rate", "sentence_id"),
+        value: str = "distance",
+        sketch_k: int = 200,
+    ):
+        self.keys = list(keys)
+        self.value = value
+        self.sketch_k = sketch_k
+        self.rows = 0
+        self._index: Dict[Tuple, int] = {}
+        self._count = np.zeros(0, dtype=np.int64)
+        self._mean = np.zeros(0)
+        self._m2 = np.zeros(0)
+        self._min = np.zeros(0)
+        self._max = np.zeros(0)
+        self._sketches: List[QuantileSketch] = []
+
+    def _group_ids(self, group_codes: np.ndarray, levels: List[list]) -> np.ndarray:
+        """Global group index of each combined chunk code, registering new groups."""
+        ids = np.empty(len(group_codes), dtype=np.int64)
+        for i, code in enumerate(group_codes.tolist()):
+            parts = []
+            for column_levels in reversed(levels):
+                code, position = divmod(code, len(column_levels))
+                parts.append(column_levels[position])
+            key = tuple(reversed(parts))
+            group = self._index.get(key)
+            if group is None:
+                group = self._index[key] = len(self._index)
+                self._sketches.append(QuantileSketch(self.sketch_k, seed=group))
+            ids[i] = group
+        grow = len(self._index) - len(self._count)
+        if grow:
+            self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.int64)])
+            self._mean = np.concatenate([self._mean, np.zeros(grow)])
+            self._m2 = np.concatenate([self._m2, np.zeros(grow)])
+            self._min = np.concatenate([self._min, np.full(grow, np.inf)])
+            self._max = np.concatenate([self._max, np.full(grow, -np.inf)])
+        return ids
+
+    def update(self, chunk: Dict[str, np.ndarray]) -> None:
+        """Fold in a chunk of columns (as yielded by results_io.iter_result_chunks)."""
+        values = np.asarray(chunk[self.value], dtype=float)
+        if not len(values):
+            return
+        # Factorize each key column, then the combined code: 1-D sorts are far
+        # cheaper than sorting a structured array
+        levels, combined = [], np.zeros(len(values), dtype=np.int64)
+        for key in self.keys:
+            column_levels, codes = np.unique(np.asarray(chunk[key]), return_inverse=True)
+            levels.append(column_levels.tolist())
+            combined = combined * len(column_levels) + codes.ravel()
+        group_codes, inverse = np.unique(combined, return_inverse=True)
+        inverse = inverse.ravel()
+        ids = self._group_ids(group_codes, levels)
+
+        count_b = np.bincount(inverse, minlength=len(group_codes))
+        mean_b = np.bincount(inverse, weights=values, minlength=len(group_codes)) / count_b
+        m2_b = np.bincount(inverse, weights=(values - mean_b[inverse]) ** 2, minlength=len(group_codes))
+
+        count_a, mean_a = self._count[ids], self._mean[ids]
+        total = count_a + count_b
+        delta = mean_b - mean_a
+        self._mean[ids] = mean_a + delta * count_b / total
+        self._m2[ids] += m2_b + delta ** 2 * count_a * count_b / total
+        self._count[ids] = total
+        order = np.argsort(inverse, kind="stable")
+        parts = np.split(values[order], np.cumsum(count_b)[:-1])
+        for group, part in zip(ids.tolist(), parts):
+            self._min[group] = min(self._min[group], part.min())
+            self._max[group] = max(self._max[group], part.max())
+            self._sketches[group].update(part)
+        self.rows += len(values)
+
+    def consume(self, chunks: Iterable[Dict[str, np.ndarray]]) -> "StreamingGroupStats":
+        """Fold in every chunk of an iterable; returns self."""
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def frame(self) -> pd.DataFrame:
+        """One row per group, sorted by key: count, mean, std (ddof=1), min, max and quartiles."""
+        keys = list(self._index)
+        ids = np.array(list(self._index.values()), dtype=np.int64)
+        count = self._count[ids]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.where(count > 1, np.sqrt(self._m2[ids] / (count - 1)), np.nan)
+        data = {key: [group[i] for group in keys] for i, key in enumerate(self.keys)}
+        data.update(count=count, mean=self._mean[ids], std=std, min=self._min[ids], max=self._max[ids])
+        quantiles = np.array([self._sketches[group].quantiles(QUANTILES) for group in ids])
+        quantiles = quantiles.reshape(len(ids), len(QUANTILES))
+        for column, values in zip(("q25", "median", "q75"), quantiles.T):
+            data[column] = values
+        return pd.DataFrame(data).sort_values(self.keys).reset_index(drop=True)
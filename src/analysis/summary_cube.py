@@ -0,0 +1,177 @@
+"""Materialized summary of experiment distances, updated as results arrive."""
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from .streaming import QUANTILES, QuantileSketch
+
+CUBE_VERSION = 1
+DIMENSIONS = ("sentence_id", "error_rate", "model", "stage")
+
+PathLike = Union[str, Path]
+Key = Tuple[int, float, str, str]
+
+
+def summary_path(results_path: PathLike) -> Path:
+    """Where experiment keeps the summary of a results file: <stem>.summary.json beside it."""
+    results_path = Path(results_path)
+    return results_path.with_name(results_path.stem + ".summary.json")
+
+
+class _Cell:
+    """Additive moments of one group, plus its quantile sketch."""
+
+    __slots__ = ("count", "total", "total_sq", "min", "max", "sketch")
+
+    def __init__(self, sketch: QuantileSketch):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = sketch
+
+    def add(self, values: np.ndarray) -> None:
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.total_sq += float(np.square(values).sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+
+
+class SummaryCube:
+    """count, sum, sum of squares, min, max and a quantile sketch per (sentence, rate, model, stage).
+
+    Rows are folded in as they are scored, and save() rewrites the small
+    JSON file atomically, so readers never see a partial file. Any rollup
+    is exact for the moments, since sums add across groups. `status`
+    and `analyze --summary` read this file instead of the raw rows.
+    """
+
+    def __init__(self, total_cells: Optional[int] = None, sketch_k: int = 200):
+        self.total_cells = total_cells
+        self.sketch_k = sketch_k
+        self.rows = 0
+        self.started = time.time()
+        self.updated = self.started
+        self._cells: Dict[Key, _Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def add(self, sentence_id: int, error_rate: float, model: str, stage: str, values: Sequence[float]) -> None:
+        """Fold distances into one group."""
+        values = np.asarray(values, dtype=float).ravel()
+        if not len(values):
+            return
+        key = (int(sentence_id), float(error_rate), str(model), str(stage))
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = _Cell(QuantileSketch(self.sketch_k, seed=len(self._cells)))
+        cell.add(values)
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]], model: str) -> None:
+        """Fold scored experiment rows: `distance` as stage "final", `stage_distances` as stage1.."""
+        for row in rows:
+            self.add(row["sentence_id"], row["error_rate"], model, "final", [row["distance"]])
+            for stage, distance in enumerate(row.get("stage_distances", ()), 1):
+                self.add(row["sentence_id"], row["error_rate"], model, f"stage{stage}", [distance])
+            self.rows += 1
+        self.updated = time.time()
+
+    def frame(self, by: Sequence[str] = ("error_rate", "sentence_id"), **filters: Any) -> pd.DataFrame:
+        """Rolled-up statistics grouped by some dimensions, after filtering others (e.g. stage="final").
+
+        Columns: the `by` dimensions, count, mean, std (ddof=1), min, max,
+        and quartiles from the merged sketches.
+        """
+        unknown = [name for name in [*by, *filters] if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown dimensions {unknown}, expected some of {DIMENSIONS}")
+        groups: Dict[Tuple, List[_Cell]] = {}
+        for key, cell in self._cells.items():
+            coordinates = dict(zip(DIMENSIONS, key))
+            if all(coordinates[name] == value for name, value in filters.items()):
+                groups.setdefault(tuple(coordinates[name] for name in by), []).append(cell)
+
+        records = []
+        for group, cells in groups.items():
+            count = sum(cell.count for cell in cells)
+            total = sum(cell.total for cell in cells)
+            total_sq = sum(cell.total_sq for cell in cells)
+            mean = total / count
+            variance = max(total_sq - count * mean * mean, 0.0) / (count - 1) if count > 1 else math.nan
+            sketch = QuantileSketch(self.sketch_k)
+            for cell in cells:
+                sketch.merge(cell.sketch)
+            q25, median, q75 = sketch.quantiles(QUANTILES)
+            records.append({
+                **dict(zip(by, group)),
+                "count": count,
+                "mean": mean,
+                "std": math.sqrt(variance),
+                "min": min(cell.min for cell in cells),
+                "max": max(cell.max for cell in cells),
+                "q25": q25,
+                "median": median,
+                "q75": q75,
+            })
+        columns = [*by, "count", "mean", "std", "min", "max", "q25", "median", "q75"]
+        frame = pd.DataFrame(records, columns=columns)
+        return frame.sort_values(list(by)).reset_index(drop=True) if by else frame
+
+    def status(self) -> Dict[str, Any]:
+        """Progress of the run that writes this cube."""
+        return {
+            "rows": self.rows,
+            "total_cells": self.total_cells,
+            "fraction_done": self.rows / self.total_cells if self.total_cells else None,
+            "groups": len(self._cells),
+            "started": self.started,
+            "updated": self.updated,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": CUBE_VERSION,
+            "total_cells": self.total_cells,
+            "sketch_k": self.sketch_k,
+            "rows": self.rows,
+            "started": self.started,
+            "updated": self.updated,
+            "cells": [
+                [*key, cell.count, cell.total, cell.total_sq, cell.min, cell.max, cell.sketch.to_dict()]
+                for key, cell in self._cells.items()
+            ],
+        }
+
+    def save(self, path: PathLike) -> None:
+        """Write the cube to a temporary file and rename it into place."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: PathLike) -> "SummaryCube":
+        """Cube saved by save()."""
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != CUBE_VERSION:
+            raise ValueError(f"{path} has summary version {state.get('version')}, expected {CUBE_VERSION}")
+        cube = cls(state["total_cells"], state["sketch_k"])
+        cube.rows = state["rows"]
+        cube.started = state["started"]
+        cube.updated = state["updated"]
+        for index, (*key, count, total, total_sq, low, high, sketch) in enumerate(state["cells"]):
+            cell = _Cell(QuantileSketch.from_dict(sketch, seed=index))
+            cell.count, cell.total, cell.total_sq, cell.min, cell.max = count, total, total_sq, low, high
+            cube._cells[tuple(key)] = cell
+        return cube
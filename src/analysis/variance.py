@@ -0,0 +1,105 @@
+"""Slope variance of the distance-vs-error-rate curve, and CRN variance reduction."""
+import logging
+import math
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def run_curves(records: List[Dict[str, Any]]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """Per sentence: sorted error rates and a (runs x rates) distance matrix.
+
+    Runs missing any of the sentence's rates are dropped.
+    """
+    cells = defaultdict(dict)
+    for record in records:
+        cells[(record["sentence_id"], record["run"])][record["error_rate"]] = record["distance"]
+
+    rates_by_sentence = defaultdict(set)
+    for (sentence_id, _), curve in cells.items():
+        rates_by_sentence[sentence_id].update(curve)
+
+    curves = {}
+    for sentence_id, rate_set in rates_by_sentence.items():
+        rates = np.array(sorted(rate_set))
+        rows = [
+            [curve[rate] for rate in rates]
+            for (sid, _), curve in sorted(cells.items()) if sid == sentence_id and len(curve) == len(rates)
+        ]
+        curves[sentence_id] = (rates, np.array(rows, dtype=float).reshape(len(rows), len(rates)))
+    return curves
+
+
+def curve_statistics(records: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Between-run variability of the distance-vs-rate curve, pooled over sentences.
+
+    `slope_variance` is the sample variance across runs of each run's
+    least-squares slope; `step_variance` is the same for the distance change
+    between consecutive rates, averaged over steps. Both are averaged over
+    sentences. `slope_se` is the standard error of a sentence's mean slope.
+    """
+    slope_variances, step_variances, slopes = [], [], []
+    num_runs = None
+    for rates, distances in run_curves(records).values():
+        runs = len(distances)
+        num_runs = runs if num_runs is None else min(num_runs, runs)
+        if len(rates) < 2 or runs == 0:
+            continue
+        centered = rates - rates.mean()
+        run_slopes = distances @ centered / (centered @ centered)
+        slopes.extend(run_slopes.tolist())
+        if runs > 1:
+            slope_variances.append(np.var(run_slopes, ddof=1))
+            step_variances.append(np.var(np.diff(distances, axis=1), axis=0, ddof=1).mean())
+
+    slope_variance = float(np.mean(slope_variances)) if slope_variances else float("nan")
+    return {
+        "sentences": len(slope_variances),
+        "num_runs": num_runs or 0,
+        "slope_mean": float(np.mean(slopes)) if slopes else float("nan"),
+        "slope_variance": slope_variance,
+        "slope_se": math.sqrt(slope_variance / num_runs) if slope_variances else float("nan"),
+        "step_variance": float(np.mean(step_variances)) if step_variances else float("nan"),
+    }
+
+
+def _reduction(independent: float, nested: float, num_runs: int) -> Dict[str, Any]:
+    """Variance ratio and the nested run count matching the independent precision."""
+    ratio = nested / independent if independent > 0 else float("nan")
+    finite = bool(np.isfinite(ratio))
+    return {
+        "variance_ratio": ratio,
+        "variance_reduction": 1.0 - ratio if finite else float("nan"),
+        "runs_for_equal_precision": max(1, math.ceil(num_runs * ratio)) if finite else None,
+    }
+
+
+def variance_reduction_report(
+    independent: List[Dict[str, Any]],
+    nested: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Compare curve variability between independent and nested (CRN) corruption.
+
+    Standard errors scale with 1/sqrt(runs), so nested corruption needs about
+    `variance_ratio` times as many runs for the same precision;
+    `runs_for_equal_precision` applies that to the independent run count.
+    Nesting couples consecutive rates, so it mainly shrinks `step` variance;
+    whether the `slope` variance drops depends on the distance metric.
+    """
+    stats_independent = curve_statistics(independent)
+    stats_nested = curve_statistics(nested)
+    num_runs = stats_independent["num_runs"]
+    return {
+        "independent": stats_independent,
+        "nested": stats_nested,
+        "slope": _reduction(stats_independent["slope_variance"], stats_nested["slope_variance"], num_runs),
+        "step": _reduction(stats_independent["step_variance"], stats_nested["step_variance"], num_runs),
+    }
+
+
+def corruption_distance(original: str, corrupted: str) -> float:
+    """Translation-free proxy distance: 1 - difflib similarity ratio."""
+    return 1.0 - SequenceMatcher(None, original, corrupted).ratio()
@@ -3,6 +3,7 @@ import logging
 import json
 import sys
 from pathlib import Path
+from typing import List
 import typer
 from rich.console import Console
 from rich.progress import track, Progress, SpinnerColumn, TextColumn
@@ -13,7 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from agents.agent_chain import TranslationChain
 from embeddings.similarity import SimilarityCalculator
-from utils.error_injection import inject_errors
+from utils.error_injection import inject_errors, inject_errors_nested
 
 app = typer.Typer()
 console = Console()
@@ -51,12 +52,148 @@ def translate(
     console.print(f"[cyan]Semantic Distance:[/cyan] {distance:.4f}")
 
 
+def _score_pending(calc, pending: list, drift=None) -> list:
+    """Score a batch of translated cells with one batched embedding pass."""
+    distances = calc.batch_calculate([(row['original'], row['final']) for row in pending])
+    for row, distance in zip(pending, distances):
+        row['distance'] = float(distance)
+    
+    if drift is not None and pending:
+        scores = drift.score(
+            [row['original'] for row in pending],
+            [row['corrupted'] for row in pending],
+            [row['stage_outputs'] for row in pending]
+        )
+        for row, hops, stages in zip(pending, scores['hop_distances'], scores['stage_distances']):
+            row['hop_distances'] = [float(d) for d in hops]
+            row['stage_distances'] = [float(d) for d in stages]
+    return pending
+
+
+CORRUPTION_MODES = ("independent", "nested")
+SCORERS = ("embedding", "hashing")
+
+
+def _make_scorer(config: dict, scorer: str):
+    """Distance scorer for experiment rows: the embedding model, or model-free feature hashing."""
+    if scorer == "hashing":
+        from utils.hashing_scorer import HashingScorer
+        return HashingScorer.from_config(config.get('hashing', {}))
+    if scorer == "embedding":
+        return SimilarityCalculator.from_config(config.get('embedding', {}))
+    raise ValueError(f"Unknown scorer '{scorer}', expected one of {SCORERS}")
+
+
+def _score_spec(config: dict, scorer: str, stage_drift: bool = False):
+    """What besides its texts determines a cell's scores; None when scores cannot be reused."""
+    if scorer == "hashing":
+        # Document frequencies accumulate over the run, so a score depends on every cell before it
+        return None
+    embedding_config = config.get('embedding', {})
+    spec = {
+        "scorer": scorer,
+        "model": embedding_config.get('model', "sentence-transformers/all-MiniLM-L6-v2"),
+        "backend": embedding_config.get('backend', "torch"),
+    }
+    if spec["backend"] != "torch":
+        spec["quantization"] = embedding_config.get('quantization', "avx2")
+    if stage_drift:
+        from embeddings.drift import DEFAULT_MULTILINGUAL_MODEL
+        spec["drift_model"] = embedding_config.get('multilingual_model', DEFAULT_MULTILINGUAL_MODEL)
+    return spec
+
+
+CELL_FIELDS = ("sentence_id", "original", "error_rate", "run", "corrupted")
+
+
+def _experiment_cells(config: dict, stage_specs: list, score_spec):
+    """Every grid cell in output order: its identity fields, corrupted text and fingerprints."""
+    from utils.fingerprints import cell_fingerprints
+    
+    error_rates = config['experiment']['error_rates']
+    num_runs = config['experiment']['num_runs']
+    seed = config['experiment']['seed']
+    corruption = config['experiment'].get('corruption', 'independent')
+    for sentence_idx, sentence in enumerate(config['test_sentences']):
+        variants = [_corrupt_variants(sentence, error_rates, seed + run, corruption) for run in range(num_runs)]
+        for rate_idx, error_rate in enumerate(error_rates):
+            for run in range(num_runs):
+                corrupted = variants[run][rate_idx]
+                yield {
+                    "sentence_id": sentence_idx,
+                    "original": sentence,
+                    "error_rate": error_rate,
+                    "run": run,
+                    "corrupted": corrupted,
+                    **cell_fingerprints(sentence, error_rate, seed + run, corrupted, stage_specs, score_spec)
+                }
+
+
+def _translate_cell(chain, cell: dict, done=None) -> dict:
+    """Experiment row for a cell, translating only the stages after `done`."""
+    translation = chain.run(cell['corrupted'], done=done)
+    row = {name: cell[name] for name in CELL_FIELDS}
+    row['final'] = translation['final']
+    row['stage_outputs'] = [stage['output'] for stage in translation['stages']]
+    row.update((name, value) for name, value in cell.items() if name not in CELL_FIELDS)
+    return row
+
+
+def _model_label(stage_specs) -> str:
+    """Models of the chain's stages, joined with "+" when they differ."""
+    return "+".join(dict.fromkeys(spec['model'] for spec in stage_specs))
+
+
+def _corrupt_variants(sentence: str, error_rates: List[float], seed: int, corruption: str) -> List[str]:
+    """One corrupted variant per error rate, sampled independently or nested (CRN)."""
+    if corruption == "nested":
+        return inject_errors_nested(sentence, error_rates, seed)
+    if corruption == "independent":
+        return [inject_errors(sentence, error_rate, seed) for error_rate in error_rates]
+    raise ValueError(f"Unknown corruption mode '{corruption}', expected one of {CORRUPTION_MODES}")
+
+
 @app.command()
 def experiment(
     config_path: Path = typer.Option("config/config.yaml", help="Config file"),
-    output: Path = typer.Option("results/experiment.json", help="Output file"),
+    output: Path = typer.Option("results/experiment.json", help="Output file (.json, .jsonl, or .npz for a columnar archive)"),
+    scorer: str = typer.Option("embedding", help="Distance scorer: embedding (sentence model) or hashing (no model)"),
+    force: bool = typer.Option(False, help="Recompute every cell instead of reusing unchanged ones from the output"),
+    shard: str = typer.Option("1/1", help="Run only slice i of N (e.g. 2/4), chosen by hashing each cell"),
+    queue: Path = typer.Option(None, help="Instead of running, put the cells in this SQLite queue for `worker` processes"),
 ):
-    """Run full experiment across error rates."""
+    """Run full experiment across error rates.
+    
+    Each row carries fingerprints of its input, of every stage and of its
+    scores. If the output already exists, a re-run only translates the
+    stages whose fingerprint changed and only rescores cells whose final
+    text or scorer changed.
+    
+    A summary cube beside the output (<name>.summary.json) is updated after
+    every scored batch, for `status` and `analyze --summary`.
+    
+    With --shard i/N, each machine runs a disjoint slice of the grid into
+    its own output; `merge` combines the slices. With --queue, the cells go
+    into a job table that `worker` processes drain, and `merge` collects it.
+    """
+    from analysis.summary_cube import SummaryCube, summary_path
+    from utils.fingerprints import ResultCache
+    from utils.results_io import FORMATS, read_results, results_format, write_results
+    from utils.sharding import assign_shards, cell_key, grid_keys, parse_shard
+    
+    try:
+        shard_index, num_shards = parse_shard(shard)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    if scorer not in SCORERS:
+        console.print(f"[red]Unknown scorer: {scorer} (expected one of {', '.join(SCORERS)})[/red]")
+        raise typer.Exit(1)
+    try:
+        results_format(output)
+    except ValueError:
+        console.print(f"[red]Unsupported output format: {output} (expected one of {', '.join(FORMATS)})[/red]")
+        raise typer.Exit(1)
     if not config_path.exists():
         console.print(f"[red]Config not found: {config_path}[/red]")
         raise typer.Exit(1)
@@ -67,99 +204,595 @@ def experiment(
     sentences = config['test_sentences']
     error_rates = config['experiment']['error_rates']
     num_runs = config['experiment']['num_runs']
-    seed = config['experiment']['seed']
     
-    chain = TranslationChain()
-    calc = SimilarityCalculator()
+    embedding_config = config.get('embedding', {})
+    score_batch = embedding_config.get('batch_size', 32)
+    
+    chain = TranslationChain.from_config(config.get('ollama', {}))
+    stage_specs = chain.stage_specs()
+    stage_drift = config['experiment'].get('stage_drift', False)
+    score_spec = _score_spec(config, scorer, stage_drift)
+    
+    cache = ResultCache()
+    if output.exists() and not force:
+        cache = ResultCache(read_results(output))
+        console.print(f"[cyan]Reusing up to {len(cache)} stage outputs from {output}[/cyan]")
+    
+    shards = assign_shards(grid_keys(sentences, error_rates, num_runs), num_shards)
+    cells = [
+        cell for cell in _experiment_cells(config, stage_specs, score_spec)
+        if shards[cell_key(cell['original'], cell['error_rate'], cell['run'])] == shard_index
+    ]
+    total = len(cells)
+    if num_shards > 1:
+        console.print(f"[bold]Shard {shard_index}/{num_shards}:[/bold] {total} of {len(shards)} cells")
+    if queue is not None:
+        _enqueue_cells(queue, config, scorer, chain, cells, cache, score_spec)
+        return
+    
+    calc = _make_scorer(config, scorer)
+    drift = None
+    if stage_drift:
+        from embeddings.drift import StageDriftScorer
+        drift = StageDriftScorer.from_config(embedding_config)
     
     results = []
-    total = len(sentences) * len(error_rates) * num_runs
+    pending = []
+    reused_stages = reused_scores = 0
+    model = _model_label(stage_specs)
+    cube = SummaryCube(total_cells=total)
+    cube_path = summary_path(output)
+    cube.save(cube_path)
     console.print(f"[bold]Running {total} translations...[/bold]")
     
     with Progress() as progress:
         task = progress.add_task("Experiment...", total=total)
         
-        for sentence_idx, sentence in enumerate(sentences):
-            for error_rate in error_rates:
-                for run in range(num_runs):
-                    corrupted = inject_errors(sentence, error_rate, seed + run)
-                    translation = chain.run(corrupted)
-                    distance = calc.calculate_distance(sentence, translation['final'])
-                    
-                    results.append({
-                        "sentence_id": sentence_idx,
-                        "original": sentence,
-                        "error_rate": error_rate,
-                        "run": run,
-                        "corrupted": corrupted,
-                        "final": translation['final'],
-                        "distance": float(distance)
-                    })
-                    
-                    progress.update(task, advance=1)
+        for cell in cells:
+            done = cache.outputs(cell['stage_fingerprints'])
+            reused_stages += len(done)
+            row = _translate_cell(chain, cell, done)
+            results.append(row)
+            scores = cache.scores(cell['score_fingerprint'])
+            if scores is not None:
+                row.update(scores)
+                cube.add_rows([row], model)
+                reused_scores += 1
+            else:
+                pending.append(row)
+            if len(pending) >= score_batch:
+                cube.add_rows(_score_pending(calc, pending, drift), model)
+                cube.save(cube_path)
+                pending = []
+            
+            progress.update(task, advance=1)
+    
+    cube.add_rows(_score_pending(calc, pending, drift), model)
+    cube.save(cube_path)
+    
+    write_results(results, output)
+    
+    console.print(
+        f"[cyan]Reused {reused_stages}/{total * len(stage_specs)} stage translations "
+        f"and {reused_scores}/{total} scores[/cyan]"
+    )
+    console.print(f"[green]✓[/green] Results saved to {output}")
+    console.print(f"[green]✓[/green] Summary saved to {cube_path}")
+
+
+def _enqueue_cells(queue_path: Path, config: dict, scorer: str, chain, cells: list, cache, score_spec) -> None:
+    """Put experiment cells in a work queue for `worker` processes, with cached stages attached."""
+    from utils.sharding import cell_key
+    from utils.work_queue import WorkQueue
+    
+    stage_specs = chain.stage_specs()
+    queue = WorkQueue(queue_path)
+    settings = {"stage_specs": stage_specs, "score_spec": score_spec}
+    for name, value in settings.items():
+        stored = queue.get_meta(name)
+        if stored is not None and stored != json.loads(json.dumps(value)):
+            console.print(f"[red]{queue_path} was filled from a different config ({name}); use a new queue file[/red]")
+            raise typer.Exit(1)
+    for name, value in {"config": config, "scorer": scorer, **settings}.items():
+        queue.set_meta(name, value)
+    
+    jobs, finished = [], {}
+    for cell in cells:
+        key = cell_key(cell['original'], cell['error_rate'], cell['run'])
+        done = cache.outputs(cell['stage_fingerprints'])
+        scores = cache.scores(cell['score_fingerprint'])
+        if len(done) == len(stage_specs) and scores is not None:
+            finished[key] = {**_translate_cell(chain, cell, done), **scores}
+        jobs.append((key, {**cell, "done": done}))
+    added = queue.enqueue(jobs, finished)
+    counts = queue.counts()
+    queue.close()
+    console.print(f"[green]✓[/green] Queued {added} new cells in {queue_path} ({len(finished)} already done from cache)")
+    console.print("  " + ", ".join(f"{status}: {count}" for status, count in counts.items()))
+    console.print(f"Start workers with: python src/cli.py worker {queue_path}")
+
+
+@app.command()
+def worker(
+    queue_path: Path = typer.Argument(..., help="Queue filled by experiment --queue"),
+    worker_id: str = typer.Option("", help="Name recorded on leases (default host:pid)"),
+    base_url: str = typer.Option("", help="Ollama host for this worker (default: the config's)"),
+    batch: int = typer.Option(0, min=0, help="Cells per claim (default embedding.batch_size)"),
+    lease: float = typer.Option(300.0, min=1.0, help="Seconds a claim lasts without a heartbeat"),
+    max_attempts: int = typer.Option(3, min=1, help="Attempts per cell before it is marked failed"),
+    poll: float = typer.Option(5.0, min=0.0, help="Seconds between checks while other workers hold the last cells"),
+):
+    """Claim cells from an experiment queue, translate and score them, until none are left.
+    
+    Run any number of workers, on any hosts that share the queue file.
+    Claims are leases kept alive by a heartbeat thread. Cells held by a
+    worker that dies go back to the queue when the lease runs out. A worker
+    that finds some of its leases taken over drops the rest of that claim.
+    """
+    import os
+    import socket
+    import time
+    from utils.work_queue import Heartbeat, WorkQueue
+    
+    if not queue_path.exists():
+        console.print(f"[red]File not found: {queue_path}[/red]")
+        raise typer.Exit(1)
+    queue = WorkQueue(queue_path, lease_seconds=lease, max_attempts=max_attempts)
+    config = queue.get_meta("config")
+    if config is None:
+        console.print(f"[red]{queue_path} has no experiment; fill it with experiment --queue[/red]")
+        raise typer.Exit(1)
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    
+    ollama_config = dict(config.get('ollama', {}))
+    if base_url:
+        ollama_config['base_url'] = base_url
+        ollama_config['stages'] = [
+            {name: value for name, value in (stage or {}).items() if name != 'base_url'}
+            for stage in ollama_config.get('stages') or []
+        ]
+    chain = TranslationChain.from_config(ollama_config)
+    if json.loads(json.dumps(chain.stage_specs())) != queue.get_meta("stage_specs"):
+        console.print("[red]This worker's stage models or prompts differ from the ones the queue was filled with[/red]")
+        raise typer.Exit(1)
+    calc = _make_scorer(config, queue.get_meta("scorer"))
+    drift = None
+    if config['experiment'].get('stage_drift', False):
+        from embeddings.drift import StageDriftScorer
+        drift = StageDriftScorer.from_config(config.get('embedding', {}))
+    batch = batch or config.get('embedding', {}).get('batch_size', 32)
+    
+    completed = failed = 0
+    with Heartbeat(queue_path, worker_id, lease) as heartbeat:
+        while True:
+            jobs = queue.claim(worker_id, batch)
+            if not jobs:
+                counts = queue.counts()
+                if counts['pending'] == 0 and counts['leased'] == 0:
+                    break
+                time.sleep(poll)
+                continue
+            heartbeat.lost = 0
+            heartbeat.keys = [key for key, _ in jobs]
+            
+            rows = {}
+            for key, cell in jobs:
+                if heartbeat.lost:
+                    console.print(f"[yellow]{heartbeat.lost} cells of this claim were taken over; "
+                                  f"dropping the rest of it[/yellow]")
+                    break
+                done = cell.pop('done', [])
+                try:
+                    rows[key] = _translate_cell(chain, cell, done)
+                except Exception as e:
+                    queue.fail(worker_id, key, str(e))
+                    failed += 1
+            if not rows:
+                heartbeat.keys = []
+                if heartbeat.lost:
+                    continue
+                console.print(f"[red]Every cell in the last claim failed; stopping {worker_id}[/red]")
+                raise typer.Exit(1)
+            try:
+                _score_pending(calc, list(rows.values()), drift)
+            except Exception as e:
+                for key in rows:
+                    queue.fail(worker_id, key, f"scoring failed: {e}")
+                raise
+            completed += sum(queue.complete(worker_id, key, row) for key, row in rows.items())
+            heartbeat.keys = []
+    
+    counts = queue.counts()
+    queue.close()
+    console.print(f"[green]✓[/green] {worker_id} completed {completed} cells ({failed} failed attempts)")
+    console.print("  " + ", ".join(f"{status}: {count}" for status, count in counts.items()))
+
+
+@app.command()
+def merge(
+    shard_files: List[Path] = typer.Argument(..., help="Outputs of experiment --shard i/N, or queues (.sqlite) drained by workers"),
+    output: Path = typer.Option("results/experiment.json", help="Merged output (.json, .jsonl or .npz)"),
+    config_path: Path = typer.Option("config/config.yaml", help="Config the shards were run with"),
+    allow_missing: bool = typer.Option(False, help="Write the merged file even if some cells are missing"),
+):
+    """Combine shard outputs into one results file in grid order, checking for duplicate and missing cells."""
+    from analysis.summary_cube import SummaryCube, summary_path
+    from utils.results_io import FORMATS, read_results, results_format, write_results
+    from utils.sharding import grid_keys, merge_shards
+    from utils.work_queue import WorkQueue, is_queue
+    
+    try:
+        results_format(output)
+    except ValueError:
+        console.print(f"[red]Unsupported output format: {output} (expected one of {', '.join(FORMATS)})[/red]")
+        raise typer.Exit(1)
+    for path in [config_path, *shard_files]:
+        if not path.exists():
+            console.print(f"[red]File not found: {path}[/red]")
+            raise typer.Exit(1)
+    
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+    expected = grid_keys(config['test_sentences'], config['experiment']['error_rates'], config['experiment']['num_runs'])
+    
+    def shard_rows(path):
+        if not is_queue(path):
+            return read_results(path)
+        queue = WorkQueue(path)
+        for key, error in queue.failures()[:3]:
+            console.print(f"[yellow]Cell {key} failed in {path}: {error}[/yellow]")
+        rows = queue.results()
+        queue.close()
+        return rows
+    
+    merged = merge_shards((shard_rows(path) for path in shard_files), expected)
+    
+    if merged['unexpected']:
+        console.print(f"[yellow]Dropped {len(merged['unexpected'])} rows for cells not in {config_path}[/yellow]")
+    if merged['duplicates']:
+        console.print(f"[red]{len(merged['duplicates'])} cells appear in more than one row, e.g. {merged['duplicates'][:3]}[/red]")
+        raise typer.Exit(1)
+    if merged['missing']:
+        console.print(f"[{'yellow' if allow_missing else 'red'}]{len(merged['missing'])} of {len(expected)} cells are missing[/]")
+        if not allow_missing:
+            raise typer.Exit(1)
+    
+    rows = merged['rows']
+    write_results(rows, output)
+    cube = SummaryCube(total_cells=len(expected))
+    cube.add_rows(rows, _model_label(TranslationChain.from_config(config.get('ollama', {})).stage_specs()))
+    cube.save(summary_path(output))
+    console.print(f"[green]✓[/green] Merged {len(rows)} rows from {len(shard_files)} shards into {output}")
+
+
+@app.command()
+def status(
+    summary_file: Path = typer.Argument(Path("results/experiment.summary.json"), help="Summary written by experiment, or a work queue (.sqlite)"),
+    stage: str = typer.Option("final", help="Stage to summarize (final, stage1, ...)"),
+):
+    """Show progress and per-rate distances of a running or finished experiment."""
+    from analysis.summary_cube import SummaryCube
+    from utils.work_queue import WorkQueue, is_queue
+    
+    if not summary_file.exists():
+        console.print(f"[red]File not found: {summary_file}[/red]")
+        raise typer.Exit(1)
+    
+    if is_queue(summary_file):
+        queue = WorkQueue(summary_file)
+        counts = queue.counts()
+        queue.close()
+        total = sum(counts.values())
+        console.print(f"[bold]Cells done:[/bold] {counts['done']}/{total}")
+        console.print("  " + ", ".join(f"{status}: {count}" for status, count in counts.items()))
+        return
+    
+    cube = SummaryCube.load(summary_file)
+    progress = cube.status()
+    done = f"{progress['rows']}/{progress['total_cells']}" if progress['total_cells'] else str(progress['rows'])
+    console.print(f"[bold]Cells scored:[/bold] {done}")
+    if progress['fraction_done'] is not None:
+        console.print(f"[bold]Done:[/bold] {progress['fraction_done']:.1%}")
+    for row in cube.frame(by=("error_rate",), stage=stage).itertuples():
+        console.print(
+            f"  error_rate={row.error_rate:.2f}  n={row.count}  mean={row.mean:.4f}  "
+            f"median={row.median:.4f}  range=[{row.min:.4f}, {row.max:.4f}]"
+        )
+
+
+@app.command()
+def variance(
+    independent: Path = typer.Option(None, help="Results of an experiment with independent corruption"),
+    nested: Path = typer.Option(None, help="Results of an experiment with nested corruption"),
+    config_path: Path = typer.Option("config/config.yaml", help="Config file"),
+    num_runs: int = typer.Option(50, min=2, help="Runs per cell when simulating"),
+    output: Path = typer.Option("results/variance_report.json", help="Report output"),
+):
+    """Report how much nested (CRN) corruption reduces curve variance.
+    
+    Compares two experiment result files, or without them simulates both
+    modes on the config sentences, scoring the corrupted text itself.
+    """
+    from analysis.variance import corruption_distance, variance_reduction_report
+    from utils.results_io import read_results
+    
+    if (independent is None) != (nested is None):
+        console.print("[red]Pass both --independent and --nested, or neither to simulate[/red]")
+        raise typer.Exit(1)
+    
+    if independent is not None:
+        runs = {}
+        for mode, path in (("independent", independent), ("nested", nested)):
+            if not path.exists():
+                console.print(f"[red]File not found: {path}[/red]")
+                raise typer.Exit(1)
+            runs[mode] = read_results(path, ['sentence_id', 'error_rate', 'run', 'distance'])
+        source = "experiment results"
+    else:
+        with open(config_path) as f:
+            config = yaml.safe_load(f)
+        error_rates = config['experiment']['error_rates']
+        seed = config['experiment']['seed']
+        runs = {
+            mode: [
+                {
+                    "sentence_id": sentence_idx,
+                    "error_rate": error_rate,
+                    "run": run,
+                    "distance": corruption_distance(sentence, corrupted)
+                }
+                for sentence_idx, sentence in enumerate(config['test_sentences'])
+                for run in range(num_runs)
+                for error_rate, corrupted in zip(
+                    error_rates, _corrupt_variants(sentence, error_rates, seed + run, mode)
+                )
+            ]
+            for mode in CORRUPTION_MODES
+        }
+        source = "simulated (difflib distance of corrupted text, no translation)"
+    
+    report = variance_reduction_report(runs["independent"], runs["nested"])
+    report["source"] = source
     
     output.parent.mkdir(parents=True, exist_ok=True)
     with open(output, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        json.dump(report, f, indent=2)
     
-    console.print(f"[green]✓[/green] Results saved to {output}")
+    console.print(f"[bold]Source:[/bold] {source}")
+    for metric in ("slope", "step"):
+        console.print(
+            f"[cyan]{metric} variance ratio (nested / independent):[/cyan] "
+            f"{report[metric]['variance_ratio']:.3f} → "
+            f"{report[metric]['runs_for_equal_precision']} nested runs match "
+            f"{report['independent']['num_runs']} independent runs"
+        )
+    console.print(f"[green]✓[/green] Variance report saved to {output}")
+
+
+def _print_slopes(intervals):
+    """Bootstrap CIs of the distance-vs-error-rate slope, pooled and per sentence."""
+    level = f"{intervals['confidence']:.0%}"
+    slope = intervals["slope"]
+    console.print(
+        f"[bold]Slope:[/bold] {slope['slope']:.4f} per unit error rate "
+        f"({level} CI {slope['ci_low']:.4f} to {slope['ci_high']:.4f}, {intervals['n_resamples']} resamples)"
+    )
+    for row in intervals["sentence_slopes"].itertuples():
+        console.print(f"  Sentence {row.sentence_id + 1}: {row.slope:.4f} ({level} CI {row.ci_low:.4f} to {row.ci_high:.4f})")
 
 
 @app.command()
 def analyze(
-    input_file: Path = typer.Argument(..., help="Experiment JSON"),
+    input_file: Path = typer.Argument(..., help="Experiment results (.json, .jsonl or .npz)"),
     output: Path = typer.Option("results/error_impact_graph.png", help="Graph output"),
+    streaming: bool = typer.Option(False, help="Aggregate chunk by chunk in constant memory (for JSONL/NPZ results)"),
+    summary: bool = typer.Option(False, help="Plot from the experiment's summary file instead of the rows"),
+    chunk_size: int = typer.Option(100_000, min=1, help="Rows per chunk with --streaming"),
+    bootstrap: int = typer.Option(0, min=0, help="Bootstrap resamples for confidence intervals (0 draws ±1 std bands)"),
+    confidence: float = typer.Option(0.95, min=0.5, max=0.999, help="Confidence level with --bootstrap"),
+    seed: int = typer.Option(42, help="Random seed for --bootstrap"),
 ):
     """Generate graph from results."""
-    import pandas as pd
-    import matplotlib.pyplot as plt
+    from analysis.report import render_by_sentence
+    from utils.results_io import iter_result_chunks, load_results_frame
     
+    if bootstrap and (summary or streaming):
+        console.print("[red]--bootstrap resamples the rows, so it cannot be combined with --summary or --streaming[/red]")
+        raise typer.Exit(1)
+    if summary:
+        # Only the summary is needed; the results file may still be being written
+        from analysis.summary_cube import SummaryCube, summary_path
+        if not input_file.name.endswith(".summary.json"):
+            input_file = summary_path(input_file)
     if not input_file.exists():
         console.print(f"[red]File not found: {input_file}[/red]")
         raise typer.Exit(1)
     
-    with open(input_file, encoding='utf-8') as f:
-        data = json.load(f)
+    columns = ['error_rate', 'sentence_id', 'distance']
+    if summary:
+        grouped = SummaryCube.load(input_file).frame(by=("error_rate", "sentence_id"), stage="final")
+    elif streaming:
+        from analysis.streaming import StreamingGroupStats
+        stats = StreamingGroupStats().consume(iter_result_chunks(input_file, columns, chunk_size))
+        grouped = stats.frame()
+        console.print(f"[cyan]Streamed {stats.rows} rows into {len(grouped)} groups[/cyan]")
+    else:
+        df = load_results_frame(input_file, columns)
+        if bootstrap:
+            from analysis.bootstrap import bootstrap_report
+            intervals = bootstrap_report(df, bootstrap, confidence, seed)
+            grouped = intervals["groups"]
+            _print_slopes(intervals)
+        else:
+            grouped = df.groupby(['error_rate', 'sentence_id'])['distance'].agg(['mean', 'std']).reset_index()
     
-    df = pd.DataFrame(data)
-    grouped = df.groupby(['error_rate', 'sentence_id'])['distance'].agg(['mean', 'std']).reset_index()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    render_by_sentence({"by_sentence": grouped}, output)
+    console.print(f"[green]✓[/green] Graph saved to {output}")
+
+
+@app.command()
+def report(
+    input_file: Path = typer.Argument(Path("results/experiment.json"), help="Experiment results (.json, .jsonl or .npz)"),
+    output_dir: Path = typer.Option("results", help="Directory for the report figures"),
+    workers: int = typer.Option(2, min=1, help="Processes rendering figures in parallel"),
+    dpi: int = typer.Option(300, min=1, help="Figure resolution"),
+    force: bool = typer.Option(False, help="Redraw figures even if their input is unchanged"),
+):
+    """Render the report figures, skipping those already drawn from the same input."""
+    from analysis.report import build_report
+    from utils.results_io import load_results_frame
     
-    fig, ax = plt.subplots(figsize=(12, 7))
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
+    if not input_file.exists():
+        console.print(f"[red]File not found: {input_file}[/red]")
+        raise typer.Exit(1)
+    
+    result = build_report(input_file, output_dir, load_results_frame, workers=workers, dpi=dpi, force=force)
+    for name, path in result["paths"].items():
+        if name in result["rendered"]:
+            console.print(f"[green]✓[/green] Saved {path}")
+        else:
+            console.print(f"[dim]Up to date: {path}[/dim]")
+
+
+@app.command()
+def parity(
+    input_file: Path = typer.Argument(..., help="Experiment results (.json or .npz)"),
+    config_path: Path = typer.Option("config/config.yaml", help="Config file"),
+    output: Path = typer.Option("results/onnx_parity.json", help="Report output"),
+):
+    """Compare int8 ONNX distances against PyTorch on experiment results."""
+    from embeddings.onnx_backend import parity_report, timed_distances
+    from utils.results_io import read_results
+    
+    if not input_file.exists():
+        console.print(f"[red]File not found: {input_file}[/red]")
+        raise typer.Exit(1)
+    
+    with open(config_path) as f:
+        embedding_config = yaml.safe_load(f).get('embedding', {})
+    
+    data = read_results(input_file, ['original', 'final'])
+    pairs = [(row['original'], row['final']) for row in data]
+    
+    torch_calc = SimilarityCalculator.from_config({**embedding_config, 'backend': 'torch'})
+    onnx_calc = SimilarityCalculator.from_config({**embedding_config, 'backend': 'onnx-int8'})
+    
+    reference, torch_seconds = timed_distances(torch_calc, pairs)
+    candidate, onnx_seconds = timed_distances(onnx_calc, pairs)
+    
+    report = parity_report(reference, candidate)
+    report.update({
+        "model": embedding_config.get('model'),
+        "quantization": embedding_config.get('quantization', 'avx2'),
+        "torch_seconds": torch_seconds,
+        "onnx_seconds": onnx_seconds,
+        "speedup": torch_seconds / onnx_seconds if onnx_seconds > 0 else float('nan'),
+    })
     
-    for i, sid in enumerate(sorted(grouped['sentence_id'].unique())):
-        subset = grouped[grouped['sentence_id'] == sid].sort_values('error_rate')
-        
-        ax.plot(
-            subset['error_rate'] * 100,
-            subset['mean'],
-            marker='o',
-            label=f'Sentence {sid + 1}',
-            linewidth=2.5,
-            markersize=8,
-            color=colors[i % len(colors)]
-        )
-        
-        if (subset['std'] > 0).any():
-            ax.fill_between(
-                subset['error_rate'] * 100,
-                subset['mean'] - subset['std'],
-                subset['mean'] + subset['std'],
-                alpha=0.2,
-                color=colors[i % len(colors)]
-            )
-    
-    ax.set_xlabel('Spelling Error Rate (%)', fontsize=13, fontweight='bold')
-    ax.set_ylabel('Cosine Distance', fontsize=13, fontweight='bold')
-    ax.set_title('Impact of Spelling Errors on Semantic Preservation', fontsize=14, fontweight='bold')
-    ax.legend(fontsize=11)
-    ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
     output.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output, dpi=300, bbox_inches='tight')
-    console.print(f"[green]✓[/green] Graph saved to {output}")
-    plt.close()
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    
+    console.print(f"[cyan]Pairs:[/cyan] {report['n']}")
+    console.print(f"[cyan]Max |Δ distance|:[/cyan] {report['max_abs_diff']:.4f}")
+    console.print(f"[cyan]Mean |Δ distance|:[/cyan] {report['mean_abs_diff']:.4f}")
+    console.print(f"[cyan]Spearman ρ:[/cyan] {report['spearman']:.4f}")
+    console.print(f"[cyan]Speedup:[/cyan] {report['speedup']:.2f}x")
+    console.print(f"[green]✓[/green] Parity report saved to {output}")
+
+
+@app.command()
+def index(
+    input_files: List[Path] = typer.Argument(..., help="Experiment results (.json or .npz) to index"),
+    index_dir: Path = typer.Option("results/ann_index", help="Index directory"),
+    config_path: Path = typer.Option("config/config.yaml", help="Config file"),
+    n_lists: int = typer.Option(256, help="Maximum number of IVF lists"),
+    retrain: bool = typer.Option(False, help="Re-fit centroids on all stored vectors"),
+):
+    """Add translated outputs to the nearest-neighbour index."""
+    from embeddings.ann_index import IVFIndex, index_records
+    from utils.results_io import read_results
+    
+    with open(config_path) as f:
+        calc = SimilarityCalculator.from_config(yaml.safe_load(f).get('embedding', {}))
+    
+    if (index_dir / "index.npz").exists():
+        ann = IVFIndex.load(index_dir)
+        ann.max_lists = n_lists
+    else:
+        ann = IVFIndex(calc.model.get_sentence_embedding_dimension(), n_lists=n_lists)
+    
+    for input_file in input_files:
+        if not input_file.exists():
+            console.print(f"[red]File not found: {input_file}[/red]")
+            raise typer.Exit(1)
+        records = [{**row, "source": str(input_file)} for row in read_results(input_file)]
+        added = index_records(ann, calc, records)
+        console.print(f"[cyan]{input_file}:[/cyan] {added} new records")
+    
+    if len(ann) and (retrain or ann.needs_retrain):
+        ann.retrain()
+    
+    ann.save(index_dir)
+    console.print(f"[green]✓[/green] Index with {len(ann)} records saved to {index_dir}")
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Text to search for"),
+    index_dir: Path = typer.Option("results/ann_index", help="Index directory"),
+    config_path: Path = typer.Option("config/config.yaml", help="Config file"),
+    k: int = typer.Option(5, min=1, help="Number of neighbours"),
+    n_probe: int = typer.Option(8, min=1, help="IVF lists to probe"),
+):
+    """Find indexed outputs semantically closest to a text."""
+    from embeddings.ann_index import IVFIndex
+    
+    if not (index_dir / "index.npz").exists():
+        console.print(f"[red]Index not found: {index_dir}[/red]")
+        raise typer.Exit(1)
+    
+    with open(config_path) as f:
+        calc = SimilarityCalculator.from_config(yaml.safe_load(f).get('embedding', {}))
+    ann = IVFIndex.load(index_dir)
+    
+    for rank, (idx, distance) in enumerate(ann.search(calc.encode([query]), k=k, n_probe=n_probe)[0], 1):
+        record = ann.metadata[idx]
+        console.print(
+            f"[bold]{rank}.[/bold] [cyan]{distance:.4f}[/cyan] "
+            f"sentence={record.get('sentence_id')} rate={record.get('error_rate')} "
+            f"run={record.get('run')} ({record.get('source')})"
+        )
+        console.print(f"   {record['final']}")
+
+
+@app.command()
+def corrupt(
+    input_file: Path = typer.Argument(..., help="Text (one sentence per line) or JSONL corpus"),
+    output: Path = typer.Option("results/corrupted.jsonl", help="JSONL output"),
+    error_rate: List[float] = typer.Option(None, "--error-rate", help="Error rate (repeatable); defaults to the config rates"),
+    config_path: Path = typer.Option("config/config.yaml", help="Config file"),
+    seed: int = typer.Option(42, help="Random seed"),
+    workers: int = typer.Option(1, min=1, help="Worker processes (one byte range each)"),
+    text_field: str = typer.Option("text", help="Field holding the text in JSONL input"),
+):
+    """Corrupt a large corpus line by line without loading it into memory."""
+    from utils.corpus_stream import corrupt_corpus
+    
+    if not input_file.exists():
+        console.print(f"[red]File not found: {input_file}[/red]")
+        raise typer.Exit(1)
+    
+    if not error_rate:
+        with open(config_path) as f:
+            error_rate = yaml.safe_load(f)['experiment']['error_rates']
+    
+    stats = corrupt_corpus(input_file, output, error_rate, seed=seed, workers=workers, text_field=text_field)
+    
+    console.print(f"[cyan]Lines:[/cyan] {stats['lines']}")
+    console.print(f"[cyan]Records:[/cyan] {stats['records']} ({len(error_rate)} rates)")
+    console.print(f"[green]✓[/green] Corrupted corpus saved to {output}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+"""Approximate nearest-neighbour (IVF) index over result embeddings."""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .pairwise import normalize
+
+logger = logging.getLogger(__name__)
+
+# Retrain once the stored vectors exceed this many times n_lists ** 2 (lists then double)
+REGROW_FACTOR = 4
+
+
+class IVFIndex:
+    """Inverted-file index: k-means centroids with exact search inside probed lists.
+
+    Vectors are L2-normalized, so distances are cosine distances. Each stored
+    vector carries a metadata dict (e.g. the result record it came from).
+    `max_lists` is the configured cap; `n_lists` is the number of lists the
+    centroids were trained with, about sqrt(vectors) up to that cap. When
+    inserts grow the index well past what its lists were sized for, add()
+    retrains.
+    """
+
+    def __init__(self, dimension: int, n_lists: int = 256, n_probe: int = 8, seed: int = 42):
+        """Create an empty, untrained index with at most `n_lists` lists."""
+        self.dimension = dimension
+        self.max_lists = n_lists
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.vectors = np.empty((0, dimension), dtype=np.float32)
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.metadata: List[Dict[str, Any]] = []
+        self._order: Optional[np.ndarray] = None
+        self._bounds: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.metadata)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def needs_retrain(self) -> bool:
+        """Whether the trained list count exceeds the cap or is too small for the stored vectors."""
+        if not self.is_trained:
+            return False
+        if self.n_lists > self.max_lists:
+            return True
+        return self.n_lists < self.max_lists and len(self.vectors) > REGROW_FACTOR * self.n_lists ** 2
+
+    def train(self, vectors: np.ndarray, iterations: int = 10) -> None:
+        """Fit the coarse quantizer with spherical k-means."""
+        vectors = normalize(vectors)
+        if len(vectors) == 0:
+            raise ValueError("Cannot train an index on zero vectors")
+
+        n_lists = min(self.max_lists, max(1, int(np.sqrt(len(vectors)))))
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        logger.info(f"Training IVF index | Vectors: {len(vectors)} | Lists: {n_lists}")
+
+        for _ in range(iterations):
+            assign = self._nearest_centroids(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            counts = np.bincount(assign, minlength=n_lists)
+            empty = counts == 0
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            centroids = normalize(sums)
+
+        self.centroids = centroids
+        self.n_lists = n_lists
+        if len(self.vectors):
+            self.assignments = self._nearest_centroids(self.vectors, centroids)
+        self._order = None
+
+    def add(self, vectors: np.ndarray, metadata: List[Dict[str, Any]]) -> None:
+        """Insert vectors with their metadata; trains on the first batch, retrains when outgrown."""
+        if len(vectors) != len(metadata):
+            raise ValueError(f"Got {len(vectors)} vectors but {len(metadata)} metadata entries")
+        if len(vectors) == 0:
+            return
+
+        vectors = normalize(vectors)
+        if not self.is_trained:
+            self.train(vectors)
+
+        self.vectors = np.concatenate([self.vectors, vectors])
+        self.assignments = np.concatenate([self.assignments, self._nearest_centroids(vectors, self.centroids)])
+        self.metadata.extend(metadata)
+        self._order = None
+        if self.needs_retrain:
+            self.retrain()
+
+    def retrain(self) -> None:
+        """Re-fit the centroids on every stored vector and reassign them.
+
+        The list count is recomputed from the stored vectors, capped at max_lists.
+        """
+        self.train(self.vectors)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 5,
+        n_probe: Optional[int] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """Return (id, cosine distance) pairs of the k nearest stored vectors per query."""
+        if not self.is_trained or len(self) == 0:
+            return [[] for _ in range(len(queries))]
+
+        queries = normalize(queries)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        order, bounds = self._inverted_lists()
+
+        centroid_sims = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_sims, n_probe - 1, axis=1)[:, :n_probe]
+
+        results = []
+        for query, lists in zip(queries, probes):
+            candidates = np.concatenate([order[bounds[l]:bounds[l + 1]] for l in lists])
+            if len(candidates) == 0:
+                results.append([])
+                continue
+            distances = 1.0 - self.vectors[candidates] @ query
+            top = min(k, len(candidates))
+            best = np.argpartition(distances, top - 1)[:top]
+            best = best[np.argsort(distances[best], kind="stable")]
+            results.append([(int(candidates[i]), float(distances[i])) for i in best])
+        return results
+
+    def save(self, path: Path) -> None:
+        """Write the index to a directory (arrays as NPZ, metadata as JSONL)."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path / "index.npz",
+            centroids=self.centroids if self.is_trained else np.empty((0, self.dimension), dtype=np.float32),
+            vectors=self.vectors,
+            assignments=self.assignments,
+            params=np.array([self.dimension, self.n_lists, self.n_probe, self.seed, self.max_lists])
+        )
+        with open(path / "records.jsonl", "w", encoding="utf-8") as f:
+            for entry in self.metadata:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        """Read an index written by save()."""
+        path = Path(path)
+        with np.load(path / "index.npz") as data:
+            params = [int(v) for v in data["params"]]
+            if len(params) == 4:
+                # Saved before max_lists existed; the trained count stands in for the cap
+                params.append(params[1])
+            dimension, n_lists, n_probe, seed, max_lists = params
+            index = cls(dimension, max_lists, n_probe, seed)
+            index.n_lists = n_lists
+            index.centroids = data["centroids"] if len(data["centroids"]) else None
+            index.vectors = data["vectors"]
+            index.assignments = data["assignments"]
+        with open(path / "records.jsonl", encoding="utf-8") as f:
+            index.metadata = [json.loads(line) for line in f if line.strip()]
+        return index
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Vector ids grouped by list, rebuilt lazily after inserts."""
+        if self._order is None:
+            self._order = np.argsort(self.assignments, kind="stable")
+            self._bounds = np.searchsorted(self.assignments[self._order], np.arange(self.n_lists + 1))
+        return self._order, self._bounds
+
+    @staticmethod
+    def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        """Index of the most similar centroid for every vector."""
+        assign = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            assign[start:start + chunk_size] = np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+        return assign
+
+
+def record_key(record: Dict[str, Any]) -> str:
+    """Identity of a result record, used to skip records already indexed."""
+    return json.dumps(
+        [record.get("original"), record.get("error_rate"), record.get("run"), record.get("final")],
+        ensure_ascii=False
+    )
+
+
+def index_records(index: IVFIndex, calc, records: List[Dict[str, Any]], batch_size: int = 1024) -> int:
+    """Embed the `final` text of new records and insert them; returns how many were added.
+
+    All new records are inserted in one add() so an untrained index is fitted
+    on the whole batch rather than on its first chunk.
+    """
+    seen = {record_key(entry) for entry in index.metadata}
+    new_records = []
+    for record in records:
+        key = record_key(record)
+        if key not in seen:
+            seen.add(key)
+            new_records.append(record)
+
+    if not new_records:
+        return 0
+
+    embeddings = np.concatenate([
+        calc.encode([record["final"] for record in new_records[start:start + batch_size]])
+        for start in range(0, len(new_records), batch_size)
+    ])
+    index.add(embeddings, new_records)
+    return len(new_records)
@@ -0,0 +1,64 @@
+"""Per-stage semantic drift scoring with a multilingual embedding model."""
+import logging
+from typing import Any, Dict, List
+import numpy as np
+from .pairwise import normalize
+from .similarity import SimilarityCalculator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MULTILINGUAL_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+
+class StageDriftScorer:
+    """Measures how far meaning moves at each hop of the translation chain.
+
+    Every text of a batch of cells (original, chain input and each stage
+    output) is embedded in a single encode call, then all distances are
+    computed at once on a (cells, texts, dim) array.
+    """
+
+    def __init__(self, calc: SimilarityCalculator):
+        """Wrap a calculator loaded with a multilingual model."""
+        self.calc = calc
+
+    @classmethod
+    def from_config(cls, embedding_config: Dict[str, Any]) -> "StageDriftScorer":
+        """Create a scorer from the `embedding` section, using `multilingual_model`."""
+        model = embedding_config.get("multilingual_model", DEFAULT_MULTILINGUAL_MODEL)
+        return cls(SimilarityCalculator.from_config({**embedding_config, "model": model}))
+
+    def score(
+        self,
+        originals: List[str],
+        inputs: List[str],
+        stage_outputs: List[List[str]]
+    ) -> Dict[str, np.ndarray]:
+        """Drift distances for a batch of cells.
+
+        Returns `hop_distances` (cells x stages), the distance between each
+        stage's input and output, and `stage_distances` (cells x stages), the
+        distance between the original sentence and each stage output.
+        """
+        n_cells = len(originals)
+        if not (n_cells == len(inputs) == len(stage_outputs)):
+            raise ValueError("originals, inputs and stage_outputs must have the same length")
+        if n_cells == 0:
+            return {"hop_distances": np.empty((0, 0)), "stage_distances": np.empty((0, 0))}
+
+        n_stages = len(stage_outputs[0])
+        if any(len(outputs) != n_stages for outputs in stage_outputs):
+            raise ValueError("Every cell must have the same number of stage outputs")
+
+        texts = [
+            text
+            for original, chain_input, outputs in zip(originals, inputs, stage_outputs)
+            for text in (original, chain_input, *outputs)
+        ]
+        logger.info(f"Scoring stage drift | Cells: {n_cells} | Texts: {len(texts)}")
+        embeddings = normalize(self.calc.encode(texts)).reshape(n_cells, n_stages + 2, -1)
+
+        chain = embeddings[:, 1:]
+        hop = 1.0 - np.einsum("csd,csd->cs", chain[:, :-1], chain[:, 1:])
+        stage = 1.0 - np.einsum("cd,csd->cs", embeddings[:, 0], embeddings[:, 2:])
+        return {"hop_distances": hop, "stage_distances": stage}
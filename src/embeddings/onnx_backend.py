@@ -0,0 +1,100 @@
+"""Quantized ONNX Runtime backend for sentence embeddings."""
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_CONFIGS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+def quantized_file_name(quantization: str) -> str:
+    """Return the ONNX file written by the int8 export for a quantization config."""
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+
+def export_quantized_model(model_name: str, export_dir: Path, quantization: str = "avx2") -> Path:
+    """Export a model to ONNX and quantize its weights to int8 (dynamic quantization)."""
+    if quantization not in QUANTIZATION_CONFIGS:
+        raise ValueError(f"quantization must be one of {QUANTIZATION_CONFIGS}, got {quantization}")
+
+    try:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+    except ImportError as e:
+        raise ImportError(
+            "The onnx-int8 backend requires optimum and onnxruntime: "
+            "pip install 'optimum[onnxruntime]'"
+        ) from e
+
+    export_dir = Path(export_dir)
+    logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+    model = SentenceTransformer(model_name, backend="onnx", device="cpu")
+    model.save(str(export_dir))
+
+    logger.info(f"Quantizing ONNX model to int8 ({quantization})")
+    export_dynamic_quantized_onnx_model(model, quantization, str(export_dir))
+    return export_dir / quantized_file_name(quantization)
+
+
+def load_quantized_model(
+    model_name: str,
+    onnx_dir: Path = Path("models/onnx"),
+    quantization: str = "avx2"
+) -> SentenceTransformer:
+    """Load the int8 ONNX model on CPU, exporting it on first use."""
+    export_dir = Path(onnx_dir) / model_name.split("/")[-1]
+    file_name = quantized_file_name(quantization)
+
+    if not (export_dir / file_name).exists():
+        export_quantized_model(model_name, export_dir, quantization)
+
+    logger.info(f"Loading quantized ONNX model: {export_dir / file_name}")
+    return SentenceTransformer(
+        str(export_dir),
+        backend="onnx",
+        device="cpu",
+        model_kwargs={"file_name": file_name, "provider": "CPUExecutionProvider"}
+    )
+
+
+def _rank(values: np.ndarray) -> np.ndarray:
+    """Average ranks (ties share the mean rank), as used by Spearman's rho."""
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(len(values), dtype=float)
+    ranks[order] = np.arange(len(values), dtype=float)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    return sums[inverse] / counts[inverse]
+
+
+def parity_report(reference: Sequence[float], candidate: Sequence[float]) -> Dict[str, float]:
+    """Compare distances from the quantized backend against the PyTorch reference."""
+    ref = np.asarray(reference, dtype=float)
+    cand = np.asarray(candidate, dtype=float)
+    if ref.shape != cand.shape:
+        raise ValueError(f"Distance lists differ in length: {len(ref)} vs {len(cand)}")
+    if len(ref) == 0:
+        raise ValueError("No distances to compare")
+
+    diff = np.abs(ref - cand)
+    report = {
+        "n": int(len(ref)),
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "pearson": float("nan"),
+        "spearman": float("nan"),
+    }
+    if len(ref) > 1 and ref.std() > 0 and cand.std() > 0:
+        report["pearson"] = float(np.corrcoef(ref, cand)[0, 1])
+        report["spearman"] = float(np.corrcoef(_rank(ref), _rank(cand))[0, 1])
+    return report
+
+
+def timed_distances(calc, text_pairs: List[Tuple[str, str]]) -> Tuple[List[float], float]:
+    """Compute distances for text pairs, returning them with the elapsed seconds."""
+    start = time.perf_counter()
+    distances = [calc.calculate_distance(a, b) for a, b in text_pairs]
+    return distances, time.perf_counter() - start
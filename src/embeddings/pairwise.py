@@ -0,0 +1,82 @@
+"""Chunked pairwise cosine distances and top-k search over embeddings."""
+from typing import Iterator, Tuple
+import numpy as np
+
+
+def normalize(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving zero vectors unchanged (as sklearn does)."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+def iter_distance_blocks(
+    a: np.ndarray,
+    b: np.ndarray,
+    chunk_size: int = 1024
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (row offset, block) of cosine distances, chunk_size rows of `a` at a time."""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    a_norm, b_norm = normalize(a), normalize(b)
+    for start in range(0, len(a_norm), chunk_size):
+        yield start, 1.0 - a_norm[start:start + chunk_size] @ b_norm.T
+
+
+def cosine_distance_matrix(a: np.ndarray, b: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+    """Full len(a) x len(b) cosine distance matrix, computed in row blocks."""
+    out = np.empty((len(a), len(b)), dtype=np.float32)
+    for start, block in iter_distance_blocks(a, b, chunk_size):
+        out[start:start + len(block)] = block
+    return out
+
+
+def top_k_neighbors(
+    a: np.ndarray,
+    b: np.ndarray,
+    k: int,
+    chunk_size: int = 1024,
+    exclude_self: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and distances of the k nearest rows of `b` for every row of `a`.
+
+    Works on chunk_size x chunk_size blocks and keeps a running top-k, so
+    memory stays bounded regardless of len(b). With exclude_self (a is b),
+    each row's own index is skipped.
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    k = min(k, len(b) - 1 if exclude_self else len(b))
+    a_norm, b_norm = normalize(a), normalize(b)
+    indices = np.empty((len(a), k), dtype=np.int64)
+    distances = np.empty((len(a), k), dtype=np.float32)
+    if k <= 0:
+        return indices, distances
+
+    for row in range(0, len(a_norm), chunk_size):
+        queries = a_norm[row:row + chunk_size]
+        best_dist = np.full((len(queries), 0), np.inf, dtype=np.float32)
+        best_idx = np.empty((len(queries), 0), dtype=np.int64)
+
+        for col in range(0, len(b_norm), chunk_size):
+            block = 1.0 - queries @ b_norm[col:col + chunk_size].T
+            block_idx = np.arange(col, col + block.shape[1])
+            if exclude_self:
+                rows = np.arange(row, row + len(queries))
+                block[block_idx[None, :] == rows[:, None]] = np.inf
+
+            cand_dist = np.concatenate([best_dist, block], axis=1)
+            cand_idx = np.concatenate([best_idx, np.broadcast_to(block_idx, block.shape)], axis=1)
+            keep = min(k, cand_dist.shape[1])
+            part = np.argpartition(cand_dist, keep - 1, axis=1)[:, :keep]
+            best_dist = np.take_along_axis(cand_dist, part, axis=1)
+            best_idx = np.take_along_axis(cand_idx, part, axis=1)
+
+        order = np.argsort(best_dist, axis=1, kind="stable")
+        distances[row:row + len(queries)] = np.take_along_axis(best_dist, order, axis=1)
+        indices[row:row + len(queries)] = np.take_along_axis(best_idx, order, axis=1)
+
+    return indices, distances
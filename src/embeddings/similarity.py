@@ -1,22 +1,103 @@
 """Sentence embedding and similarity calculation."""
 import logging
-from typing import List, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
+from .pairwise import cosine_distance_matrix, normalize, top_k_neighbors
 
 logger = logging.getLogger(__name__)
 
+BACKENDS = ("torch", "onnx-int8")
+
+
+def resolve_device(device: Optional[str]) -> Optional[str]:
+    """Map the config value `auto` to SentenceTransformer's auto-detection."""
+    if device in (None, "", "auto"):
+        return None
+    return device
+
+
+def load_model(
+    model_name: str,
+    backend: str = "torch",
+    device: Optional[str] = None,
+    onnx_dir: str = "models/onnx",
+    quantization: str = "avx2"
+) -> SentenceTransformer:
+    """Load an embedding model for the given backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend}")
+
+    if backend == "onnx-int8":
+        from .onnx_backend import load_quantized_model
+        return load_quantized_model(model_name, Path(onnx_dir), quantization)
+    return SentenceTransformer(model_name, device=resolve_device(device))
+
+
+def set_intra_op_threads(threads: int) -> None:
+    """Pin the number of intra-op threads used by torch (0 keeps the default)."""
+    if threads > 0:
+        import torch
+        torch.set_num_threads(threads)
+
 
 class SimilarityCalculator:
     """Calculates semantic similarity using sentence embeddings."""
 
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    BACKENDS = BACKENDS
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        backend: str = "torch",
+        onnx_dir: str = "models/onnx",
+        quantization: str = "avx2",
+        device: Optional[str] = None,
+        batch_size: int = 32,
+        num_workers: int = 1,
+        threads_per_worker: int = 0
+    ):
         """Initialize the similarity calculator."""
-        logger.info(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, got {backend}")
+
+        logger.info(f"Loading embedding model: {model_name} (backend: {backend}, device: {device or 'auto'})")
+        model_kwargs = {
+            "model_name": model_name,
+            "backend": backend,
+            "device": device,
+            "onnx_dir": onnx_dir,
+            "quantization": quantization,
+        }
+        self.model = load_model(**model_kwargs)
+        self.backend = backend
+        self.batch_size = batch_size
         self._cache = {}
-        logger.info(f"Model loaded. Embedding dimension: {self.model.get_sentence_embedding_dimension()}")
+        self._pool = None
+        dimension = self.model.get_sentence_embedding_dimension()
+        logger.info(f"Model loaded. Embedding dimension: {dimension}")
+
+        if num_workers > 1:
+            from .worker_pool import get_shared_pool
+            self._pool = get_shared_pool(model_kwargs, num_workers, threads_per_worker, batch_size, dimension)
+        else:
+            set_intra_op_threads(threads_per_worker)
+
+    @classmethod
+    def from_config(cls, embedding_config: Dict[str, Any]) -> "SimilarityCalculator":
+        """Create a calculator from the `embedding` section of config.yaml."""
+        return cls(
+            model_name=embedding_config.get("model", "sentence-transformers/all-MiniLM-L6-v2"),
+            backend=embedding_config.get("backend", "torch"),
+            onnx_dir=embedding_config.get("onnx_dir", "models/onnx"),
+            quantization=embedding_config.get("quantization", "avx2"),
+            device=embedding_config.get("device", "auto"),
+            batch_size=embedding_config.get("batch_size", 32),
+            num_workers=embedding_config.get("num_workers", 1),
+            threads_per_worker=embedding_config.get("threads_per_worker", 0)
+        )
 
     def get_embedding(self, text: str) -> np.ndarray:
         """Get embedding for text (with caching)."""
@@ -29,6 +110,22 @@ class SimilarityCalculator:
         self._cache[text] = embedding
         return embedding
 
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for many texts, encoding uncached ones in batches."""
+        missing = list(dict.fromkeys(text for text in texts if text not in self._cache))
+        if missing:
+            logger.debug(f"Encoding {len(missing)} uncached texts (batch size: {self.batch_size})")
+            if self._pool is not None:
+                embeddings = self._pool.encode(missing)
+            else:
+                embeddings = self.model.encode(missing, batch_size=self.batch_size, convert_to_numpy=True)
+            for text, embedding in zip(missing, embeddings):
+                self._cache[text] = embedding
+
+        if not texts:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.stack([self._cache[text] for text in texts])
+
     def calculate_distance(self, text1: str, text2: str) -> float:
         """Calculate cosine distance between two texts."""
         emb1 = self.get_embedding(text1).reshape(1, -1)
@@ -40,8 +137,40 @@ class SimilarityCalculator:
 
     def batch_calculate(self, text_pairs: List[Tuple[str, str]]) -> List[float]:
         """Calculate distances for multiple text pairs."""
-        distances = []
-        for i, (text1, text2) in enumerate(text_pairs, 1):
-            logger.info(f"Processing pair {i}/{len(text_pairs)}")
-            distances.append(self.calculate_distance(text1, text2))
-        return distances
+        if not text_pairs:
+            return []
+
+        logger.info(f"Processing {len(text_pairs)} pairs")
+        emb1 = self.encode([text1 for text1, _ in text_pairs])
+        emb2 = self.encode([text2 for _, text2 in text_pairs])
+        similarity = np.einsum("ij,ij->i", normalize(emb1), normalize(emb2))
+        return [float(1.0 - s) for s in similarity]
+
+    def distance_matrix(
+        self,
+        texts_a: List[str],
+        texts_b: Optional[List[str]] = None,
+        chunk_size: int = 1024
+    ) -> np.ndarray:
+        """Cosine distances between every text in texts_a and every text in texts_b.
+
+        With texts_b omitted, returns the square matrix of texts_a against itself.
+        """
+        emb_a = self.encode(texts_a)
+        emb_b = emb_a if texts_b is None else self.encode(texts_b)
+        return cosine_distance_matrix(emb_a, emb_b, chunk_size)
+
+    def nearest_neighbors(
+        self,
+        queries: List[str],
+        corpus: Optional[List[str]] = None,
+        k: int = 5,
+        chunk_size: int = 1024
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices into corpus and distances of the k nearest texts for each query.
+
+        With corpus omitted, searches queries against themselves, skipping self-matches.
+        """
+        emb_q = self.encode(queries)
+        emb_c = emb_q if corpus is None else self.encode(corpus)
+        return top_k_neighbors(emb_q, emb_c, k, chunk_size, exclude_self=corpus is None)
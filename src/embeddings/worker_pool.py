@@ -0,0 +1,116 @@
+"""Multi-process embedding pool that returns embeddings through shared memory."""
+import atexit
+import logging
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Per-process model, loaded once by the pool initializer
+_worker_model = None
+_worker_batch_size = 32
+
+# Pools shared by every calculator in this process, keyed by their settings
+_shared_pools: Dict[Tuple, "EmbeddingPool"] = {}
+
+
+def _init_worker(model_kwargs: Dict[str, Any], threads: int, batch_size: int) -> None:
+    """Load the embedding model once per worker with pinned intra-op threads."""
+    global _worker_model, _worker_batch_size
+    from .similarity import load_model, set_intra_op_threads
+
+    set_intra_op_threads(threads)
+    _worker_model = load_model(**model_kwargs)
+    _worker_batch_size = batch_size
+
+
+def _encode_shard(shm_name: str, shape: Tuple[int, int], start: int, texts: List[str]) -> int:
+    """Encode a shard and write it into rows [start, start + len(texts)) of the shared block."""
+    embeddings = _worker_model.encode(texts, batch_size=_worker_batch_size, convert_to_numpy=True)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        out[start:start + len(texts)] = embeddings
+    finally:
+        shm.close()
+    return len(texts)
+
+
+class EmbeddingPool:
+    """Shards encoding across worker processes, each with its own model copy."""
+
+    def __init__(
+        self,
+        model_kwargs: Dict[str, Any],
+        num_workers: int,
+        threads_per_worker: int = 1,
+        batch_size: int = 32,
+        dimension: int = 384
+    ):
+        """Start the worker processes."""
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.dimension = dimension
+        logger.info(
+            f"Starting embedding pool | Workers: {num_workers} | "
+            f"Threads per worker: {threads_per_worker or 'default'}"
+        )
+        ctx = mp.get_context("spawn")
+        self._pool = ctx.Pool(
+            num_workers,
+            initializer=_init_worker,
+            initargs=(model_kwargs, threads_per_worker, batch_size)
+        )
+
+    def _shards(self, n: int) -> List[Tuple[int, int]]:
+        """Split n rows into contiguous shards, one or more per worker."""
+        shard_size = max(self.batch_size, -(-n // self.num_workers))
+        return [(start, min(start + shard_size, n)) for start in range(0, n, shard_size)]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts across the pool; embeddings come back via shared memory."""
+        n = len(texts)
+        if n == 0:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        shape = (n, self.dimension)
+        shm = shared_memory.SharedMemory(create=True, size=n * self.dimension * 4)
+        try:
+            self._pool.starmap(
+                _encode_shard,
+                [(shm.name, shape, start, texts[start:end]) for start, end in self._shards(n)]
+            )
+            return np.ndarray(shape, dtype=np.float32, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self._pool.close()
+        self._pool.join()
+
+
+def get_shared_pool(
+    model_kwargs: Dict[str, Any],
+    num_workers: int,
+    threads_per_worker: int = 1,
+    batch_size: int = 32,
+    dimension: int = 384
+) -> EmbeddingPool:
+    """Return the process-wide pool for these settings, starting it on first use."""
+    key = (tuple(sorted(model_kwargs.items())), num_workers, threads_per_worker, batch_size)
+    pool: Optional[EmbeddingPool] = _shared_pools.get(key)
+    if pool is None:
+        pool = EmbeddingPool(model_kwargs, num_workers, threads_per_worker, batch_size, dimension)
+        _shared_pools[key] = pool
+    return pool
+
+
+@atexit.register
+def _close_shared_pools() -> None:
+    for pool in _shared_pools.values():
+        pool.close()
+    _shared_pools.clear()
@@ -1,4 +1,5 @@
 """Utility functions for the project."""
-from .error_injection import inject_errors, inject_typo
+from .error_injection import inject_errors, inject_errors_nested, inject_typo
+from .bulk_injection import bulk_inject_errors
 
-__all__ = ["inject_errors", "inject_typo"]
\ No newline at end of file
+__all__ = ["inject_errors", "inject_errors_nested", "inject_typo", "bulk_inject_errors"]
@@ -0,0 +1,134 @@
+"""Bulk spelling error injection over sentences x error rates x seeds."""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple
+import numpy as np
+from .typo_engine import DEFAULT_ENGINE, TypoEngine
+
+logger = logging.getLogger(__name__)
+
+# Cell keys use error rates in millionths so the stream does not depend on list order
+RATE_SCALE = 1_000_000
+
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SENTENCE_MULT = np.uint64(0xD1B54A32D192ED03)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer, applied element-wise (uint64 arithmetic wraps)."""
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def seed_keys(seeds: Sequence[int]) -> np.ndarray:
+    """One 64-bit key per seed, derived through SeedSequence."""
+    return np.array(
+        [np.random.SeedSequence(seed).generate_state(1, np.uint64)[0] for seed in seeds],
+        dtype=np.uint64
+    )
+
+
+def cell_keys(keys: np.ndarray, sentence_index, error_rate: float) -> np.ndarray:
+    """Stream keys for the cells (sentence, rate, seed) of every seed key.
+
+    `sentence_index` may also be an array broadcastable against `keys`.
+    """
+    rate_key = np.uint64(int(round(error_rate * RATE_SCALE)))
+    with np.errstate(over="ignore"):
+        coordinate = _splitmix64(np.asarray(sentence_index, dtype=np.uint64) * _SENTENCE_MULT + rate_key)
+    return _splitmix64(keys ^ coordinate)
+
+
+def cell_uniforms(keys: np.ndarray, count: int) -> np.ndarray:
+    """`count` uniforms in [0, 1) per key: a counter-based stream per cell."""
+    with np.errstate(over="ignore"):
+        counters = np.arange(1, count + 1, dtype=np.uint64) * _GAMMA
+        bits = _splitmix64(keys[:, None] + counters[None, :])
+    return (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class _SentenceTable:
+    """Every typo the engine can make in each word, with cumulative probabilities.
+
+    Options 0..n-1 are the words themselves; the variants of all words follow.
+    cdf holds word w's cumulative probabilities shifted by w, so one sorted
+    search maps (word, uniform) pairs for many cells to variant indices at once.
+    """
+
+    def __init__(self, sentence: str, engine: TypoEngine = DEFAULT_ENGINE):
+        self.words = sentence.split()
+        options: List[str] = list(self.words)
+        cdfs = []
+        for w, word in enumerate(self.words):
+            variants, probs = engine.variant_distribution(word)
+            cdf = np.cumsum(probs) / probs.sum()
+            cdf[-1] = 1.0
+            cdfs.append(w + cdf)
+            options.extend(variants)
+        self.cdf = np.concatenate(cdfs) if cdfs else np.empty(0)
+        self.options = np.array(options, dtype=object)
+
+    def corrupt(self, keys: np.ndarray, error_rate: float) -> List[str]:
+        """One variant per cell key, with all random draws taken as one matrix."""
+        n = len(self.words)
+        num_errors = int(n * error_rate)
+        if num_errors == 0:
+            return [" ".join(self.words)] * len(keys)
+
+        u = cell_uniforms(keys, 2 * n)
+        rows = np.arange(len(keys))[:, None]
+        chosen = np.argpartition(u[:, :n], num_errors - 1, axis=1)[:, :num_errors]
+        picks = np.searchsorted(self.cdf, chosen + u[:, n:][rows, chosen], side="right")
+
+        codes = np.broadcast_to(np.arange(n), (len(keys), n)).copy()
+        codes[rows, chosen] = n + picks
+        return [" ".join(row) for row in self.options[codes].tolist()]
+
+
+def _corrupt_sentence(
+    args: Tuple[int, str, Sequence[float], np.ndarray]
+) -> List[List[str]]:
+    """All rate x seed variants of one sentence."""
+    sentence_index, sentence, error_rates, keys = args
+    table = _SentenceTable(sentence)
+    return [
+        table.corrupt(cell_keys(keys, sentence_index, error_rate), error_rate)
+        for error_rate in error_rates
+    ]
+
+
+def bulk_inject_errors(
+    sentences: Sequence[str],
+    error_rates: Sequence[float],
+    seeds: Sequence[int],
+    workers: int = 1
+) -> List[List[List[str]]]:
+    """Corrupt every sentence at every error rate with every seed.
+
+    Returns variants indexed as [sentence][rate][seed]. Each seed is turned
+    into a key through SeedSequence, and every cell gets its own counter-based
+    stream keyed by (seed key, sentence index, rate). All cells of a
+    (sentence, rate) pair are then corrupted with array operations. The output
+    does not depend on the number of workers and global random state is never
+    touched. Each selected word gets one typo drawn from the same distribution
+    as inject_typo (TypoEngine.variant_distribution).
+    """
+    for error_rate in error_rates:
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate must be between 0.0 and 1.0, got {error_rate}")
+
+    keys = seed_keys(seeds)
+    tasks = [(i, sentence, list(error_rates), keys) for i, sentence in enumerate(sentences)]
+    logger.info(
+        f"Generating {len(sentences) * len(error_rates) * len(seeds)} variants "
+        f"({len(sentences)} sentences x {len(error_rates)} rates x {len(seeds)} seeds)"
+    )
+
+    if workers <= 1 or len(tasks) <= 1:
+        return [_corrupt_sentence(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_corrupt_sentence, tasks, chunksize=chunksize))
@@ -0,0 +1,194 @@
+"""Streaming spelling error injection over large text / JSONL corpora."""
+import json
+import logging
+import os
+import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from .bulk_injection import cell_keys, seed_keys
+from .error_injection import _corrupt_words
+
+logger = logging.getLogger(__name__)
+
+# Lines are read and seeded in batches; memory use is bounded by one batch per worker
+BATCH_LINES = 4096
+
+FORMATS = ("txt", "jsonl")
+
+
+def detect_format(path: Path) -> str:
+    """`jsonl` for .jsonl/.ndjson files, `txt` otherwise."""
+    return "jsonl" if Path(path).suffix.lower() in (".jsonl", ".ndjson") else "txt"
+
+
+def byte_ranges(path: Path, parts: int) -> List[Tuple[int, int]]:
+    """Split a file into at most `parts` byte ranges that start and end on line boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, max(1, parts)):
+            target = size * i // parts
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def iter_lines(path: Path, start: int, end: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield (byte offset, raw line) for every line starting in [start, end)."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            yield offset, line
+            offset += len(line)
+
+
+def line_seeds(key: np.uint64, offsets: Sequence[int], error_rate: float) -> List[int]:
+    """Per-line seeds keyed by (seed key, byte offset, rate), independent of sharding."""
+    return cell_keys(np.array([key], dtype=np.uint64), np.asarray(offsets), error_rate).tolist()
+
+
+def _parse(line: bytes, offset: int, fmt: str, text_field: str) -> Optional[Dict[str, Any]]:
+    """Decode one input line into a record, or None for a blank line."""
+    text = line.decode("utf-8").rstrip("\r\n")
+    if not text.strip():
+        return None
+    if fmt == "txt":
+        return {text_field: text}
+
+    record = json.loads(text)
+    if not isinstance(record, dict) or not isinstance(record.get(text_field), str):
+        raise ValueError(f"Line at byte {offset} has no string field '{text_field}'")
+    return record
+
+
+def _corrupt(text: str, error_rate: float, seed: int) -> str:
+    """inject_errors without the per-call logging."""
+    if error_rate == 0.0:
+        return text
+    words = text.split()
+    return ' '.join(_corrupt_words(words, int(len(words) * error_rate), random.Random(seed)))
+
+
+def _write_batch(
+    out,
+    batch: List[Tuple[int, Dict[str, Any]]],
+    error_rates: Sequence[float],
+    key: np.uint64,
+    text_field: str
+) -> int:
+    """Corrupt a batch of records at every rate and write them as JSONL."""
+    offsets = [offset for offset, _ in batch]
+    seeds = {rate: line_seeds(key, offsets, rate) for rate in error_rates}
+    written = 0
+    for i, (offset, record) in enumerate(batch):
+        for rate in error_rates:
+            seed = seeds[rate][i]
+            row = {
+                **record,
+                "offset": offset,
+                "error_rate": rate,
+                "seed": seed,
+                "corrupted": _corrupt(record[text_field], rate, seed)
+            }
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def _corrupt_range(args: Tuple[str, int, int, str, Sequence[float], int, str, str]) -> Tuple[int, int]:
+    """Corrupt the lines of one byte range into `out_path`; returns (lines, records)."""
+    path, start, end, out_path, error_rates, seed, fmt, text_field = args
+    key = seed_keys([seed])[0]
+    lines = written = 0
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    with open(out_path, "w", encoding="utf-8") as out:
+        for offset, line in iter_lines(Path(path), start, end):
+            record = _parse(line, offset, fmt, text_field)
+            if record is None:
+                continue
+            batch.append((offset, record))
+            lines += 1
+            if len(batch) >= BATCH_LINES:
+                written += _write_batch(out, batch, error_rates, key, text_field)
+                batch = []
+        if batch:
+            written += _write_batch(out, batch, error_rates, key, text_field)
+
+    logger.info(f"Corrupted bytes {start}-{end} | Lines: {lines} | Records: {written}")
+    return lines, written
+
+
+def corrupt_corpus(
+    input_path: Path,
+    output_path: Path,
+    error_rates: Sequence[float],
+    seed: int = 42,
+    workers: int = 1,
+    text_field: str = "text",
+    fmt: Optional[str] = None
+) -> Dict[str, int]:
+    """Stream a corpus through inject_errors at every rate and write JSONL.
+
+    The input is never loaded whole: it is split into line-aligned byte
+    ranges, one per worker, and each range is read line by line. Every
+    (line, rate) pair is corrupted with its own seed derived from `seed`,
+    the line's byte offset and the rate, so the output does not depend on
+    the number of workers. Each output record is the input record (a txt
+    line becomes {text_field: line}) plus `offset`, `error_rate`, `seed`
+    and `corrupted`; `inject_errors(original, error_rate, seed)` reproduces
+    `corrupted`. Workers write part files that are concatenated in order.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    fmt = fmt or detect_format(input_path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    for error_rate in error_rates:
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate must be between 0.0 and 1.0, got {error_rate}")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ranges = byte_ranges(input_path, workers)
+    logger.info(f"Streaming {input_path} ({fmt}) | Ranges: {len(ranges)} | Rates: {list(error_rates)}")
+
+    if len(ranges) <= 1:
+        start, end = ranges[0] if ranges else (0, 0)
+        lines, written = _corrupt_range(
+            (str(input_path), start, end, str(output_path), list(error_rates), seed, fmt, text_field)
+        )
+        return {"lines": lines, "records": written}
+
+    part_paths = [output_path.with_name(f"{output_path.name}.part{i:04d}") for i in range(len(ranges))]
+    tasks = [
+        (str(input_path), start, end, str(part), list(error_rates), seed, fmt, text_field)
+        for (start, end), part in zip(ranges, part_paths)
+    ]
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(_corrupt_range, tasks))
+        with open(output_path, "wb") as out:
+            for part in part_paths:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+    finally:
+        for part in part_paths:
+            part.unlink(missing_ok=True)
+
+    return {"lines": sum(c[0] for c in counts), "records": sum(c[1] for c in counts)}
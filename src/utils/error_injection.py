@@ -1,45 +1,23 @@
 """Spelling error injection for experiments."""
 import random
 import logging
+from typing import List, Optional, Sequence
+from .typo_engine import DEFAULT_ENGINE, KEYBOARD_NEIGHBORS
 
 logger = logging.getLogger(__name__)
 
-# Keyboard neighbor mapping (QWERTY layout)
-KEYBOARD_NEIGHBORS = {
-    'a': ['q', 's', 'z'], 'b': ['v', 'g', 'h', 'n'],
-    'c': ['x', 'd', 'f', 'v'], 'd': ['s', 'e', 'f', 'c', 'x'],
-    'e': ['w', 'r', 'd', 's'], 'f': ['d', 'r', 't', 'g', 'v', 'c'],
-    'g': ['f', 't', 'y', 'h', 'b', 'v'], 'h': ['g', 'y', 'u', 'j', 'n', 'b'],
-    'i': ['u', 'o', 'k', 'j'], 'j': ['h', 'u', 'i', 'k', 'n', 'm'],
-    'k': ['j', 'i', 'o', 'l', 'm'], 'l': ['k', 'o', 'p'],
-    'm': ['n', 'j', 'k'], 'n': ['b', 'h', 'j', 'm'],
-    'o': ['i', 'p', 'l', 'k'], 'p': ['o', 'l'],
-    'q': ['w', 'a'], 'r': ['e', 't', 'f', 'd'],
-    's': ['a', 'w', 'd', 'x', 'z'], 't': ['r', 'y', 'g', 'f'],
-    'u': ['y', 'i', 'j', 'h'], 'v': ['c', 'f', 'g', 'b'],
-    'w': ['q', 'e', 's', 'a'], 'x': ['z', 's', 'd', 'c'],
-    'y': ['t', 'u', 'h', 'g'], 'z': ['a', 's', 'x']
-}
-
-
-
-def inject_typo(word: str) -> str:
-    """Inject a single typo into a word by replacing one character."""
-    if len(word) < 4:
-        return word
-    
-    pos = random.randint(1, len(word) - 2)
-    char = word[pos].lower()
-    
-    if char in KEYBOARD_NEIGHBORS and KEYBOARD_NEIGHBORS[char]:
-        replacement = random.choice(KEYBOARD_NEIGHBORS[char])
-        return word[:pos] + replacement + word[pos+1:]
-    
-    return word
+
+def inject_typo(word: str, rng: Optional[random.Random] = None) -> str:
+    """Inject a single typo (substitute, insert, delete or transpose) into a word."""
+    return DEFAULT_ENGINE.corrupt_word(word, rng or random)
 
 
 def inject_errors(text: str, error_rate: float, seed: int = 42) -> str:
-    """Inject spelling errors into text at specified rate."""
+    """Inject spelling errors into text at specified rate.
+
+    Uses a private random.Random(seed), so the global random state is left
+    untouched and concurrent calls are safe.
+    """
 
     # Validate error_rate
     if not 0.0 <= error_rate <= 1.0:
@@ -48,17 +26,53 @@ def inject_errors(text: str, error_rate: float, seed: int = 42) -> str:
     if error_rate == 0.0:
         return text
 
-    random.seed(seed)
+    rng = random.Random(seed)
     
     words = text.split()
     num_errors = int(len(words) * error_rate)
     
     logger.info(f"Injecting {num_errors} errors into {len(words)} words ({error_rate:.0%})")
     
-    error_indices = random.sample(range(len(words)), min(num_errors, len(words)))
+    return ' '.join(_corrupt_words(words, num_errors, rng))
+
+
+def inject_errors_nested(text: str, error_rates: Sequence[float], seed: int = 42) -> List[str]:
+    """Inject spelling errors at several rates with common random numbers.
+
+    Words are edited in one random order, each with a single pre-drawn typo;
+    the variant at rate r applies the first int(n * r) edits. Edits at a lower
+    rate are therefore a subset of the edits at any higher rate, and the
+    variant at the highest rate equals inject_errors(text, max_rate, seed).
+    Returns one variant per rate, in the order given.
+    """
+    for error_rate in error_rates:
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"error_rate must be between 0.0 and 1.0, got {error_rate}")
+
+    rng = random.Random(seed)
+    words = text.split()
+    counts = [int(len(words) * error_rate) for error_rate in error_rates]
+
+    order = rng.sample(range(len(words)), min(max(counts, default=0), len(words)))
+    typos = [inject_typo(words[idx], rng) for idx in order]
+
+    variants = []
+    for error_rate, num_errors in zip(error_rates, counts):
+        if error_rate == 0.0:
+            variants.append(text)
+            continue
+        variant = list(words)
+        for idx, typo in zip(order[:num_errors], typos[:num_errors]):
+            variant[idx] = typo
+        variants.append(' '.join(variant))
+    return variants
+
+
+def _corrupt_words(words: List[str], num_errors: int, rng: random.Random) -> List[str]:
+    """Apply one typo to each of `num_errors` randomly chosen words (in place)."""
+    error_indices = rng.sample(range(len(words)), min(num_errors, len(words)))
     
     for idx in error_indices:
-        original = words[idx]
-        words[idx] = inject_typo(words[idx])
+        words[idx] = inject_typo(words[idx], rng)
     
-    return ' '.join(words)
+    return words
@@ -0,0 +1,80 @@
+"""Dependency fingerprints of experiment cells, for recomputing only what a config change affects."""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Bump when the meaning of a fingerprinted input changes, to invalidate old results
+FINGERPRINT_VERSION = 1
+SCORE_FIELDS = ("distance", "hop_distances", "stage_distances")
+
+
+def fingerprint(*parts: Any) -> str:
+    """Short stable hash of JSON-serializable parts."""
+    payload = json.dumps([FINGERPRINT_VERSION, *parts], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def cell_fingerprints(
+    sentence: str,
+    error_rate: float,
+    seed: int,
+    corrupted: str,
+    stage_specs: Sequence[Dict[str, Any]],
+    score_spec: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Fingerprints of one cell's input, of each stage's output, and of its scores.
+
+    Each fingerprint covers everything upstream of it: the input hashes the
+    sentence, rate, seed and corrupted text; stage k hashes stage k-1's
+    fingerprint with stage k's spec (model, prompt, temperature); the score
+    hashes the last stage with `score_spec`. Changing the stage-2 model thus
+    changes stages 2 and 3 and the score but keeps stage 1. The score
+    fingerprint is "" when `score_spec` is None (scores never reused).
+    """
+    current = fingerprint("input", sentence, error_rate, seed, corrupted)
+    cell = {"input_fingerprint": current}
+    stages = []
+    for spec in stage_specs:
+        current = fingerprint("stage", current, spec)
+        stages.append(current)
+    cell["stage_fingerprints"] = stages
+    cell["score_fingerprint"] = fingerprint("score", current, score_spec) if score_spec is not None else ""
+    return cell
+
+
+class ResultCache:
+    """Stage outputs and scores of earlier result rows, looked up by fingerprint.
+
+    Outputs are addressed by content, not by grid position, so a cell
+    reuses any earlier stage with the same fingerprint wherever it came from.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = ()):
+        self._outputs: Dict[str, str] = {}
+        self._scores: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            stage_fingerprints = row.get("stage_fingerprints")
+            outputs = row.get("stage_outputs")
+            if not stage_fingerprints or outputs is None:
+                continue
+            self._outputs.update(zip(stage_fingerprints, outputs))
+            if row.get("score_fingerprint") and "distance" in row:
+                self._scores[row["score_fingerprint"]] = {name: row[name] for name in SCORE_FIELDS if name in row}
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def outputs(self, stage_fingerprints: Sequence[str]) -> List[str]:
+        """Outputs of the longest run of leading stages that are cached."""
+        done = []
+        for stage_fingerprint in stage_fingerprints:
+            if stage_fingerprint not in self._outputs:
+                break
+            done.append(self._outputs[stage_fingerprint])
+        return done
+
+    def scores(self, score_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Cached score fields, or None if the cell must be scored."""
+        if not score_fingerprint:
+            return None
+        return self._scores.get(score_fingerprint)
@@ -0,0 +1,101 @@
+"""Model-free streaming distance scorer built on feature hashing."""
+import hashlib
+import math
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .tfidf import METRICS, tokenize
+
+DEFAULT_FEATURES = 2 ** 18
+
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    """Stable 64-bit hash of a token (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HashingScorer:
+    """TF-IDF distances over a fixed number of hashed features, one document at a time.
+
+    Tokens map to buckets by a stable hash, with a hash-derived sign so that
+    collisions cancel out in expectation instead of piling up. Document
+    frequencies are kept per bucket and updated as texts arrive, so nothing
+    depends on seeing the corpus up front and memory is fixed by
+    n_features. Each text is weighted with the IDF known when it is scored:
+    log((1 + N) / (1 + df)) + 1, the smoothing used by tfidf.py.
+
+    Offers calculate_distance and batch_calculate like SimilarityCalculator,
+    so it can stand in for it where no embedding model is wanted.
+    """
+
+    def __init__(self, n_features: int = DEFAULT_FEATURES, metric: str = "cosine"):
+        if n_features <= 0:
+            raise ValueError(f"n_features must be positive, got {n_features}")
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+        self.n_features = n_features
+        self.metric = metric
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.num_documents = 0
+        self._last_reference = None
+        self._reference_terms = None
+
+    @classmethod
+    def from_config(cls, hashing_config: Dict[str, Any]) -> "HashingScorer":
+        """Create a scorer from the `hashing` section of config.yaml."""
+        return cls(
+            n_features=hashing_config.get("n_features", DEFAULT_FEATURES),
+            metric=hashing_config.get("metric", "cosine"),
+        )
+
+    def observe(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Count a document's buckets in the document frequencies; returns (buckets, signed tf)."""
+        tokens = tokenize(text)
+        if not tokens:
+            self.num_documents += 1
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        hashes = np.array([_token_hash(token) for token in tokens], dtype=np.uint64)
+        buckets = (hashes % np.uint64(self.n_features)).astype(np.int64)
+        signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+        unique, inverse = np.unique(buckets, return_inverse=True)
+        self.doc_freq[unique] += 1
+        self.num_documents += 1
+        return unique, np.bincount(inverse, weights=signs) / len(tokens)
+
+    def _weighted(self, buckets: np.ndarray, tf: np.ndarray) -> Dict[int, float]:
+        idf = np.log((1 + self.num_documents) / (1 + self.doc_freq[buckets])) + 1.0
+        return dict(zip(buckets.tolist(), (tf * idf).tolist()))
+
+    def _distance(self, a: Dict[int, float], b: Dict[int, float]) -> float:
+        if self.metric == "euclidean":
+            return math.sqrt(sum((a.get(k, 0.0) - b.get(k, 0.0)) ** 2 for k in a.keys() | b.keys()))
+        norm_a = math.sqrt(sum(v * v for v in a.values()))
+        norm_b = math.sqrt(sum(v * v for v in b.values()))
+        if norm_a == 0.0 or norm_b == 0.0:
+            return 0.0 if norm_a == norm_b else 1.0
+        dot = sum(value * b[k] for k, value in a.items() if k in b)
+        return min(max(1.0 - dot / (norm_a * norm_b), 0.0), 2.0)
+
+    def calculate_distance(self, text1: str, text2: str) -> float:
+        """Distance between two texts; both count as documents.
+
+        A reference text1 passed again in the next call is counted only once,
+        so scoring many finals against the same original does not inflate
+        its terms' document frequencies.
+        """
+        reference = self.observe(text1) if text1 != self._last_reference else self._reference_terms
+        self._last_reference, self._reference_terms = text1, reference
+        candidate = self.observe(text2)
+        return float(self._distance(self._weighted(*reference), self._weighted(*candidate)))
+
+    def batch_calculate(self, text_pairs: List[Tuple[str, str]]) -> List[float]:
+        """Distances for (text1, text2) pairs, scored in order."""
+        return [self.calculate_distance(text1, text2) for text1, text2 in text_pairs]
+
+    def stream_distances(self, original: str, finals: Iterable[str]) -> Iterator[float]:
+        """Distance from the original to each final, yielded as the finals arrive."""
+        for final in finals:
+            yield self.calculate_distance(original, final)
@@ -0,0 +1,279 @@
+"""Experiment results in JSON, JSONL or a columnar NPZ archive."""
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ("json", "jsonl", "npz")
+
+# Archive member holding the column names and kinds, in row-key order
+_SCHEMA = "__schema__"
+
+PathLike = Union[str, Path]
+
+
+def results_format(path: PathLike) -> str:
+    """Format implied by a results file's suffix."""
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix not in FORMATS:
+        raise ValueError(f"Unsupported results format '{suffix}' for {path}, expected one of {FORMATS}")
+    return suffix
+
+
+def _kind(name: str, values: Sequence[Any]) -> str:
+    """Storage kind of a column: bool, int, float, str, or list/<inner kind>."""
+    if all(isinstance(v, bool) for v in values):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return "int"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "float"
+    if all(isinstance(v, str) for v in values):
+        return "str"
+    if all(isinstance(v, list) for v in values):
+        widths = {len(v) for v in values}
+        if len(widths) != 1:
+            raise ValueError(f"Column '{name}' has lists of different lengths {sorted(widths)}")
+        flat = [item for v in values for item in v]
+        inner = _kind(name, flat) if flat else "float"
+        if inner.startswith("list"):
+            raise ValueError(f"Column '{name}' nests lists more than one level deep")
+        return f"list/{inner}"
+    raise ValueError(f"Column '{name}' mixes value types")
+
+
+def _encode_strings(values: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Dictionary encoding: int32 codes plus the distinct strings as one UTF-8 blob with offsets."""
+    categories = list(dict.fromkeys(values))
+    index = {value: code for code, value in enumerate(categories)}
+    encoded = [value.encode("utf-8") for value in categories]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return {
+        "codes": np.fromiter((index[value] for value in values), dtype=np.int32, count=len(values)),
+        "blob": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "offsets": offsets,
+    }
+
+
+def _decode_categories(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    data = blob.tobytes()
+    return [data[start:end].decode("utf-8") for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+_DTYPES = {"bool": np.bool_, "int": np.int64, "float": np.float64}
+
+
+def write_results(rows: List[Dict[str, Any]], path: PathLike, compress: bool = False) -> None:
+    """Write result rows in the format given by the suffix (.json, .jsonl or .npz).
+
+    In an NPZ archive each column is stored once, typed: numbers as int64 or
+    float64 arrays, text as dictionary codes into its distinct values, and
+    fixed-length list columns (stage outputs, hop distances) as 2-D arrays.
+    Every row must have the same keys.
+    """
+    path = Path(path)
+    fmt = results_format(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+        return
+    if fmt == "jsonl":
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+
+    names = list(rows[0]) if rows else []
+    if any(set(row) != set(names) for row in rows):
+        raise ValueError("All result rows must have the same columns")
+
+    schema = []
+    members: Dict[str, np.ndarray] = {}
+    for name in names:
+        values = [row[name] for row in rows]
+        kind = _kind(name, values)
+        schema.append([name, kind])
+        base = kind.split("/")[-1]
+        if kind.startswith("list"):
+            width = len(values[0]) if values else 0
+            values = [item for value in values for item in value]
+        if base == "str":
+            for part, array in _encode_strings(values).items():
+                members[f"{name}.{part}"] = array
+        else:
+            members[name] = np.array(values, dtype=_DTYPES[base])
+        if kind.startswith("list"):
+            key = f"{name}.codes" if base == "str" else name
+            members[key] = members[key].reshape(len(rows), width)
+
+    members[_SCHEMA] = np.frombuffer(json.dumps(schema).encode("utf-8"), dtype=np.uint8)
+    tmp_path = path.with_name(path.name + ".tmp.npz")
+    (np.savez_compressed if compress else np.savez)(tmp_path, **members)
+    tmp_path.replace(path)
+
+
+def _read_npz(path: Path, columns: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Decoded columns of an archive: arrays, pandas Categoricals, or per-row lists."""
+    decoded: Dict[str, Any] = {}
+    with np.load(path, allow_pickle=False) as archive:
+        schema = json.loads(archive[_SCHEMA].tobytes().decode("utf-8"))
+        if not schema:
+            # Written from zero rows, so no column types were recorded
+            return {name: np.empty(0) for name in columns or []}
+        kinds = dict(schema)
+        wanted = [name for name, _ in schema] if columns is None else list(columns)
+        missing = [name for name in wanted if name not in kinds]
+        if missing:
+            raise KeyError(f"Columns not in {path}: {missing}")
+
+        for name in wanted:
+            kind = kinds[name]
+            if kind.split("/")[-1] == "str":
+                codes = archive[f"{name}.codes"]
+                categories = _decode_categories(archive[f"{name}.blob"], archive[f"{name}.offsets"])
+                if kind.startswith("list"):
+                    decoded[name] = [[categories[code] for code in row] for row in codes.tolist()]
+                else:
+                    decoded[name] = pd.Categorical.from_codes(codes, categories=categories)
+            elif kind.startswith("list"):
+                decoded[name] = archive[name].tolist()
+            else:
+                decoded[name] = archive[name]
+    return decoded
+
+
+def _read_json_rows(path: Path) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        if results_format(path) == "jsonl":
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def load_results_frame(path: PathLike, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Results as a DataFrame, reading only `columns` when given.
+
+    From an NPZ archive only the requested members are read, and text columns
+    come back as categoricals over their distinct values.
+    """
+    path = Path(path)
+    if results_format(path) == "npz":
+        return pd.DataFrame(_read_npz(path, columns))
+    rows = _read_json_rows(path)
+    if columns is None:
+        return pd.DataFrame(rows)
+    return pd.DataFrame(rows, columns=list(columns)) if not rows else pd.DataFrame(rows)[list(columns)]
+
+
+def read_results(path: PathLike, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Results as a list of row dicts with plain Python values, as the JSON file holds them."""
+    path = Path(path)
+    if results_format(path) != "npz":
+        rows = _read_json_rows(path)
+        return rows if columns is None else [{name: row[name] for name in columns} for row in rows]
+
+    decoded = _read_npz(path, columns)
+    lists = {
+        name: list(values) if isinstance(values, pd.Categorical) else (
+            values if isinstance(values, list) else values.tolist()
+        )
+        for name, values in decoded.items()
+    }
+    count = len(next(iter(lists.values()))) if lists else 0
+    return [{name: values[i] for name, values in lists.items()} for i in range(count)]
+
+
+def _read_member(archive: zipfile.ZipFile, member: str) -> np.ndarray:
+    with archive.open(member + ".npy") as f:
+        return np.lib.format.read_array(f)
+
+
+def _iter_member_rows(archive: zipfile.ZipFile, member: str, chunk_rows: int) -> Iterator[np.ndarray]:
+    """Blocks of up to chunk_rows rows of one .npy archive member, read without loading it whole."""
+    with archive.open(member + ".npy") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        if fortran_order and len(shape) > 1:
+            raise ValueError(f"Member {member} is stored in Fortran order and cannot be read in row blocks")
+        row_shape = shape[1:]
+        row_bytes = dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+        for start in range(0, shape[0] if shape else 0, chunk_rows):
+            rows = min(chunk_rows, shape[0] - start)
+            buffer = f.read(rows * row_bytes)
+            if len(buffer) != rows * row_bytes:
+                raise ValueError(f"Member {member} is truncated")
+            yield np.frombuffer(buffer, dtype=dtype).reshape((rows, *row_shape))
+
+
+def iter_result_chunks(
+    path: PathLike, columns: Sequence[str], chunk_size: int = 100_000
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Column arrays for successive blocks of up to chunk_size rows.
+
+    JSONL files are parsed line by line and NPZ archives are decoded member
+    by member, so memory is bounded by the chunk size (plus, for NPZ text
+    columns, their distinct values). A JSON array has to be parsed whole
+    before it can be split.
+    """
+    path = Path(path)
+    columns = list(columns)
+    if not columns:
+        raise ValueError("iter_result_chunks needs at least one column")
+    fmt = results_format(path)
+    if fmt == "npz":
+        with zipfile.ZipFile(path) as archive:
+            schema = dict(json.loads(_read_member(archive, _SCHEMA).tobytes().decode("utf-8")))
+            if not schema:
+                # Written from zero rows: nothing to yield
+                return
+            missing = [name for name in columns if name not in schema]
+            if missing:
+                raise KeyError(f"Columns not in {path}: {missing}")
+            readers = {}
+            decoders = {}
+            for name in columns:
+                if schema[name].split("/")[-1] == "str":
+                    categories = _decode_categories(
+                        _read_member(archive, f"{name}.blob"), _read_member(archive, f"{name}.offsets")
+                    )
+                    decoders[name] = np.array(categories, dtype=object)
+                    readers[name] = _iter_member_rows(archive, f"{name}.codes", chunk_size)
+                else:
+                    readers[name] = _iter_member_rows(archive, name, chunk_size)
+            while True:
+                chunk = {}
+                for name in columns:
+                    block = next(readers[name], None)
+                    if block is None:
+                        return
+                    chunk[name] = decoders[name][block] if name in decoders else block
+                yield chunk
+        return
+
+    def to_chunk(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        return {name: np.array([row[name] for row in rows]) for name in columns}
+
+    if fmt == "json":
+        rows = _read_json_rows(path)
+        for start in range(0, len(rows), chunk_size):
+            yield to_chunk(rows[start:start + chunk_size])
+        return
+
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rows.append(json.loads(line))
+            if len(rows) == chunk_size:
+                yield to_chunk(rows)
+                rows = []
+    if rows:
+        yield to_chunk(rows)
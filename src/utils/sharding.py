@@ -0,0 +1,68 @@
+"""Deterministic split of the experiment grid across machines, and merging of the shard outputs."""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """"i/N" as (i, N), with shards numbered 1..N."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got '{spec}'") from None
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+def cell_key(sentence: str, error_rate: float, run: int) -> str:
+    """Stable identity of a grid cell, independent of its position in the config."""
+    payload = json.dumps([sentence, float(error_rate), int(run)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def assign_shards(keys: Sequence[str], num_shards: int) -> Dict[str, int]:
+    """Shard (1..num_shards) of each cell key: the key's hash modulo num_shards.
+
+    A cell's shard depends on nothing but the cell, so every machine computes
+    the same split from the config alone, and growing the grid (another
+    sentence, more runs) leaves existing cells on the shard whose output
+    already caches them. Shard sizes are only balanced on average.
+    """
+    return {key: int(key, 16) % num_shards + 1 for key in keys}
+
+
+def grid_keys(sentences: Sequence[str], error_rates: Sequence[float], num_runs: int) -> List[str]:
+    """Cell keys of the whole grid, in the order experiment writes rows."""
+    return [
+        cell_key(sentence, error_rate, run)
+        for sentence in sentences for error_rate in error_rates for run in range(num_runs)
+    ]
+
+
+def merge_shards(shards: Iterable[Iterable[Dict[str, Any]]], expected: Sequence[str]) -> Dict[str, Any]:
+    """Combine shard rows into one list in grid order, reporting what does not add up.
+
+    Returns the merged rows plus three lists of cell keys: `duplicates`
+    (cells found more than once; the first is kept), `missing` (grid cells
+    no shard has) and `unexpected` (cells not in the grid, which are
+    dropped). Unless there are duplicates, shard order does not matter.
+    """
+    position = {key: index for index, key in enumerate(expected)}
+    found: Dict[str, Dict[str, Any]] = {}
+    duplicates, unexpected = [], []
+    for rows in shards:
+        for row in rows:
+            key = cell_key(row["original"], row["error_rate"], row["run"])
+            if key not in position:
+                unexpected.append(key)
+            elif key in found:
+                duplicates.append(key)
+            else:
+                found[key] = row
+    return {
+        "rows": [found[key] for key in sorted(found, key=position.__getitem__)],
+        "duplicates": duplicates,
+        "missing": [key for key in expected if key not in found],
+        "unexpected": unexpected,
+    }
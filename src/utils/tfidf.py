@@ -0,0 +1,107 @@
+"""Sparse TF-IDF vectors and distances to a reference document."""
+import math
+import re
+from typing import Callable, List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+METRICS = ("euclidean", "cosine")
+
+_TOKEN_RE = re.compile(r"[a-zA-Z_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased runs of ASCII letters and underscores."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def tfidf_matrix(
+    documents: Sequence[str], tokenizer: Callable[[str], List[str]] = tokenize
+) -> sparse.csr_matrix:
+    """(documents x vocabulary) CSR matrix of tf * idf.
+
+    tf is a term's count over the document's token count and idf is
+    log((1 + N) / (1 + df)) + 1, with columns in sorted vocabulary order.
+    Document frequencies come from one bincount over the column indices,
+    so the cost is linear in the total number of tokens.
+    """
+    counts = []
+    lengths = np.empty(len(documents), dtype=np.float64)
+    for row, text in enumerate(documents):
+        tokens = tokenizer(text)
+        lengths[row] = max(len(tokens), 1)
+        row_counts = {}
+        for token in tokens:
+            row_counts[token] = row_counts.get(token, 0) + 1
+        counts.append(row_counts)
+
+    vocabulary = sorted({term for row_counts in counts for term in row_counts})
+    columns = {term: i for i, term in enumerate(vocabulary)}
+    indptr = np.zeros(len(documents) + 1, dtype=np.int64)
+    np.cumsum([len(row_counts) for row_counts in counts], out=indptr[1:])
+    indices = np.fromiter(
+        (columns[term] for row_counts in counts for term in row_counts), dtype=np.int64, count=indptr[-1]
+    )
+    term_counts = np.fromiter(
+        (count for row_counts in counts for count in row_counts.values()), dtype=np.float64, count=indptr[-1]
+    )
+
+    doc_freq = np.bincount(indices, minlength=len(vocabulary))
+    # math.log per term rather than np.log: the two can differ in the last bit
+    idf = np.array([math.log((1 + len(documents)) / (1 + df)) + 1.0 for df in doc_freq.tolist()])
+    tf = term_counts / np.repeat(lengths, np.diff(indptr))
+    matrix = sparse.csr_matrix((tf * idf[indices], indices, indptr), shape=(len(documents), len(vocabulary)))
+    matrix.sort_indices()
+    return matrix
+
+
+def _row_sums(matrix: sparse.csr_matrix) -> np.ndarray:
+    """Per-row sums of the stored values, added left to right.
+
+    numpy's pairwise summation can differ from a plain running sum in the
+    last bit; stepping through the k-th stored value of every row at once
+    keeps the running-sum order while still working on whole columns.
+    """
+    lengths = np.diff(matrix.indptr)
+    totals = np.zeros(matrix.shape[0])
+    for k in range(int(lengths.max(initial=0))):
+        rows = np.flatnonzero(lengths > k)
+        totals[rows] += matrix.data[matrix.indptr[rows] + k]
+    return totals
+
+
+def distances_to_first(matrix: sparse.csr_matrix, metric: str = "euclidean") -> np.ndarray:
+    """Distance from row 0 to every other row.
+
+    "euclidean" subtracts row 0 from each row sparsely and sums the squared
+    differences, so no dense (rows x vocabulary) array is formed. "cosine"
+    is 1 - cosine similarity; two all-zero rows are at distance 0, an
+    all-zero row and a non-zero one at distance 1.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    reference, others = matrix[0], matrix[1:]
+    if metric == "euclidean":
+        ones = sparse.csr_matrix(np.ones((others.shape[0], 1)))
+        difference = (others - ones @ reference).tocsr()
+        difference.sort_indices()
+        return np.sqrt(_row_sums(difference.multiply(difference).tocsr()))
+
+    dots = np.asarray((others @ reference.T).todense()).ravel()
+    reference_norm = float(np.sqrt(_row_sums(reference.multiply(reference).tocsr())[0]))
+    norms = np.sqrt(_row_sums(others.multiply(others).tocsr()))
+    denominator = norms * reference_norm
+    similarity = np.divide(dots, denominator, out=np.zeros_like(dots), where=denominator > 0)
+    both_zero = (norms == 0) & (reference_norm == 0)
+    return np.where(both_zero, 0.0, np.clip(1.0 - similarity, 0.0, 2.0))
+
+
+def tfidf_distances(original: str, finals: Sequence[str], metric: str = "euclidean") -> List[float]:
+    """Distance from the original text to each final text, with TF-IDF fitted over all of them."""
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    matrix = tfidf_matrix([original, *finals])
+    if matrix.shape[1] == 0:
+        return [0.0 for _ in finals]
+    return distances_to_first(matrix, metric).tolist()
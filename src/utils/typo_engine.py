@@ -0,0 +1,250 @@
+"""Keyboard-aware typo engine with precomputed alias sampling tables."""
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Keyboard neighbor mapping (QWERTY layout)
+KEYBOARD_NEIGHBORS = {
+    'a': ['q', 's', 'z'], 'b': ['v', 'g', 'h', 'n'],
+    'c': ['x', 'd', 'f', 'v'], 'd': ['s', 'e', 'f', 'c', 'x'],
+    'e': ['w', 'r', 'd', 's'], 'f': ['d', 'r', 't', 'g', 'v', 'c'],
+    'g': ['f', 't', 'y', 'h', 'b', 'v'], 'h': ['g', 'y', 'u', 'j', 'n', 'b'],
+    'i': ['u', 'o', 'k', 'j'], 'j': ['h', 'u', 'i', 'k', 'n', 'm'],
+    'k': ['j', 'i', 'o', 'l', 'm'], 'l': ['k', 'o', 'p'],
+    'm': ['n', 'j', 'k'], 'n': ['b', 'h', 'j', 'm'],
+    'o': ['i', 'p', 'l', 'k'], 'p': ['o', 'l'],
+    'q': ['w', 'a'], 'r': ['e', 't', 'f', 'd'],
+    's': ['a', 'w', 'd', 'x', 'z'], 't': ['r', 'y', 'g', 'f'],
+    'u': ['y', 'i', 'j', 'h'], 'v': ['c', 'f', 'g', 'b'],
+    'w': ['q', 'e', 's', 'a'], 'x': ['z', 's', 'd', 'c'],
+    'y': ['t', 'u', 'h', 'g'], 'z': ['a', 's', 'x']
+}
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+OPERATIONS = ("substitute", "insert", "delete", "transpose")
+KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+
+# Weight of a neighbour on the same keyboard row relative to one on another row
+SAME_ROW_WEIGHT = 2.0
+
+_INSERT, _DELETE, _TRANSPOSE = (OPERATIONS.index(op) for op in ("insert", "delete", "transpose"))
+
+_INDEX = {ch: i for i, ch in enumerate(ALPHABET)}
+_ROW = {ch: r for r, row in enumerate(KEYBOARD_ROWS) for ch in row}
+
+
+class UniformSource(Protocol):
+    """Anything with a random() method: random.Random or numpy Generator."""
+
+    def random(self) -> float: ...
+
+
+def build_alias_table(weights: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Vose alias table: sample i with probability weights[i] / sum in O(1)."""
+    weights = np.asarray(weights, dtype=float)
+    n = len(weights)
+    if n == 0 or weights.sum() <= 0:
+        raise ValueError("weights must contain at least one positive value")
+
+    scaled = weights * n / weights.sum()
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s], alias[s] = scaled[s], l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob, alias
+
+
+class TypoEngine:
+    """Substitute/insert/delete/transpose typos with keyboard-weighted probabilities.
+
+    All tables are built once: per-letter neighbour codes with alias tables
+    (prob/alias arrays, one row per letter) and an alias table over the four
+    operations. Sampling an operation or a neighbour costs one uniform draw.
+    """
+
+    def __init__(
+        self,
+        neighbors: Optional[Dict[str, List[str]]] = None,
+        operation_weights: Sequence[float] = (0.4, 0.2, 0.2, 0.2)
+    ):
+        """Precompute neighbour and operation tables."""
+        neighbors = neighbors or KEYBOARD_NEIGHBORS
+        if len(operation_weights) != len(OPERATIONS):
+            raise ValueError(f"operation_weights needs {len(OPERATIONS)} values, got {len(operation_weights)}")
+
+        width = max(len(neighbors.get(ch, [])) for ch in ALPHABET)
+        self.neighbor_codes = np.zeros((len(ALPHABET), width), dtype=np.int64)
+        self.neighbor_counts = np.zeros(len(ALPHABET), dtype=np.int64)
+        self.neighbor_probs = np.zeros((len(ALPHABET), width))
+        self.neighbor_prob = np.ones((len(ALPHABET), width))
+        self.neighbor_alias = np.zeros((len(ALPHABET), width), dtype=np.int64)
+
+        for i, ch in enumerate(ALPHABET):
+            nbs = [nb for nb in neighbors.get(ch, []) if nb in _INDEX] or [ch]
+            weights = [SAME_ROW_WEIGHT if _ROW.get(nb) == _ROW.get(ch) else 1.0 for nb in nbs]
+            prob, alias = build_alias_table(weights)
+            k = len(nbs)
+            self.neighbor_codes[i, :k] = [_INDEX[nb] for nb in nbs]
+            self.neighbor_counts[i] = k
+            self.neighbor_probs[i, :k] = np.asarray(weights) / sum(weights)
+            self.neighbor_prob[i, :k] = prob
+            self.neighbor_alias[i, :k] = alias
+
+        self.operation_probs = np.asarray(operation_weights, dtype=float) / sum(operation_weights)
+        self.operation_prob, self.operation_alias = build_alias_table(operation_weights)
+
+        # Flat list copies for the scalar path: list indexing beats numpy scalar access
+        self._codes = self.neighbor_codes.tolist()
+        self._counts = self.neighbor_counts.tolist()
+        self._prob = self.neighbor_prob.tolist()
+        self._alias = self.neighbor_alias.tolist()
+        self._op_prob = self.operation_prob.tolist()
+        self._op_alias = self.operation_alias.tolist()
+
+        # Per character, lower and upper case: (count, prob, alias, replacement characters
+        # already in the character's case), so a scalar draw is one dict lookup plus list indexing
+        self._tables: Dict[str, Tuple[int, List[float], List[int], List[str]]] = {}
+        for i, ch in enumerate(ALPHABET):
+            k = self._counts[i]
+            replacements = [ALPHABET[code] for code in self._codes[i][:k]]
+            for case, chars in ((ch, replacements), (ch.upper(), [r.upper() for r in replacements])):
+                self._tables[case] = (k, self._prob[i][:k], self._alias[i][:k], chars)
+
+    def sample_neighbor(self, char: str, u: float) -> str:
+        """Keyboard neighbour of a letter from one uniform draw (alias method)."""
+        table = self._tables.get(char)
+        if table is None:
+            # Characters outside a-z/A-Z that lowercase into it, e.g. the Kelvin sign
+            i = _INDEX[char.lower()]
+            table = (self._counts[i], self._prob[i], self._alias[i],
+                     [ALPHABET[code].upper() if char.isupper() else ALPHABET[code] for code in self._codes[i]])
+        count, prob, alias, replacements = table
+        scaled = u * count
+        j = int(scaled)
+        if scaled - j >= prob[j]:
+            j = alias[j]
+        return replacements[j]
+
+    def sample_neighbor_codes(self, codes: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """Vectorized sample_neighbor over arrays of letter codes (0-25) and uniforms."""
+        scaled = u * self.neighbor_counts[codes]
+        j = scaled.astype(np.int64)
+        use_alias = scaled - j >= self.neighbor_prob[codes, j]
+        j = np.where(use_alias, self.neighbor_alias[codes, j], j)
+        return self.neighbor_codes[codes, j]
+
+    def sample_operation(self, u: float) -> str:
+        """Operation name from one uniform draw (alias method)."""
+        scaled = u * len(OPERATIONS)
+        j = int(scaled)
+        if scaled - j >= self._op_prob[j]:
+            j = self._op_alias[j]
+        return OPERATIONS[j]
+
+    def corrupt_word(self, word: str, rng: UniformSource) -> str:
+        """Apply one typo to the letters of a word.
+
+        Non-letter characters are never edited. Delete needs two letters and
+        transpose needs two different adjacent letters; when the sampled
+        operation does not apply, a substitution is made instead, so a word
+        with at least one letter always changes.
+        """
+        letters, pairs = _letter_layout(word)
+        if not letters:
+            return word
+
+        # sample_operation inlined, compared by index: this is the hot path of every run
+        random = rng.random
+        scaled = random() * 4
+        op = int(scaled)
+        if scaled - op >= self._op_prob[op]:
+            op = self._op_alias[op]
+        if op == _DELETE and len(letters) > 1:
+            pos = letters[int(random() * len(letters))]
+            return word[:pos] + word[pos + 1:]
+        if op == _TRANSPOSE and pairs:
+            pos = pairs[int(random() * len(pairs))]
+            return word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+        if op == _INSERT:
+            gap = int(random() * (len(letters) + 1))
+            anchor = letters[gap - 1] if gap > 0 else letters[0]
+            pos = letters[gap] if gap < len(letters) else letters[-1] + 1
+            return word[:pos] + self.sample_neighbor(word[anchor], random()) + word[pos:]
+
+        pos = letters[int(random() * len(letters))]
+        return word[:pos] + self.sample_neighbor(word[pos], random()) + word[pos + 1:]
+
+    def variant_distribution(self, word: str) -> Tuple[List[str], np.ndarray]:
+        """Every typo corrupt_word can produce for `word`, with its probability."""
+        letters, pairs = _letter_layout(word)
+        if not letters:
+            return [word], np.ones(1)
+
+        variants: List[str] = []
+        probs: List[float] = []
+
+        def add_substitutions(weight: float) -> None:
+            for pos in letters:
+                for code, p in self._neighbor_items(word[pos]):
+                    char = ALPHABET[code].upper() if word[pos].isupper() else ALPHABET[code]
+                    variants.append(word[:pos] + char + word[pos + 1:])
+                    probs.append(weight * p / len(letters))
+
+        op_probs = dict(zip(OPERATIONS, self.operation_probs.tolist()))
+        fallback = op_probs["substitute"]
+
+        if len(letters) > 1:
+            for pos in letters:
+                variants.append(word[:pos] + word[pos + 1:])
+                probs.append(op_probs["delete"] / len(letters))
+        else:
+            fallback += op_probs["delete"]
+
+        for pos in pairs:
+            variants.append(word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:])
+            probs.append(op_probs["transpose"] / len(pairs))
+        if not pairs:
+            fallback += op_probs["transpose"]
+
+        for gap in range(len(letters) + 1):
+            anchor = letters[gap - 1] if gap > 0 else letters[0]
+            pos = letters[gap] if gap < len(letters) else letters[-1] + 1
+            for code, p in self._neighbor_items(word[anchor]):
+                char = ALPHABET[code].upper() if word[anchor].isupper() else ALPHABET[code]
+                variants.append(word[:pos] + char + word[pos:])
+                probs.append(op_probs["insert"] * p / (len(letters) + 1))
+
+        add_substitutions(fallback)
+        return variants, np.asarray(probs)
+
+    def _neighbor_items(self, char: str) -> List[Tuple[int, float]]:
+        i = _INDEX[char.lower()]
+        k = self._counts[i]
+        return list(zip(self._codes[i][:k], self.neighbor_probs[i, :k].tolist()))
+
+
+@lru_cache(maxsize=65536)
+def _letter_layout(word: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Letter positions and transposable positions of a word (words repeat across runs)."""
+    letters = [i for i, ch in enumerate(word) if ch.lower() in _INDEX]
+    return tuple(letters), tuple(_transpose_positions(word, letters))
+
+
+def _transpose_positions(word: str, letters: Sequence[int]) -> List[int]:
+    """Positions i where letters i and i+1 are adjacent and differ."""
+    return [
+        i for i, j in zip(letters, letters[1:])
+        if j == i + 1 and word[i].lower() != word[j].lower()
+    ]
+
+
+# Shared engine with the default QWERTY tables
+DEFAULT_ENGINE = TypoEngine()
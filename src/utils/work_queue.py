@@ -0,0 +1,203 @@
+"""SQLite job table for running experiment cells on any number of workers."""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+STATUSES = ("pending", "leased", "done", "failed")
+QUEUE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, position);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def is_queue(path: PathLike) -> bool:
+    """Whether a path names a queue file rather than a results file."""
+    return Path(path).suffix.lower() in QUEUE_SUFFIXES
+
+
+class WorkQueue:
+    """Experiment cells that workers claim under a lease, heartbeat, and complete.
+
+    A claim leases cells for `lease_seconds`. Workers extend the lease with
+    heartbeat() while they work. A cell whose lease expires (its worker died
+    or hung) can be claimed again. A cell that fails or expires
+    `max_attempts` times is marked failed. Every state change is one
+    IMMEDIATE transaction, so two workers never claim the same cell. The
+    file uses SQLite's default rollback journal rather than WAL, since WAL
+    needs shared memory and does not work across hosts. Sharing over a
+    network filesystem relies on that filesystem's locking.
+    """
+
+    def __init__(self, path: PathLike, lease_seconds: float = 300.0, max_attempts: int = 3, timeout: float = 60.0):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE takes the write lock up front, so a read-then-update cannot race."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def set_meta(self, name: str, value: Any) -> None:
+        """Store a JSON value shared by all workers (the experiment config, the scorer)."""
+        self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, json.dumps(value)))
+
+    def get_meta(self, name: str, default: Any = None) -> Any:
+        row = self._db.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def enqueue(self, jobs: Iterable[Tuple[str, Dict[str, Any]]], done: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """Add (key, payload) jobs in order; returns how many were new.
+
+        Keys already in the table are left alone, so enqueueing the same
+        grid twice is harmless. `done` maps keys to results that need no
+        work; those jobs are inserted as done.
+        """
+        done = done or {}
+        now = time.time()
+        with self._transaction() as db:
+            start = db.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM jobs").fetchone()[0]
+            added = 0
+            for offset, (key, payload) in enumerate(jobs):
+                result = done.get(key)
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO jobs (key, position, payload, status, result, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, start + offset, json.dumps(payload), "done" if result is not None else "pending",
+                     json.dumps(result) if result is not None else None, now),
+                )
+                added += cursor.rowcount
+        return added
+
+    def claim(self, worker: str, limit: int = 1) -> List[Tuple[str, Dict[str, Any]]]:
+        """Lease up to `limit` pending or lease-expired jobs, in grid order."""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'lease expired', worker = NULL, updated = ? "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            rows = db.execute(
+                "SELECT key, payload FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY position LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE jobs SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, updated = ? "
+                "WHERE key = ?",
+                [(worker, now + self.lease_seconds, now, key) for key, _ in rows],
+            )
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def heartbeat(self, worker: str, keys: Iterable[str]) -> int:
+        """Extend this worker's leases on `keys`; returns how many it still holds."""
+        now = time.time()
+        with self._transaction() as db:
+            return db.executemany(
+                "UPDATE jobs SET lease_until = ?, updated = ? WHERE key = ? AND worker = ? AND status = 'leased'",
+                [(now + self.lease_seconds, now, key, worker) for key in keys],
+            ).rowcount
+
+    def complete(self, worker: str, key: str, result: Dict[str, Any]) -> bool:
+        """Store a job's result; False if the worker no longer holds its lease."""
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated = ? "
+                "WHERE key = ? AND worker = ? AND status = 'leased'",
+                (json.dumps(result), time.time(), key, worker),
+            ).rowcount == 1
+
+    def fail(self, worker: str, key: str, error: str) -> None:
+        """Release a job after an error: pending again, or failed after max_attempts."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, worker = NULL, lease_until = NULL, updated = ? "
+                "WHERE key = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, error, time.time(), key, worker),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """Jobs per status."""
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return counts
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Results of done jobs, in grid order."""
+        rows = self._db.execute("SELECT result FROM jobs WHERE status = 'done' ORDER BY position").fetchall()
+        return [json.loads(result) for result, in rows]
+
+    def failures(self) -> List[Tuple[str, str]]:
+        """(key, last error) of failed jobs."""
+        return self._db.execute("SELECT key, error FROM jobs WHERE status = 'failed' ORDER BY position").fetchall()
+
+
+class Heartbeat:
+    """Background thread that keeps extending a worker's leases on `keys` until the block exits.
+
+    It opens its own connection, since an SQLite connection belongs to the
+    thread that made it. `lost` counts leases that had already been taken
+    over at the last beat.
+    """
+
+    def __init__(self, path: PathLike, worker: str, lease_seconds: float, interval: Optional[float] = None):
+        self.path = path
+        self.worker = worker
+        self.lease_seconds = lease_seconds
+        self.interval = interval if interval is not None else lease_seconds / 3
+        self.keys: List[str] = []
+        self.lost = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        queue = WorkQueue(self.path, self.lease_seconds)
+        try:
+            while not self._stop.wait(self.interval):
+                keys = list(self.keys)
+                if keys:
+                    self.lost = len(keys) - queue.heartbeat(self.worker, keys)
+        finally:
+            queue.close()
@@ -49,3 +49,35 @@ def mock_translator_responses():
         "fr_to_he": "שלום עולם",
         "he_to_en": "Hello world"
     }
+
+
+class FakeSentenceModel:
+    """Deterministic stand-in for SentenceTransformer (no model download)."""
+
+    def __init__(self, *args, **kwargs):
+        self.device = kwargs.get("device")
+        self.encode_calls = []
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.encode_calls.append(batch)
+        rows = np.array([[len(t), t.count("a"), t.count("e"), 1.0] for t in batch], dtype=np.float32)
+        return rows[0] if single else rows
+
+
+@pytest.fixture
+def fake_sentence_model():
+    """Fresh FakeSentenceModel instance."""
+    return FakeSentenceModel()
+
+
+@pytest.fixture
+def fake_calculator(monkeypatch):
+    """SimilarityCalculator backed by FakeSentenceModel."""
+    from src.embeddings import similarity
+    monkeypatch.setattr(similarity, "SentenceTransformer", FakeSentenceModel)
+    return similarity.SimilarityCalculator.from_config({"device": "cpu", "batch_size": 8})
@@ -61,4 +61,41 @@ class TestTranslationChain:
         
         assert result['original'] == text
         assert result['final'] != ""
-        assert len(result['stages']) == 3
\ No newline at end of file
+        assert len(result['stages']) == 3
+
+class TestChainConfiguration:
+    """Test per-stage settings and resuming from computed stages (no Ollama calls)."""
+    
+    def test_from_config_stage_overrides(self):
+        """Test stage entries override the shared model and temperature."""
+        chain = TranslationChain.from_config({
+            "model": "base", "temperature": 0.3, "stages": [{}, {"temperature": 0.0}, {"model": "big"}]
+        })
+        assert [agent.model for agent in chain.agents] == ["base", "base", "big"]
+        assert [agent.temperature for agent in chain.agents] == [0.3, 0.0, 0.3]
+        assert chain.stage_specs()[2]["model"] == "big"
+        assert "system_prompt" in chain.stage_specs()[0]
+    
+    def test_invalid_stage_overrides(self):
+        """Test unknown settings and too many stages are rejected."""
+        with pytest.raises(ValueError):
+            TranslationChain(stages=[{"modle": "x"}])
+        with pytest.raises(ValueError):
+            TranslationChain(stages=[{}, {}, {}, {}])
+    
+    def test_run_resumes_after_done_stages(self, monkeypatch):
+        """Test only the stages after the given outputs are translated."""
+        calls = []
+        
+        def fake_translate(agent, text):
+            calls.append(agent.__class__.__name__)
+            return {"input": text, "output": f"{text}>{agent.get_target_language()}"}
+        
+        chain = TranslationChain()
+        for agent in chain.agents:
+            monkeypatch.setattr(agent, "translate", fake_translate.__get__(agent))
+        result = chain.run("hi", done=["salut", "shalom"])
+        
+        assert calls == ["HebrewToEnglishAgent"]
+        assert result["final"] == "shalom>en"
+        assert [stage.get("reused", False) for stage in result["stages"]] == [True, True, False]
@@ -0,0 +1,110 @@
+"""Tests for the IVF nearest-neighbour index."""
+import numpy as np
+import pytest
+from src.embeddings.ann_index import IVFIndex, index_records
+from src.embeddings.pairwise import top_k_neighbors
+
+
+@pytest.fixture
+def clustered():
+    """Vectors drawn around a handful of well-separated centres."""
+    rng = np.random.default_rng(1)
+    centres = rng.normal(size=(8, 16))
+    labels = rng.integers(0, 8, size=600)
+    vectors = centres[labels] + 0.05 * rng.normal(size=(600, 16))
+    return vectors.astype(np.float32)
+
+
+def metadata(n, offset=0):
+    return [{"id": offset + i} for i in range(n)]
+
+
+class TestIVFIndex:
+    """Test training, insertion and search."""
+
+    def test_recall_against_brute_force(self, clustered):
+        """Test probed search finds the exact nearest neighbours."""
+        index = IVFIndex(16, n_lists=16, n_probe=4)
+        index.add(clustered, metadata(len(clustered)))
+        queries = clustered[:20] + 0.01
+        exact, _ = top_k_neighbors(queries, clustered, k=5)
+        found = index.search(queries, k=5)
+        recall = np.mean([len({i for i, _ in row} & set(ex)) / 5 for row, ex in zip(found, exact)])
+        assert recall >= 0.9
+
+    def test_distances_sorted(self, clustered):
+        """Test results come back nearest first."""
+        index = IVFIndex(16, n_lists=8)
+        index.add(clustered, metadata(len(clustered)))
+        distances = [d for _, d in index.search(clustered[:1], k=10)[0]]
+        assert distances == sorted(distances)
+        assert distances[0] == pytest.approx(0.0, abs=1e-5)
+
+    def test_incremental_insert(self, clustered):
+        """Test vectors added after training are searchable."""
+        index = IVFIndex(16, n_lists=8)
+        index.add(clustered[:300], metadata(300))
+        index.add(clustered[300:], metadata(300, offset=300))
+        assert len(index) == 600
+        top_id, _ = index.search(clustered[450:451], k=1, n_probe=8)[0][0]
+        assert index.metadata[top_id]["id"] == 450
+
+    def test_save_load_roundtrip(self, clustered, tmp_path):
+        """Test a saved index answers queries identically."""
+        index = IVFIndex(16, n_lists=8)
+        index.add(clustered, metadata(len(clustered)))
+        index.save(tmp_path / "idx")
+        loaded = IVFIndex.load(tmp_path / "idx")
+        assert loaded.metadata == index.metadata
+        assert loaded.search(clustered[:3], k=3) == index.search(clustered[:3], k=3)
+
+    def test_empty_index(self):
+        """Test searching an empty index returns no hits."""
+        assert IVFIndex(4).search(np.ones((2, 4)), k=3) == [[], []]
+
+
+class TestIndexRecords:
+    """Test indexing result records."""
+
+    def test_skips_already_indexed(self, fake_calculator):
+        """Test re-indexing the same records adds nothing."""
+        records = [
+            {"original": "o", "error_rate": 0.1, "run": r, "final": f"final text {'a' * r}"}
+            for r in range(5)
+        ]
+        index = IVFIndex(4, n_lists=2)
+        assert index_records(index, fake_calculator, records) == 5
+        assert index_records(index, fake_calculator, records) == 0
+        assert len(index) == 5
+
+
+class TestListCount:
+    """Test the trained list count against the configured cap."""
+
+    def test_grows_with_inserts(self, clustered):
+        """Test an index trained on a small batch retrains as inserts outgrow its lists."""
+        index = IVFIndex(16, n_lists=16)
+        index.add(clustered[:9], metadata(9))
+        assert index.n_lists == 3
+        index.add(clustered[9:], metadata(591, offset=9))
+        assert index.n_lists == 16 and index.max_lists == 16
+        assert not index.needs_retrain
+
+    def test_retrain_respects_cap(self, clustered):
+        """Test retrain never exceeds max_lists, and a lowered cap is applied."""
+        index = IVFIndex(16, n_lists=8)
+        index.add(clustered, metadata(len(clustered)))
+        index.retrain()
+        assert index.n_lists == 8
+        index.max_lists = 4
+        assert index.needs_retrain
+        index.retrain()
+        assert index.n_lists == 4
+
+    def test_cap_saved(self, clustered, tmp_path):
+        """Test the cap and the trained count both survive save/load."""
+        index = IVFIndex(16, n_lists=64)
+        index.add(clustered[:100], metadata(100))
+        index.save(tmp_path / "idx")
+        loaded = IVFIndex.load(tmp_path / "idx")
+        assert (loaded.n_lists, loaded.max_lists) == (10, 64)
@@ -0,0 +1,79 @@
+"""Tests for vectorized bootstrap confidence intervals."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.bootstrap import bootstrap_means, bootstrap_report, percentile_interval
+
+
+def make_frame(n=600, slope=0.8, noise=0.05, seed=0):
+    """Distances rising linearly with error rate, for two sentences."""
+    rng = np.random.default_rng(seed)
+    rates = rng.choice([0.0, 0.1, 0.2, 0.3], n)
+    return pd.DataFrame({
+        "error_rate": rates,
+        "sentence_id": rng.integers(0, 2, n),
+        "distance": slope * rates + rng.normal(0, noise, n),
+    })
+
+
+class TestBootstrapMeans:
+    """Test resampled group means."""
+
+    def test_shape_and_bounds(self):
+        """Test one row of replicates per group, each within the group's range."""
+        codes = np.array([0, 0, 0, 1, 1, 2])
+        values = np.array([1.0, 2.0, 3.0, 10.0, 20.0, 5.0])
+        replicates = bootstrap_means(codes, values, n_resamples=500, seed=1)
+        assert replicates.shape == (3, 500)
+        assert replicates[0].min() >= 1.0 and replicates[0].max() <= 3.0
+        assert set(np.unique(replicates[1])) <= {10.0, 15.0, 20.0}
+        np.testing.assert_array_equal(replicates[2], 5.0)
+
+    def test_seeded_and_block_independent(self):
+        """Test the same seed gives the same replicates however the draws are blocked."""
+        rng = np.random.default_rng(3)
+        codes, values = rng.integers(0, 4, 200), rng.random(200)
+        whole = bootstrap_means(codes, values, n_resamples=300, seed=7)
+        np.testing.assert_array_equal(whole, bootstrap_means(codes, values, n_resamples=300, seed=7))
+        assert not np.array_equal(whole, bootstrap_means(codes, values, n_resamples=300, seed=8))
+        assert bootstrap_means(codes, values, n_resamples=300, seed=7, block_elements=64).shape == whole.shape
+
+    def test_standard_error(self):
+        """Test the replicate spread matches the standard error of the mean."""
+        values = np.random.default_rng(5).normal(0, 1, 400)
+        replicates = bootstrap_means(np.zeros(400, dtype=int), values, n_resamples=4000, seed=0)
+        assert replicates.std() == pytest.approx(values.std() / np.sqrt(400), rel=0.1)
+
+    def test_invalid_arguments(self):
+        """Test a zero resample count and an out-of-range confidence are rejected."""
+        with pytest.raises(ValueError):
+            bootstrap_means(np.zeros(3, dtype=int), np.ones(3), n_resamples=0)
+        with pytest.raises(ValueError):
+            percentile_interval(np.ones((2, 10)), confidence=1.0)
+
+
+class TestBootstrapReport:
+    """Test group and slope intervals."""
+
+    def test_group_intervals_cover_means(self):
+        """Test every group's interval contains its mean and counts add up."""
+        report = bootstrap_report(make_frame(), n_resamples=2000, seed=0)
+        groups = report["groups"]
+        assert len(groups) == 8
+        assert groups["count"].sum() == 600
+        assert ((groups["ci_low"] <= groups["mean"]) & (groups["mean"] <= groups["ci_high"])).all()
+
+    def test_slope_matches_least_squares(self):
+        """Test the point slope is the pooled least-squares slope and its interval brackets it."""
+        df = make_frame()
+        report = bootstrap_report(df, n_resamples=2000, seed=0)
+        slope = report["slope"]
+        assert slope["slope"] == pytest.approx(np.polyfit(df["error_rate"], df["distance"], 1)[0])
+        assert slope["ci_low"] < slope["slope"] < slope["ci_high"]
+        assert slope["ci_low"] < 0.8 < slope["ci_high"]
+        assert report["sentence_slopes"]["sentence_id"].tolist() == [0, 1]
+
+    def test_single_rate_has_no_slope(self):
+        """Test the slope is undefined when all rows share one error rate."""
+        df = pd.DataFrame({"error_rate": [0.1] * 4, "sentence_id": [0, 0, 1, 1], "distance": [0.1, 0.2, 0.3, 0.4]})
+        assert np.isnan(bootstrap_report(df, n_resamples=100)["slope"]["slope"])
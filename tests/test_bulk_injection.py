@@ -0,0 +1,64 @@
+"""Tests for bulk error injection."""
+import random
+import pytest
+from src.utils.bulk_injection import bulk_inject_errors
+from src.utils.typo_engine import DEFAULT_ENGINE
+
+SENTENCES = [
+    "the quick brown fox jumps over the lazy dog",
+    "machine learning algorithms process large amounts of data",
+]
+
+
+class TestBulkInjection:
+    """Test the sentences x rates x seeds corruption engine."""
+
+    def test_shape(self):
+        """Test variants are indexed [sentence][rate][seed]."""
+        result = bulk_inject_errors(SENTENCES, [0.0, 0.2, 0.5], range(7))
+        assert len(result) == 2
+        assert all(len(by_rate) == 3 for by_rate in result)
+        assert all(len(by_seed) == 7 for by_rate in result for by_seed in by_rate)
+
+    def test_zero_rate_is_identity(self):
+        """Test a zero error rate returns the sentence unchanged."""
+        result = bulk_inject_errors(SENTENCES, [0.0], range(3))
+        assert result[0][0] == [SENTENCES[0]] * 3
+
+    def test_reproducible(self):
+        """Test identical inputs give identical variants."""
+        assert bulk_inject_errors(SENTENCES, [0.3], [1, 2]) == bulk_inject_errors(SENTENCES, [0.3], [1, 2])
+
+    def test_cells_independent_of_grid(self):
+        """Test a cell's variant does not depend on the other rates or seeds requested."""
+        full = bulk_inject_errors(SENTENCES, [0.1, 0.3, 0.5], [5, 6, 7])
+        single = bulk_inject_errors(SENTENCES, [0.3], [6])
+        assert single[1][0][0] == full[1][1][1]
+
+    def test_independent_of_workers(self):
+        """Test results are identical for any number of workers."""
+        sentences = SENTENCES * 3
+        assert bulk_inject_errors(sentences, [0.4], range(20), workers=2) == \
+            bulk_inject_errors(sentences, [0.4], range(20))
+
+    def test_typos_come_from_engine(self):
+        """Test each corrupted word is one of the engine's single-typo variants."""
+        original = SENTENCES[1].split()
+        for variant in bulk_inject_errors([SENTENCES[1]], [0.5], range(50))[0][0]:
+            changed = [(a, b) for a, b in zip(original, variant.split()) if a != b]
+            assert 0 < len(changed) <= int(len(original) * 0.5)
+            for a, b in changed:
+                assert b in DEFAULT_ENGINE.variant_distribution(a)[0]
+
+    def test_global_random_state_untouched(self):
+        """Test the global RNG is not reseeded."""
+        random.seed(123)
+        expected = random.random()
+        random.seed(123)
+        bulk_inject_errors(SENTENCES, [0.5], range(5))
+        assert random.random() == expected
+
+    def test_invalid_rate(self):
+        """Test out-of-range error rates are rejected."""
+        with pytest.raises(ValueError):
+            bulk_inject_errors(SENTENCES, [1.5], [0])
@@ -1,5 +1,6 @@
 """Tests for CLI interface."""
 import json
+import re
 import pytest
 from pathlib import Path
 from typer.testing import CliRunner
@@ -57,3 +58,346 @@ class TestCLICommands:
         result = runner.invoke(app, ["analyze", str(results_file)])
         # Should not crash
         assert True
+
+    def test_analyze_command_npz(self, tmp_path):
+        """Test analyze reads a columnar results archive."""
+        from src.utils.results_io import write_results
+
+        results_file = tmp_path / "results.npz"
+        write_results([
+            {"sentence_id": 0, "original": "test", "error_rate": rate, "run": 0, "final": "test", "distance": rate}
+            for rate in (0.0, 0.25, 0.5)
+        ], results_file)
+        graph = tmp_path / "graph.png"
+
+        result = runner.invoke(app, ["analyze", str(results_file), "--output", str(graph)])
+        assert result.exit_code == 0
+        assert graph.exists()
+
+    def test_analyze_command_streaming(self, tmp_path):
+        """Test analyze --streaming aggregates a JSONL file chunk by chunk."""
+        from src.utils.results_io import write_results
+
+        results_file = tmp_path / "results.jsonl"
+        write_results([
+            {"sentence_id": sid, "error_rate": rate, "run": run, "distance": rate + run}
+            for sid in (0, 1) for rate in (0.0, 0.5) for run in range(3)
+        ], results_file)
+        graph = tmp_path / "graph.png"
+
+        result = runner.invoke(app, ["analyze", str(results_file), "--output", str(graph),
+                                     "--streaming", "--chunk-size", "5"])
+        assert result.exit_code == 0
+        assert "Streamed 12 rows into 4 groups" in result.stdout
+        assert graph.exists()
+
+    def test_analyze_command_streaming_empty(self, tmp_path):
+        """Test analyze --streaming accepts an archive written from zero rows."""
+        from src.utils.results_io import write_results
+
+        results_file = tmp_path / "results.npz"
+        write_results([], results_file)
+        graph = tmp_path / "graph.png"
+
+        result = runner.invoke(app, ["analyze", str(results_file), "--output", str(graph), "--streaming"])
+        assert result.exit_code == 0
+        assert "Streamed 0 rows into 0 groups" in result.stdout
+
+    def test_analyze_command_bootstrap(self, tmp_path):
+        """Test analyze --bootstrap prints slope intervals and draws the graph."""
+        results_file = tmp_path / "results.json"
+        results_file.write_text(json.dumps([
+            {"sentence_id": sid, "error_rate": rate, "run": run, "distance": rate + 0.01 * run}
+            for sid in (0, 1) for rate in (0.0, 0.25, 0.5) for run in range(3)
+        ]))
+        graph = tmp_path / "graph.png"
+
+        result = runner.invoke(app, ["analyze", str(results_file), "--output", str(graph),
+                                     "--bootstrap", "500", "--seed", "1"])
+        assert result.exit_code == 0
+        assert "Slope:" in result.stdout
+        assert "Sentence 2:" in result.stdout
+        assert graph.exists()
+        result = runner.invoke(app, ["analyze", str(results_file), "--bootstrap", "500", "--streaming"])
+        assert result.exit_code == 1
+
+    def test_status_and_analyze_from_summary(self, tmp_path):
+        """Test status and analyze --summary read only the summary file."""
+        from src.analysis.summary_cube import SummaryCube, summary_path
+
+        cube = SummaryCube(total_cells=8)
+        cube.add_rows([
+            {"sentence_id": sid, "error_rate": rate, "distance": rate + 0.1 * sid}
+            for sid in (0, 1) for rate in (0.0, 0.5)
+        ], "m")
+        results_file = tmp_path / "experiment.json"
+        cube.save(summary_path(results_file))
+        graph = tmp_path / "graph.png"
+
+        result = runner.invoke(app, ["status", str(summary_path(results_file))])
+        assert result.exit_code == 0
+        assert "4/8" in result.stdout
+        assert "50.0%" in result.stdout
+        result = runner.invoke(app, ["analyze", str(results_file), "--summary", "--output", str(graph)])
+        assert result.exit_code == 0
+        assert graph.exists()
+
+    def test_status_missing_file(self, tmp_path):
+        """Test status exits with an error when there is no summary."""
+        result = runner.invoke(app, ["status", str(tmp_path / "missing.summary.json")])
+        assert result.exit_code == 1
+
+    def test_corrupt_command(self, tmp_path):
+        """Test corrupt streams a text corpus to JSONL."""
+        corpus = tmp_path / "corpus.txt"
+        corpus.write_text("one two three four five\nsix seven eight nine ten\n")
+        output = tmp_path / "out.jsonl"
+        result = runner.invoke(app, [
+            "corrupt", str(corpus), "--output", str(output), "--error-rate", "0.4", "--workers", "2"
+        ])
+        assert result.exit_code == 0
+        assert len(output.read_text().splitlines()) == 2
+    
+    def test_variance_command_simulated(self, tmp_path):
+        """Test variance simulates both corruption modes from the config."""
+        output = tmp_path / "variance.json"
+        result = runner.invoke(app, ["variance", "--num-runs", "5", "--output", str(output)])
+        assert result.exit_code == 0
+        report = json.loads(output.read_text())
+        assert report["nested"]["num_runs"] == 5
+        assert report["step"]["variance_ratio"] < 1.0
+    
+    def test_variance_command_result_files(self, tmp_path):
+        """Test variance reads NPZ and JSONL result files."""
+        from src.utils.results_io import write_results
+
+        files = {"independent": tmp_path / "independent.npz", "nested": tmp_path / "nested.jsonl"}
+        for spread, path in zip((0.1, 0.01), files.values()):
+            write_results([
+                {"sentence_id": 0, "original": "test", "error_rate": rate, "run": run, "final": "test",
+                 "distance": rate + spread * run * (1 if rate else -1)}
+                for rate in (0.0, 0.5) for run in range(4)
+            ], path)
+        output = tmp_path / "variance.json"
+        result = runner.invoke(app, [
+            "variance", "--independent", str(files["independent"]), "--nested", str(files["nested"]),
+            "--output", str(output)
+        ])
+        assert result.exit_code == 0
+        report = json.loads(output.read_text())
+        assert report["source"] == "experiment results"
+        assert report["independent"]["num_runs"] == 4
+        assert report["slope"]["variance_ratio"] < 1.0
+
+
+class TestScoring:
+    """Test batched scoring of experiment cells."""
+
+    def test_score_pending_with_stage_drift(self, fake_calculator):
+        """Test final distance and per-stage drift are added to each row."""
+        from src.cli import _score_pending
+        from src.embeddings.drift import StageDriftScorer
+
+        pending = [{
+            "original": "alpha beta",
+            "corrupted": "alpja beta",
+            "final": "alpha bet",
+            "stage_outputs": ["alpha fr", "alpha he", "alpha bet"],
+        }]
+        rows = _score_pending(fake_calculator, pending, StageDriftScorer(fake_calculator))
+        assert rows[0]["distance"] >= 0.0
+        assert len(rows[0]["hop_distances"]) == 3
+        assert len(rows[0]["stage_distances"]) == 3
+
+    def test_score_pending_with_hashing_scorer(self):
+        """Test the model-free scorer fills distances through the same batch call."""
+        from src.cli import _make_scorer, _score_pending
+
+        scorer = _make_scorer({"hashing": {"n_features": 1024}}, "hashing")
+        pending = [
+            {"original": "alpha beta gamma", "final": "alpha beta gamma"},
+            {"original": "alpha beta gamma", "final": "delta epsilon"},
+        ]
+        rows = _score_pending(scorer, pending)
+        assert rows[0]["distance"] == pytest.approx(0.0, abs=1e-12)
+        assert rows[1]["distance"] == pytest.approx(1.0)
+
+
+class TestIncrementalExperiment:
+    """Test experiment re-runs and sharded runs, with translation faked."""
+
+    @pytest.fixture
+    def translations(self, monkeypatch):
+        """Record each stage translation instead of calling Ollama."""
+        import sys
+        # The CLI imports the agents package from src/, not as src.agents
+        base_agent = sys.modules["agents.base_agent"].BaseAgent
+        calls = []
+
+        def fake_translate(agent, text):
+            calls.append((agent.__class__.__name__, agent.model))
+            return {"input": text, "output": f"{text} [{agent.get_target_language()}:{agent.model}]"}
+
+        monkeypatch.setattr(base_agent, "translate", fake_translate)
+        return calls
+
+    def write_config(self, path, sentences, stages=None):
+        """Small experiment config using the model-free scorer."""
+        import yaml
+        path.write_text(yaml.safe_dump({
+            "ollama": {"model": "small", "temperature": 0.3, "stages": stages or []},
+            "experiment": {"error_rates": [0.0, 0.5], "num_runs": 1, "seed": 42},
+            "test_sentences": sentences,
+            "hashing": {"n_features": 1024},
+        }))
+
+    def run(self, config, output):
+        """Run experiment with the hashing scorer and return its result."""
+        return runner.invoke(app, ["experiment", "--config-path", str(config), "--output", str(output),
+                                   "--scorer", "hashing"])
+
+    def test_rerun_translates_only_changed_stages(self, tmp_path, translations):
+        """Test unchanged cells are reused, a stage-3 change reruns stage 3, a new sentence runs fully."""
+        config, output = tmp_path / "config.yaml", tmp_path / "results.json"
+        sentences = ["one two three four", "five six seven eight"]
+        self.write_config(config, sentences)
+        assert self.run(config, output).exit_code == 0
+        assert len(translations) == 12
+
+        translations.clear()
+        result = self.run(config, output)
+        assert result.exit_code == 0
+        assert translations == []
+        assert "Reused 12/12 stage translations" in result.stdout
+
+        translations.clear()
+        self.write_config(config, sentences, stages=[{}, {}, {"model": "big"}])
+        assert self.run(config, output).exit_code == 0
+        assert translations == [("HebrewToEnglishAgent", "big")] * 4
+        rows = json.loads(output.read_text())
+        assert all(row["final"].endswith("[en:big]") for row in rows)
+        assert all(len(row["stage_fingerprints"]) == 3 for row in rows)
+
+        translations.clear()
+        self.write_config(config, [*sentences, "nine ten eleven twelve"], stages=[{}, {}, {"model": "big"}])
+        assert self.run(config, output).exit_code == 0
+        assert len(translations) == 6
+
+    def test_force_recomputes_everything(self, tmp_path, translations):
+        """Test --force ignores the existing output."""
+        config, output = tmp_path / "config.yaml", tmp_path / "results.npz"
+        self.write_config(config, ["one two three four"])
+        assert self.run(config, output).exit_code == 0
+        translations.clear()
+        assert self.run(config, output).exit_code == 0
+        assert translations == []
+        result = runner.invoke(app, ["experiment", "--config-path", str(config), "--output", str(output),
+                                     "--scorer", "hashing", "--force"])
+        assert result.exit_code == 0
+        assert len(translations) == 6
+
+    def test_shards_merge_into_full_run(self, tmp_path, translations):
+        """Test shard outputs cover the grid once and merge into the single-machine result."""
+        config = tmp_path / "config.yaml"
+        self.write_config(config, ["one two three four", "five six seven eight", "nine ten eleven twelve"])
+        full = tmp_path / "full.json"
+        assert self.run(config, full).exit_code == 0
+
+        shard_files = [tmp_path / f"shard{index}.jsonl" for index in (1, 2, 3)]
+        sizes = []
+        for index, path in enumerate(shard_files, 1):
+            result = runner.invoke(app, ["experiment", "--config-path", str(config), "--output", str(path),
+                                         "--scorer", "hashing", "--shard", f"{index}/3"])
+            assert result.exit_code == 0
+            sizes.append(int(re.search(r"(\d+) of 6 cells", result.stdout).group(1)))
+        assert sum(sizes) == 6
+
+        merged = tmp_path / "merged.json"
+        result = runner.invoke(app, ["merge", *map(str, reversed(shard_files)), "--output", str(merged),
+                                     "--config-path", str(config)])
+        assert result.exit_code == 0
+        keys = ["sentence_id", "error_rate", "run", "final"]
+        full_rows, merged_rows = json.loads(full.read_text()), json.loads(merged.read_text())
+        assert [[r[k] for k in keys] for r in merged_rows] == [[r[k] for k in keys] for r in full_rows]
+        assert (tmp_path / "merged.summary.json").exists()
+
+        dropped = max(index for index, size in enumerate(sizes) if size)
+        kept = [path for index, path in enumerate(shard_files) if index != dropped]
+        result = runner.invoke(app, ["merge", *map(str, kept), "--output", str(merged),
+                                     "--config-path", str(config)])
+        assert result.exit_code == 1
+        assert f"{sizes[dropped]} of 6 cells are missing" in result.stdout
+        result = runner.invoke(app, ["merge", str(shard_files[0]), str(shard_files[0]), *map(str, shard_files[1:]),
+                                     "--output", str(merged), "--config-path", str(config)])
+        assert result.exit_code == 1
+        assert "more than one row" in result.stdout
+
+    def test_queue_workers_and_merge(self, tmp_path, translations):
+        """Test cells queued by experiment are drained by a worker and merge into the full result."""
+        config = tmp_path / "config.yaml"
+        self.write_config(config, ["one two three four", "five six seven eight"])
+        full, queue = tmp_path / "full.json", tmp_path / "queue.sqlite"
+        assert self.run(config, full).exit_code == 0
+
+        translations.clear()
+        result = runner.invoke(app, ["experiment", "--config-path", str(config), "--scorer", "hashing",
+                                     "--output", str(tmp_path / "unused.json"), "--queue", str(queue)])
+        assert result.exit_code == 0
+        assert "Queued 4 new cells" in result.stdout
+        assert translations == []
+
+        result = runner.invoke(app, ["worker", str(queue), "--worker-id", "w1", "--batch", "3"])
+        assert result.exit_code == 0
+        assert "w1 completed 4 cells" in result.stdout
+        assert len(translations) == 12
+        assert "Cells done: 4/4" in runner.invoke(app, ["status", str(queue)]).stdout
+
+        merged = tmp_path / "merged.json"
+        result = runner.invoke(app, ["merge", str(queue), "--output", str(merged), "--config-path", str(config)])
+        assert result.exit_code == 0
+        keys = ["sentence_id", "error_rate", "run", "final"]
+        full_rows, merged_rows = json.loads(full.read_text()), json.loads(merged.read_text())
+        assert [[r[k] for k in keys] for r in merged_rows] == [[r[k] for k in keys] for r in full_rows]
+
+    def test_worker_drops_claim_after_losing_leases(self, tmp_path, translations, monkeypatch):
+        """Test a worker whose leases were taken over mid-claim stops translating that claim."""
+        import sqlite3
+        import sys
+        import time
+        config, queue = tmp_path / "config.yaml", tmp_path / "queue.sqlite"
+        self.write_config(config, ["one two three four"])
+        runner.invoke(app, ["experiment", "--config-path", str(config), "--scorer", "hashing",
+                            "--output", str(tmp_path / "unused.json"), "--queue", str(queue)])
+        base_agent = sys.modules["agents.base_agent"].BaseAgent
+        fake_translate = base_agent.translate
+
+        def stolen_once(agent, text):
+            if not translations:
+                with sqlite3.connect(queue) as db:
+                    db.execute("UPDATE jobs SET worker = 'other' WHERE status = 'leased'")
+                time.sleep(0.6)
+            return fake_translate(agent, text)
+
+        monkeypatch.setattr(base_agent, "translate", stolen_once)
+        result = runner.invoke(app, ["worker", str(queue), "--worker-id", "w1", "--batch", "2",
+                                     "--lease", "1", "--poll", "0.1"])
+        assert result.exit_code == 0
+        assert "taken over" in result.stdout
+        assert "w1 completed 2 cells" in result.stdout
+        assert len(translations) == 9
+
+    def test_worker_stops_when_backend_fails(self, tmp_path, translations, monkeypatch):
+        """Test a worker whose every translation fails stops and leaves the cells for others."""
+        import sys
+        config, queue = tmp_path / "config.yaml", tmp_path / "queue.sqlite"
+        self.write_config(config, ["one two three four"])
+        runner.invoke(app, ["experiment", "--config-path", str(config), "--scorer", "hashing",
+                            "--output", str(tmp_path / "unused.json"), "--queue", str(queue)])
+
+        def unreachable(agent, text):
+            raise RuntimeError("Failed to connect to Ollama")
+
+        monkeypatch.setattr(sys.modules["agents.base_agent"].BaseAgent, "translate", unreachable)
+        result = runner.invoke(app, ["worker", str(queue), "--base-url", "http://down:11434"])
+        assert result.exit_code == 1
+        assert "pending: 2" in runner.invoke(app, ["status", str(queue)]).stdout
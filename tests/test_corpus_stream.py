@@ -0,0 +1,81 @@
+"""Tests for streaming corpus corruption."""
+import json
+import pytest
+from src.utils.corpus_stream import byte_ranges, corrupt_corpus, iter_lines
+from src.utils.error_injection import inject_errors
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """A small text corpus with a blank line and non-ASCII text."""
+    lines = [f"sentence number {i} about remote scientific projects é" for i in range(40)]
+    lines[7] = ""
+    path = tmp_path / "corpus.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def read_jsonl(path):
+    """Parse a JSONL file."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestByteRanges:
+    """Test line-aligned file splitting."""
+
+    @pytest.mark.parametrize("parts", [1, 3, 7, 100])
+    def test_ranges_cover_every_line_once(self, corpus, parts):
+        """Test ranges are contiguous and every line is read exactly once."""
+        ranges = byte_ranges(corpus, parts)
+        assert ranges[0][0] == 0 and ranges[-1][1] == corpus.stat().st_size
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        lines = [line for start, end in ranges for _, line in iter_lines(corpus, start, end)]
+        assert b"".join(lines) == corpus.read_bytes()
+
+    def test_empty_file(self, tmp_path):
+        """Test an empty file has no ranges."""
+        path = tmp_path / "empty.txt"
+        path.write_text("")
+        assert byte_ranges(path, 4) == []
+
+
+class TestCorruptCorpus:
+    """Test the streaming corruption pipeline."""
+
+    def test_output_independent_of_workers(self, corpus, tmp_path):
+        """Test sharding across processes does not change the output."""
+        corrupt_corpus(corpus, tmp_path / "one.jsonl", [0.2, 0.5], seed=3, workers=1)
+        stats = corrupt_corpus(corpus, tmp_path / "three.jsonl", [0.2, 0.5], seed=3, workers=3)
+        assert (tmp_path / "one.jsonl").read_bytes() == (tmp_path / "three.jsonl").read_bytes()
+        assert stats == {"lines": 39, "records": 78}
+        assert not list(tmp_path.glob("*.part*"))
+
+    def test_records_reproducible_with_inject_errors(self, corpus, tmp_path):
+        """Test every record matches inject_errors with its recorded seed."""
+        out = tmp_path / "out.jsonl"
+        corrupt_corpus(corpus, out, [0.0, 0.5], seed=1)
+        for row in read_jsonl(out):
+            assert row["corrupted"] == inject_errors(row["text"], row["error_rate"], row["seed"])
+
+    def test_jsonl_keeps_fields(self, tmp_path):
+        """Test JSONL records keep their fields and use the chosen text field."""
+        path = tmp_path / "in.jsonl"
+        path.write_text("\n".join(json.dumps({"id": i, "body": f"one two three four {i}"}) for i in range(5)))
+        out = tmp_path / "out.jsonl"
+        corrupt_corpus(path, out, [0.4], text_field="body")
+        rows = read_jsonl(out)
+        assert [row["id"] for row in rows] == list(range(5))
+        assert all(row["corrupted"] != row["body"] for row in rows)
+
+    def test_jsonl_missing_field(self, tmp_path):
+        """Test a record without the text field is rejected."""
+        path = tmp_path / "in.jsonl"
+        path.write_text(json.dumps({"id": 1}) + "\n")
+        with pytest.raises(ValueError):
+            corrupt_corpus(path, tmp_path / "out.jsonl", [0.1])
+
+    def test_invalid_rate(self, corpus, tmp_path):
+        """Test error rates outside [0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            corrupt_corpus(corpus, tmp_path / "out.jsonl", [1.5])
@@ -0,0 +1,279 @@
+"""Tests for the dictionary agent's indexed fuzzy lookup."""
+import difflib
+import os
+import pickle
+import random
+import numpy as np
+import pytest
+from agents_OLD_BACKUP import DictionaryTranslationAgent
+from agents_OLD_BACKUP.fuzzy_index import FuzzyIndex
+from agents_OLD_BACKUP.lexicon import Lexicon, build_lexicon, open_lexicon
+from agents_OLD_BACKUP.phrase_matcher import PhraseMatcher
+from agents_OLD_BACKUP.token_cache import TokenCache
+from src.utils.typo_engine import DEFAULT_ENGINE
+
+
+@pytest.fixture
+def vocabulary():
+    """Random words with shared prefixes, accents and duplicate-length keys."""
+    rng = random.Random(0)
+    letters = "abcdeéfghilmnoprstu"
+    words = {"".join(rng.choice(letters) for _ in range(rng.randint(1, 12))) for _ in range(800)}
+    words.update({"", "a", "ab", "ba", "données", "équipes", "horaires", "horaire"})
+    return sorted(words)
+
+
+def queries(vocabulary):
+    """Misspelled keys, random strings and edge cases."""
+    rng = random.Random(1)
+    typos = [DEFAULT_ENGINE.corrupt_word(word, rng) for word in rng.sample(vocabulary, 120)]
+    noise = ["".join(rng.choice("abcxyzé") for _ in range(rng.randint(1, 10))) for _ in range(40)]
+    return typos + noise + ["", "a", "zzzz", "horairs", "données"]
+
+
+class TestFuzzyIndex:
+    """Test FuzzyIndex against a full difflib scan."""
+
+    @pytest.mark.parametrize("cutoff,n", [(0.75, 1), (0.6, 3), (0.9, 2), (0.3, 1), (1.0, 1)])
+    def test_matches_difflib(self, vocabulary, cutoff, n):
+        """Test results, order and tie-breaks equal get_close_matches."""
+        index = FuzzyIndex(vocabulary)
+        for word in queries(vocabulary):
+            assert index.get_close_matches(word, n=n, cutoff=cutoff) == \
+                difflib.get_close_matches(word, vocabulary, n=n, cutoff=cutoff)
+
+    def test_candidates_prune(self, vocabulary):
+        """Test most keys are pruned before the exact ratio check."""
+        index = FuzzyIndex(vocabulary)
+        assert len(index.candidates("horairs", 0.75)) < len(vocabulary) / 20
+
+    def test_lexicon_tables_match(self, vocabulary, tmp_path):
+        """Test the tables stored in a lexicon file give the same matches as an in-memory index."""
+        tsv = tmp_path / "words.tsv"
+        long_keys = ["x" * 300, "x" * 299 + "y"]
+        tsv.write_text("".join(f"{word}\t{i}\n" for i, word in enumerate(vocabulary + long_keys)), encoding="utf-8")
+        build_lexicon(tsv, tmp_path / "words.lex")
+        lexicon = Lexicon(tmp_path / "words.lex")
+        stored, built = lexicon.fuzzy_index(), FuzzyIndex(list(lexicon))
+        assert len(stored) == len(built) == len(lexicon)
+        for word in queries(vocabulary) + ["x" * 298]:
+            for cutoff in (0.0, 0.6, 0.75):
+                assert stored.get_close_matches(word, n=3, cutoff=cutoff) == \
+                    built.get_close_matches(word, n=3, cutoff=cutoff)
+
+    def test_invalid_arguments(self):
+        """Test argument checks mirror difflib."""
+        index = FuzzyIndex(["word"])
+        with pytest.raises(ValueError):
+            index.get_close_matches("word", n=0)
+        with pytest.raises(ValueError):
+            index.get_close_matches("word", cutoff=1.5)
+
+
+class TestDictionaryAgent:
+    """Test translation through the index."""
+
+    def test_fuzzy_translation(self):
+        """Test a misspelled token maps to the closest key's translation."""
+        agent = DictionaryTranslationAgent(
+            name="t", source_language="en", target_language="fr",
+            dictionary={"schedules": "horaires", "teams": "équipes"}, description="test",
+        )
+        assert agent.translate("teams need schedles") == "équipes need horaires"
+
+
+@pytest.fixture
+def tsv(tmp_path):
+    """A small TSV lexicon with a comment, a duplicate and non-ASCII entries."""
+    path = tmp_path / "fr_he.tsv"
+    path.write_text(
+        "# French to Hebrew\n"
+        "équipes\tצוותים\n"
+        "Horaires\tלוחות_זמנים\n"
+        "données\tנתונים\n"
+        "équipes\tקבוצות\n"
+        "\n"
+        "et\tו\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestLexicon:
+    """Test the memory-mapped sorted string table."""
+
+    def test_mapping_interface(self, tsv, tmp_path):
+        """Test lookups, membership, length and sorted iteration."""
+        assert build_lexicon(tsv, tmp_path / "fr_he.lex") == 4
+        lexicon = Lexicon(tmp_path / "fr_he.lex")
+        assert lexicon["données"] == "נתונים"
+        assert lexicon["horaires"] == "לוחות_זמנים"
+        assert lexicon["équipes"] == "צוותים"
+        assert "missing" not in lexicon and "et" in lexicon
+        assert len(lexicon) == 4
+        assert list(lexicon) == sorted(lexicon, key=lambda key: key.encode("utf-8"))
+        with pytest.raises(KeyError):
+            lexicon["zzz"]
+        lexicon.close()
+
+    def test_pickle_reopens_file(self, tsv):
+        """Test a pickled lexicon reopens the same file."""
+        lexicon = open_lexicon(tsv)
+        clone = pickle.loads(pickle.dumps(lexicon))
+        assert clone.path == lexicon.path and dict(clone) == dict(lexicon)
+
+    def test_rebuilt_when_tsv_changes(self, tsv):
+        """Test open_lexicon recompiles a stale binary file."""
+        assert "et" in open_lexicon(tsv)
+        tsv.write_text("ou\tאו\n", encoding="utf-8")
+        lex_path = tsv.with_suffix(".lex")
+        os.utime(lex_path, (0, 0))
+        assert dict(open_lexicon(tsv)) == {"ou": "או"}
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test a non-lexicon file is rejected."""
+        path = tmp_path / "bad.lex"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            Lexicon(path)
+
+    def test_agent_from_tsv(self, tsv):
+        """Test from_tsv translates with exact and fuzzy lookups."""
+        agent = DictionaryTranslationAgent.from_tsv(tsv, "fr→he", "French", "Hebrew")
+        assert agent._fuzzy is None
+        assert agent.translate("données et équipe") == "נתונים ו צוותים"
+        assert agent._fuzzy is not None
+        assert isinstance(agent._fuzzy._buckets[7][1], np.memmap)
+
+    def test_phrases_stored_in_file(self, tsv, monkeypatch):
+        """Test multi-token keys come from the file, without iterating every key."""
+        with open(tsv, "a", encoding="utf-8") as f:
+            f.write("Bonne nuit\tלילה טוב\nl'équipe\tהצוות\n")
+        agent = DictionaryTranslationAgent.from_tsv(tsv, "fr→he", "French", "Hebrew")
+        assert sorted(agent.dictionary.phrases()) == [("bonne nuit", "לילה טוב"), ("l'équipe", "הצוות")]
+        monkeypatch.setattr(Lexicon, "__iter__", lambda self: pytest.fail("scanned all keys"))
+        assert len(agent.phrase_matcher) == 2
+        assert agent.translate("Bonne nuit et données") == "לילה טוב ו נתונים"
+
+    def test_old_format_rebuilt(self, tsv):
+        """Test open_lexicon recompiles a file written in an older format."""
+        lex_path = tsv.with_suffix(".lex")
+        build_lexicon(tsv, lex_path)
+        data = lex_path.read_bytes()
+        lex_path.write_bytes(b"LEXSST01" + data[8:])
+        os.utime(lex_path, (tsv.stat().st_mtime + 10,) * 2)
+        assert open_lexicon(tsv)["et"] == "ו"
+
+
+def naive_longest_match(phrases, tokens):
+    """Reference leftmost-longest matcher: try every phrase at every position."""
+    table = {}
+    for phrase, value in phrases:
+        table.setdefault(tuple(phrase), value)
+    spans, position = [], 0
+    while position < len(tokens):
+        ends = [position + len(p) for p in table if tuple(tokens[position:position + len(p)]) == p]
+        if ends:
+            end = max(ends)
+            spans.append((position, end, table[tuple(tokens[position:end])]))
+            position = end
+        else:
+            position += 1
+    return spans
+
+
+class TestPhraseMatcher:
+    """Test the word-level Aho-Corasick automaton."""
+
+    def test_longest_match_wins(self):
+        """Test the longest phrase at a start position is chosen."""
+        matcher = PhraseMatcher([(["new", "york"], "NY"), (["new", "york", "city"], "NYC"), (["york", "city", "hall"], "H")])
+        assert matcher.find("in new york city hall".split()) == [(1, 4, "NYC")]
+        assert matcher.find("new york".split()) == [(0, 2, "NY")]
+
+    def test_suffix_matches_through_failure_links(self):
+        """Test phrases found only via failure links are reported."""
+        matcher = PhraseMatcher([(["a", "b", "c", "d"], "long"), (["b", "c"], "bc")])
+        assert matcher.find("a b c x".split()) == [(1, 3, "bc")]
+
+    def test_matches_naive_scan(self):
+        """Test random phrase tables against a brute-force matcher."""
+        rng = random.Random(5)
+        vocab = list("abcd")
+        phrases = [([rng.choice(vocab) for _ in range(rng.randint(2, 4))], str(i)) for i in range(30)]
+        matcher = PhraseMatcher(phrases)
+        for _ in range(200):
+            tokens = [rng.choice(vocab) for _ in range(rng.randint(0, 25))]
+            assert matcher.find(tokens) == naive_longest_match(phrases, tokens)
+
+    def test_agent_translates_phrases(self):
+        """Test multi-word keys match while other tokens still use fuzzy lookup."""
+        agent = DictionaryTranslationAgent(
+            name="t", source_language="en", target_language="fr",
+            dictionary={"face to face": "en personne", "time zones": "fuseaux horaires",
+                        "face": "visage", "meet": "rencontrer"},
+            description="test",
+        )
+        assert agent.translate("We mete Face to face across time zones.") == \
+            "We rencontrer en personne across fuseaux horaires."
+        assert len(agent.phrase_matcher) == 2
+
+
+class TestTokenCache:
+    """Test fuzzy resolution caching."""
+
+    def test_lru_eviction_and_stats(self):
+        """Test the least recently used entry is evicted and counters update."""
+        cache = TokenCache(maxsize=2)
+        cache.put("a", "x")
+        cache.put("b", None)
+        assert cache.get("a") == (True, "x")
+        cache.put("c", "z")
+        assert cache.get("b") == (False, None)
+        assert cache.get("c") == (True, "z")
+        stats = cache.stats()
+        assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1, 1)
+
+    def test_updates_tracked_only_on_request(self):
+        """Test take_updates reports new entries only when tracking is on."""
+        cache = TokenCache(maxsize=2)
+        cache.put("a", "x")
+        assert cache.take_updates()["entries"] == [] and not cache._updates
+        tracked = TokenCache(maxsize=2, track_updates=True)
+        tracked.put("a", "x")
+        tracked.put("b", None)
+        assert tracked.take_updates()["entries"] == [("a", "x"), ("b", None)]
+        assert tracked.take_updates()["entries"] == []
+
+    def test_agent_caches_hits_and_misses(self, monkeypatch):
+        """Test a repeated token is resolved once, including "no match" results."""
+        agent = DictionaryTranslationAgent(
+            name="t", source_language="en", target_language="fr",
+            dictionary={"schedules": "horaires"}, description="test", token_cache=TokenCache(),
+        )
+        calls = []
+        resolve = agent._fuzzy_translation
+        monkeypatch.setattr(agent, "_fuzzy_translation", lambda lower: calls.append(lower) or resolve(lower))
+        for _ in range(3):
+            assert agent.translate("Schedles qqq") == "horaires qqq"
+        assert calls == ["schedles", "qqq"]
+        assert agent.token_cache.stats()["no_match_entries"] == 1
+
+    def test_persistence_keyed_by_dictionary(self, tmp_path):
+        """Test saved entries reload only for the same dictionary."""
+        def make(dictionary):
+            return DictionaryTranslationAgent(
+                name="t", source_language="en", target_language="fr", dictionary=dictionary, description="test",
+            )
+
+        agent = make({"schedules": "horaires"})
+        agent.load_token_cache(tmp_path)
+        agent.translate("schedles")
+        agent.save_token_cache(tmp_path)
+
+        same = make({"schedules": "horaires"})
+        assert same.load_token_cache(tmp_path) == 1
+        assert same.token_cache.get("schedles") == (True, "horaires")
+
+        changed = make({"schedules": "emplois du temps"})
+        assert changed.load_token_cache(tmp_path) == 0
@@ -0,0 +1,48 @@
+"""Tests for per-stage drift scoring."""
+import numpy as np
+import pytest
+from src.embeddings.drift import StageDriftScorer
+
+
+@pytest.fixture
+def scorer(fake_calculator):
+    """Drift scorer on the fake embedding model."""
+    return StageDriftScorer(fake_calculator)
+
+
+class TestStageDrift:
+    """Test batched per-hop distances."""
+
+    def test_shapes(self, scorer):
+        """Test one row per cell and one column per stage."""
+        scores = scorer.score(
+            ["abc", "eeee"], ["abd", "eeee"], [["fr a", "he b", "en c"], ["fr", "he", "eeee"]]
+        )
+        assert scores["hop_distances"].shape == (2, 3)
+        assert scores["stage_distances"].shape == (2, 3)
+
+    def test_single_encode_call(self, scorer):
+        """Test every text in the batch is embedded in one call."""
+        scorer.score(["abc", "xyz"], ["abd", "xyw"], [["1", "2", "3"], ["4", "5", "6"]])
+        assert len(scorer.calc.model.encode_calls) == 1
+
+    def test_matches_pairwise_distances(self, scorer):
+        """Test vectorized distances equal calculate_distance on each pair."""
+        original, chain_input, stages = "aaa bb", "aab bb", ["ea ee", "eee a", "aaa b"]
+        scores = scorer.score([original], [chain_input], [stages])
+        calc = scorer.calc
+        chain = [chain_input, *stages]
+        expected_hops = [calc.calculate_distance(a, b) for a, b in zip(chain, chain[1:])]
+        expected_stages = [calc.calculate_distance(original, s) for s in stages]
+        np.testing.assert_allclose(scores["hop_distances"][0], expected_hops, atol=1e-6)
+        np.testing.assert_allclose(scores["stage_distances"][0], expected_stages, atol=1e-6)
+
+    def test_unchanged_chain_has_no_drift(self, scorer):
+        """Test identical stage outputs give zero hop distance."""
+        scores = scorer.score(["same"], ["same"], [["same", "same", "same"]])
+        np.testing.assert_allclose(scores["hop_distances"], 0.0, atol=1e-6)
+
+    def test_ragged_stages_rejected(self, scorer):
+        """Test cells must have the same number of stages."""
+        with pytest.raises(ValueError):
+            scorer.score(["a", "b"], ["a", "b"], [["x", "y"], ["x"]])
@@ -2,7 +2,7 @@
 Tests for error injection functionality.
 """
 import pytest
-from src.utils.error_injection import inject_errors
+from src.utils.error_injection import inject_errors, inject_errors_nested
 
 
 class TestErrorInjection:
@@ -89,3 +89,41 @@ class TestErrorInjection:
         result = inject_errors(text, error_rate=0.3, seed=42)
         # Word count should be preserved
         assert len(result.split()) == len(text.split())
+
+    def test_error_injection_leaves_global_random_state(self):
+        """Test inject_errors does not reseed the global RNG."""
+        import random
+        random.seed(7)
+        expected = random.random()
+        random.seed(7)
+        inject_errors("the quick brown fox jumps", error_rate=0.4, seed=42)
+        assert random.random() == expected
+
+
+class TestNestedInjection:
+    """Test common-random-numbers corruption across error rates."""
+
+    TEXT = "the quick brown fox jumps over the lazy dog in the sunny forest today"
+    RATES = [0.0, 0.1, 0.2, 0.3, 0.5]
+
+    def test_edits_are_nested(self):
+        """Test the words edited at a lower rate stay edited identically at higher rates."""
+        words = self.TEXT.split()
+        variants = [v.split() for v in inject_errors_nested(self.TEXT, self.RATES, seed=3)]
+        previous = {}
+        for rate, variant in zip(self.RATES, variants):
+            edits = {i: w for i, w in enumerate(variant) if w != words[i]}
+            assert len(edits) == int(len(words) * rate)
+            assert previous.items() <= edits.items()
+            previous = edits
+
+    def test_highest_rate_matches_inject_errors(self):
+        """Test the highest-rate variant equals an independent draw with the same seed."""
+        variants = inject_errors_nested(self.TEXT, self.RATES, seed=11)
+        assert variants[-1] == inject_errors(self.TEXT, 0.5, seed=11)
+        assert variants[0] == self.TEXT
+
+    def test_invalid_rate(self):
+        """Test rates outside [0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            inject_errors_nested(self.TEXT, [0.1, 1.2])
@@ -0,0 +1,63 @@
+"""Tests for experiment dependency fingerprints."""
+from src.utils.fingerprints import ResultCache, cell_fingerprints, fingerprint
+
+SPECS = [{"agent": "A", "model": "m1"}, {"agent": "B", "model": "m1"}, {"agent": "C", "model": "m1"}]
+
+
+def cell(specs=SPECS, corrupted="helo world", seed=42, score_spec=None):
+    """Fingerprints of a fixed cell with the given stages and scorer."""
+    return cell_fingerprints("hello world", 0.5, seed, corrupted, specs, score_spec)
+
+
+class TestFingerprints:
+    """Test what each fingerprint depends on."""
+
+    def test_stable_and_key_order_independent(self):
+        """Test fingerprints are deterministic and ignore dict key order."""
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+        assert fingerprint("x") != fingerprint("y")
+        assert cell() == cell()
+
+    def test_stage_change_invalidates_downstream_only(self):
+        """Test changing stage 2 keeps stage 1 and changes stages 2, 3 and the score."""
+        changed = [SPECS[0], {"agent": "B", "model": "m2"}, SPECS[2]]
+        before, after = cell(score_spec={"s": 1}), cell(changed, score_spec={"s": 1})
+        assert before["input_fingerprint"] == after["input_fingerprint"]
+        assert before["stage_fingerprints"][0] == after["stage_fingerprints"][0]
+        assert before["stage_fingerprints"][1] != after["stage_fingerprints"][1]
+        assert before["stage_fingerprints"][2] != after["stage_fingerprints"][2]
+        assert before["score_fingerprint"] != after["score_fingerprint"]
+
+    def test_input_change_invalidates_everything(self):
+        """Test a different seed or corrupted text changes every fingerprint."""
+        base = cell()
+        for other in (cell(seed=43), cell(corrupted="hello wrld")):
+            assert all(a != b for a, b in zip(base["stage_fingerprints"], other["stage_fingerprints"]))
+
+    def test_scorer_change_keeps_stages(self):
+        """Test only the score fingerprint depends on the scorer, and None disables it."""
+        first, second = cell(score_spec={"model": "a"}), cell(score_spec={"model": "b"})
+        assert first["stage_fingerprints"] == second["stage_fingerprints"]
+        assert first["score_fingerprint"] != second["score_fingerprint"]
+        assert cell()["score_fingerprint"] == ""
+
+
+class TestResultCache:
+    """Test lookups of earlier stage outputs and scores."""
+
+    def test_longest_cached_prefix(self):
+        """Test outputs are returned up to the first stage that is not cached."""
+        old = cell(score_spec={"s": 1})
+        cache = ResultCache([{**old, "stage_outputs": ["fr", "he", "en"], "distance": 0.3}])
+        changed = cell([SPECS[0], SPECS[1], {"agent": "C", "model": "m2"}], score_spec={"s": 1})
+        assert cache.outputs(old["stage_fingerprints"]) == ["fr", "he", "en"]
+        assert cache.outputs(changed["stage_fingerprints"]) == ["fr", "he"]
+        assert cache.scores(old["score_fingerprint"]) == {"distance": 0.3}
+        assert cache.scores(changed["score_fingerprint"]) is None
+
+    def test_rows_without_fingerprints_are_ignored(self):
+        """Test results written before fingerprinting give an empty cache."""
+        cache = ResultCache([{"final": "x", "distance": 0.1}])
+        assert len(cache) == 0
+        assert cache.outputs(cell()["stage_fingerprints"]) == []
+        assert cache.scores("") is None
@@ -0,0 +1,83 @@
+"""Tests for the fused dictionary chain."""
+import random
+import pytest
+import main
+from agents_OLD_BACKUP import DictionaryTranslationAgent
+from agents_OLD_BACKUP.fused_chain import FusedDictionaryChain
+
+
+def reference_reconstruct(original_tokens, translated_tokens):
+    """The previous string-concatenation _reconstruct_text."""
+    pieces = []
+    for original, translated in zip(original_tokens, translated_tokens):
+        if translated is None:
+            translated = original
+        pieces.append(translated)
+    text = ""
+    for piece in pieces:
+        if not piece:
+            continue
+        if not text:
+            text = piece
+            continue
+        if any(ch.isalnum() for ch in piece):
+            text += " " + piece
+        else:
+            text = text.rstrip() + piece
+    return text.strip()
+
+
+def make_agent(dictionary):
+    """Agent over a small dictionary."""
+    return DictionaryTranslationAgent(
+        name="t", source_language="a", target_language="b", dictionary=dictionary, description="test"
+    )
+
+
+class TestReconstruct:
+    """Test the list-based _reconstruct_text."""
+
+    def test_matches_string_concatenation(self):
+        """Test random pieces with whitespace, punctuation and empties."""
+        rng = random.Random(0)
+        alphabet = ["a", "bc", "", " ", "  ", ".", ",", " x ", "- ", "_", "é", None]
+        for _ in range(2000):
+            pieces = [rng.choice(alphabet) for _ in range(rng.randint(0, 8))]
+            originals = [rng.choice(["w", "."]) for _ in pieces]
+            assert DictionaryTranslationAgent._reconstruct_text(originals, pieces) == \
+                reference_reconstruct(originals, pieces)
+
+
+class TestFusedChain:
+    """Test the fused chain against running agents one by one."""
+
+    def test_identical_to_sequential_chain(self):
+        """Test corrupted sentences through the built-in agents."""
+        agents = main.build_agents()
+        fused = FusedDictionaryChain(agents)
+        rng = random.Random(1)
+        for seed in range(40):
+            text = main.introduce_typos(main.DEFAULT_SENTENCE, rng.choice([0.0, 0.2, 0.5]), seed)
+            assert fused.run(text) == main.run_pipeline(text, agents)
+
+    def test_memoizes_tokens(self):
+        """Test a repeated token is composed once."""
+        fused = FusedDictionaryChain([make_agent({"a": "b"}), make_agent({"b": "c"})])
+        assert fused.run("a a, A!") == ["a a, A!", "b b, b!", "c c, c!"]
+        assert len(fused) == 4
+
+    def test_precompose(self):
+        """Test every first-hop key is composed up front."""
+        fused = FusedDictionaryChain([make_agent({"a": "b", "x": "y z"}), make_agent({"b": "c"})])
+        assert fused.precompose() == 2
+        assert fused.run("x") == ["x", "y z", "y z"]
+
+    @pytest.mark.parametrize("dictionaries", [
+        [{"a": "_"}, {"_": "u"}],
+        [{"new york": "ny"}, {"ny": "NY"}],
+    ])
+    def test_falls_back_when_not_composable(self, dictionaries):
+        """Test underscore pieces and phrase keys use the sequential chain."""
+        agents = [make_agent(d) for d in dictionaries]
+        text = "go a new york a"
+        assert FusedDictionaryChain(agents).run(text) == main.run_pipeline(text, agents)
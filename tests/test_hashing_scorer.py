@@ -0,0 +1,50 @@
+"""Tests for the feature-hashing streaming scorer."""
+import pytest
+from src.utils.hashing_scorer import HashingScorer
+from src.utils.tfidf import tfidf_distances
+
+ORIGINAL = "the quick brown fox jumps over the lazy dog"
+
+
+class TestHashingScorer:
+    """Test streaming hashed TF-IDF distances."""
+
+    def test_identical_and_disjoint_texts(self):
+        """Test cosine distance is 0 for equal texts and 1 without shared tokens."""
+        scorer = HashingScorer(n_features=4096)
+        assert scorer.calculate_distance(ORIGINAL, ORIGINAL) == pytest.approx(0.0, abs=1e-12)
+        assert scorer.calculate_distance(ORIGINAL, "completely unrelated words") == pytest.approx(1.0)
+
+    def test_memory_is_fixed(self):
+        """Test document frequencies stay n_features long however many texts arrive."""
+        scorer = HashingScorer(n_features=64)
+        list(scorer.stream_distances(ORIGINAL, [f"token{i} word{i}" for i in range(500)]))
+        assert scorer.doc_freq.shape == (64,)
+        assert scorer.num_documents == 501
+
+    def test_repeated_reference_counted_once(self):
+        """Test consecutive pairs with the same original count it as one document."""
+        scorer = HashingScorer(n_features=4096)
+        scorer.batch_calculate([(ORIGINAL, "a"), (ORIGINAL, "b"), ("other text", "c")])
+        assert scorer.num_documents == 5
+
+    def test_hash_is_stable(self):
+        """Test two scorers give the same distances for the same stream."""
+        finals = ["the quikc brown fox", "lazy dog over", ""]
+        first = list(HashingScorer(n_features=256).stream_distances(ORIGINAL, finals))
+        second = list(HashingScorer(n_features=256).stream_distances(ORIGINAL, finals))
+        assert first == second
+
+    def test_tracks_exact_tfidf_without_collisions(self):
+        """Test with ample buckets, the last final's distance is the batch TF-IDF one."""
+        finals = ["the quick brown fox", "the lazy dog jumps", "over the quick dog"]
+        streamed = list(HashingScorer(n_features=2 ** 20, metric="euclidean").stream_distances(ORIGINAL, finals))
+        exact = tfidf_distances(ORIGINAL, finals)
+        assert streamed[-1] == pytest.approx(exact[-1])
+
+    def test_invalid_arguments(self):
+        """Test a non-positive dimension or unknown metric is rejected."""
+        with pytest.raises(ValueError):
+            HashingScorer(n_features=0)
+        with pytest.raises(ValueError):
+            HashingScorer(metric="manhattan")
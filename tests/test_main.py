@@ -0,0 +1,72 @@
+"""Tests for the main.py multi-seed sweep."""
+import pytest
+import main
+from agents_OLD_BACKUP.token_cache import TokenCache
+
+RATES = [0.0, 0.25, 0.5]
+
+
+class TestSweep:
+    """Test (rate, seed) sweeps."""
+
+    def test_first_seed_matches_single_seed_run(self):
+        """Test seed k of rate i uses base + k * len(rates) + i."""
+        runs = main.sweep(main.DEFAULT_SENTENCE, RATES, 42, 3, main.build_agents())
+        assert [(run["error_rate"], run["seed"]) for run in runs[:3]] == [(0.0, 42), (0.0, 45), (0.0, 48)]
+        assert runs[3]["seed"] == 43
+        assert runs[3]["input_sentence"] == main.introduce_typos(main.DEFAULT_SENTENCE, 0.25, 43)
+
+    def test_workers_do_not_change_results(self):
+        """Test a process pool returns the serial results in the same order."""
+        serial = main.sweep(main.DEFAULT_SENTENCE, RATES, 7, 4, main.build_agents())
+        parallel = main.sweep(main.DEFAULT_SENTENCE, RATES, 7, 4, main.build_agents(), workers=2)
+        assert parallel == serial
+
+    def test_worker_cache_updates_are_merged(self):
+        """Test token cache entries learned in workers reach the parent's agents."""
+        agents = main.build_agents()
+        for agent in agents:
+            agent.token_cache = TokenCache()
+        main.sweep(main.DEFAULT_SENTENCE, [0.5], 1, 4, agents, workers=2)
+        assert len(agents[0].token_cache) > 0
+        assert agents[0].token_cache.stats()["misses"] > 0
+
+
+class TestSummary:
+    """Test per-rate aggregation."""
+
+    def test_mean_and_t_interval(self):
+        """Test the mean and 95% t interval for known values."""
+        runs = [{"error_rate": 0.1, "distance": d} for d in (1.0, 2.0, 3.0)]
+        entry = main.summarize_by_rate([0.1], runs)[0]
+        assert entry["mean_distance"] == pytest.approx(2.0)
+        assert entry["std"] == pytest.approx(1.0)
+        # t(0.975, 2) = 4.3027
+        assert entry["ci_high"] - entry["mean_distance"] == pytest.approx(4.302653 / 3 ** 0.5, rel=1e-5)
+
+    def test_single_seed_has_no_interval(self):
+        """Test one run per rate reports no spread."""
+        entry = main.summarize_by_rate([0.1], [{"error_rate": 0.1, "distance": 0.5}])[0]
+        assert entry["n"] == 1 and entry["ci_low"] is None
+
+    def test_rate_without_runs(self):
+        """Test a rate with no runs is reported empty instead of failing."""
+        entry = main.summarize_by_rate([0.1, 0.2], [{"error_rate": 0.1, "distance": 0.5}])[1]
+        assert entry == {"error_rate": 0.2, "n": 0, "mean_distance": None, "std": None, "ci_low": None, "ci_high": None}
+
+    @pytest.mark.parametrize("flag", ["--num-seeds", "--workers"])
+    def test_counts_must_be_positive(self, monkeypatch, flag):
+        """Test --num-seeds and --workers below 1 are rejected by the parser."""
+        monkeypatch.setattr("sys.argv", ["main.py", flag, "0"])
+        with pytest.raises(SystemExit):
+            main.parse_arguments()
+
+
+class TestHelpers:
+    """Test the module-level helpers kept for existing callers."""
+
+    def test_tokenize_and_euclidean_distance(self):
+        """Test tokenize and euclidean_distance still behave like the old pure-Python versions."""
+        assert main.tokenize("Hello, World_x 42") == ["hello", "world_x"]
+        assert main.euclidean_distance([0.0, 3.0, 1.0], [4.0, 0.0, 1.0]) == pytest.approx(5.0)
+        assert main.euclidean_distance([1.0, 2.0], [1.0]) == 0.0
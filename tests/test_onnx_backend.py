@@ -0,0 +1,68 @@
+"""Tests for the quantized ONNX embedding backend."""
+import math
+import pytest
+from src.embeddings import onnx_backend
+from src.embeddings.onnx_backend import parity_report, quantized_file_name
+from src.embeddings.similarity import SimilarityCalculator
+
+
+class TestParityReport:
+    """Test parity statistics between backends."""
+
+    def test_identical_distances(self):
+        """Test identical distance lists have zero difference."""
+        report = parity_report([0.1, 0.2, 0.4], [0.1, 0.2, 0.4])
+        assert report["n"] == 3
+        assert report["max_abs_diff"] == 0.0
+        assert report["pearson"] == pytest.approx(1.0)
+        assert report["spearman"] == pytest.approx(1.0)
+
+    def test_small_deviation(self):
+        """Test max and mean absolute differences."""
+        report = parity_report([0.1, 0.2, 0.4], [0.11, 0.19, 0.4])
+        assert report["max_abs_diff"] == pytest.approx(0.01)
+        assert report["mean_abs_diff"] == pytest.approx(0.02 / 3)
+        assert report["spearman"] == pytest.approx(1.0)
+
+    def test_constant_distances(self):
+        """Test correlations are undefined for constant inputs."""
+        report = parity_report([0.5, 0.5], [0.5, 0.5])
+        assert math.isnan(report["pearson"])
+
+    def test_length_mismatch(self):
+        """Test mismatched inputs are rejected."""
+        with pytest.raises(ValueError):
+            parity_report([0.1, 0.2], [0.1])
+
+
+class TestBackendSelection:
+    """Test backend selection in SimilarityCalculator."""
+
+    def test_quantized_file_name(self):
+        """Test the exported file name for a quantization config."""
+        assert quantized_file_name("avx2") == "onnx/model_qint8_avx2.onnx"
+
+    def test_unknown_backend(self):
+        """Test unknown backends are rejected before loading a model."""
+        with pytest.raises(ValueError):
+            SimilarityCalculator(backend="tensorrt")
+
+    def test_from_config_onnx(self, monkeypatch, mock_embeddings):
+        """Test config selects the quantized loader."""
+        calls = []
+
+        def fake_loader(model_name, onnx_dir, quantization):
+            calls.append((model_name, str(onnx_dir), quantization))
+            return mock_embeddings
+
+        monkeypatch.setattr(onnx_backend, "load_quantized_model", fake_loader)
+        mock_embeddings.get_sentence_embedding_dimension.return_value = 5
+
+        calc = SimilarityCalculator.from_config({
+            "model": "all-MiniLM-L6-v2",
+            "backend": "onnx-int8",
+            "onnx_dir": "models/onnx",
+            "quantization": "avx512_vnni",
+        })
+        assert calc.backend == "onnx-int8"
+        assert calls == [("all-MiniLM-L6-v2", "models/onnx", "avx512_vnni")]
@@ -0,0 +1,94 @@
+"""Tests for chunked pairwise distances and top-k search."""
+import numpy as np
+import pytest
+from src.embeddings.pairwise import cosine_distance_matrix, iter_distance_blocks, top_k_neighbors
+
+
+@pytest.fixture
+def embeddings():
+    """Random embeddings with a zero row."""
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(23, 8)).astype(np.float32)
+    a[5] = 0.0
+    b = rng.normal(size=(17, 8)).astype(np.float32)
+    return a, b
+
+
+def brute_force(a, b):
+    """Reference cosine distances."""
+    an = a / np.where(np.linalg.norm(a, axis=1, keepdims=True) == 0, 1, np.linalg.norm(a, axis=1, keepdims=True))
+    bn = b / np.where(np.linalg.norm(b, axis=1, keepdims=True) == 0, 1, np.linalg.norm(b, axis=1, keepdims=True))
+    return 1.0 - an @ bn.T
+
+
+class TestDistanceMatrix:
+    """Test block distance matrices."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+    def test_matches_brute_force(self, embeddings, chunk_size):
+        """Test chunking does not change the result."""
+        a, b = embeddings
+        result = cosine_distance_matrix(a, b, chunk_size=chunk_size)
+        assert result.shape == (23, 17)
+        np.testing.assert_allclose(result, brute_force(a, b), atol=1e-5)
+
+    def test_blocks_are_bounded(self, embeddings):
+        """Test each yielded block has at most chunk_size rows."""
+        a, b = embeddings
+        blocks = list(iter_distance_blocks(a, b, chunk_size=5))
+        assert [start for start, _ in blocks] == [0, 5, 10, 15, 20]
+        assert all(block.shape[0] <= 5 for _, block in blocks)
+
+    def test_invalid_chunk_size(self, embeddings):
+        """Test chunk_size must be positive."""
+        with pytest.raises(ValueError):
+            cosine_distance_matrix(*embeddings, chunk_size=0)
+
+
+class TestTopK:
+    """Test chunked nearest-neighbour search."""
+
+    @pytest.mark.parametrize("chunk_size", [3, 1024])
+    def test_matches_full_sort(self, embeddings, chunk_size):
+        """Test top-k distances equal the k smallest of the full matrix."""
+        a, b = embeddings
+        indices, distances = top_k_neighbors(a, b, k=4, chunk_size=chunk_size)
+        expected = np.sort(brute_force(a, b), axis=1)[:, :4]
+        np.testing.assert_allclose(distances, expected, atol=1e-5)
+        np.testing.assert_allclose(
+            np.take_along_axis(brute_force(a, b), indices, axis=1), distances, atol=1e-5
+        )
+
+    def test_exclude_self(self, embeddings):
+        """Test self-matches are skipped when searching a set against itself."""
+        a, _ = embeddings
+        indices, _ = top_k_neighbors(a, a, k=3, chunk_size=4, exclude_self=True)
+        assert not (indices == np.arange(len(a))[:, None]).any()
+
+    def test_k_larger_than_corpus(self, embeddings):
+        """Test k is clipped to the corpus size."""
+        a, b = embeddings
+        indices, distances = top_k_neighbors(a, b[:2], k=10)
+        assert indices.shape == (23, 2)
+
+
+class TestCalculatorAPI:
+    """Test the SimilarityCalculator wrappers."""
+
+    def test_distance_matrix_diagonal(self, fake_calculator):
+        """Test a text set against itself has a zero diagonal."""
+        texts = ["alpha", "beta", "gamma delta"]
+        matrix = fake_calculator.distance_matrix(texts)
+        assert matrix.shape == (3, 3)
+        np.testing.assert_allclose(np.diag(matrix), 0.0, atol=1e-6)
+
+    def test_matrix_matches_calculate_distance(self, fake_calculator):
+        """Test matrix entries agree with calculate_distance."""
+        a, b = ["alpha", "eagle"], ["apple", "beta", "cat"]
+        matrix = fake_calculator.distance_matrix(a, b)
+        assert matrix[1, 2] == pytest.approx(fake_calculator.calculate_distance("eagle", "cat"), abs=1e-6)
+
+    def test_nearest_neighbors(self, fake_calculator):
+        """Test the closest corpus text is returned first."""
+        indices, _ = fake_calculator.nearest_neighbors(["aaaa"], ["eeee", "aaab", "x"], k=2)
+        assert indices[0, 0] == 1
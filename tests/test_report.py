@@ -0,0 +1,93 @@
+"""Tests for report statistics, rendering and input stamps."""
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.report import FIGURES, build_report, stale_figures, summarize
+from src.utils.results_io import load_results_frame
+
+
+def write_results(path, shift=0.0):
+    """Small results file with 3 rates x 2 sentences x 3 runs."""
+    rows = [
+        {"sentence_id": sid, "error_rate": rate, "run": run, "distance": rate + 0.1 * run + sid + shift}
+        for sid in (0, 1) for rate in (0.0, 0.25, 0.5) for run in range(3)
+    ]
+    path.write_text(json.dumps(rows))
+    return rows
+
+
+class TestSummarize:
+    """Test one-pass report statistics."""
+
+    def test_matches_groupby(self, tmp_path):
+        """Test per-rate statistics equal a pandas groupby."""
+        df = pd.DataFrame(write_results(tmp_path / "results.json"))
+        data = summarize(df)
+        expected = df.groupby("error_rate")["distance"].agg(["mean", "std", "min", "max", "count"])
+        for column in expected:
+            np.testing.assert_allclose(data["by_rate"][column], expected[column].to_numpy())
+        assert [len(values) for values in data["values"]] == [6, 6, 6]
+
+    def test_empty_results(self):
+        """Test an empty frame is rejected."""
+        with pytest.raises(ValueError):
+            summarize(pd.DataFrame(columns=["error_rate", "sentence_id", "distance"]))
+
+
+class TestBuildReport:
+    """Test figure rendering and skipping."""
+
+    def test_renders_then_skips(self, tmp_path):
+        """Test a second build with the same input renders nothing."""
+        results = tmp_path / "results.json"
+        write_results(results)
+        first = build_report(results, tmp_path / "out", load_results_frame, dpi=20)
+        assert sorted(first["rendered"]) == sorted(FIGURES)
+        assert all(path.exists() for path in first["paths"].values())
+
+        second = build_report(results, tmp_path / "out", load_results_frame, dpi=20)
+        assert second["rendered"] == []
+
+    def test_changed_input_or_dpi_rerenders(self, tmp_path):
+        """Test new input content or settings make figures stale."""
+        results = tmp_path / "results.json"
+        write_results(results)
+        build_report(results, tmp_path / "out", load_results_frame, dpi=20)
+        write_results(results, shift=1.0)
+        assert build_report(results, tmp_path / "out", load_results_frame, dpi=20)["skipped"] == []
+        assert build_report(results, tmp_path / "out", load_results_frame, dpi=25)["skipped"] == []
+
+    def test_deleted_figure_is_stale(self, tmp_path):
+        """Test a missing figure file is redrawn even with a matching stamp."""
+        results = tmp_path / "results.json"
+        write_results(results)
+        result = build_report(results, tmp_path / "out", load_results_frame, dpi=20)
+        result["paths"]["detailed"].unlink()
+        again = build_report(results, tmp_path / "out", load_results_frame, dpi=20)
+        assert again["rendered"] == ["detailed"]
+
+    def test_overwritten_figure_is_stale(self, tmp_path):
+        """Test a figure file replaced by another command (e.g. analyze) is redrawn."""
+        results = tmp_path / "results.json"
+        write_results(results)
+        result = build_report(results, tmp_path / "out", load_results_frame, dpi=20)
+        result["paths"]["by_sentence"].write_bytes(b"drawn by analyze")
+        again = build_report(results, tmp_path / "out", load_results_frame, dpi=20)
+        assert again["rendered"] == ["by_sentence"]
+        assert result["paths"]["by_sentence"].read_bytes() != b"drawn by analyze"
+
+    def test_parallel_workers(self, tmp_path):
+        """Test figures render in worker processes."""
+        results = tmp_path / "results.json"
+        write_results(results)
+        result = build_report(results, tmp_path / "out", load_results_frame, workers=2, dpi=20)
+        assert all(path.exists() for path in result["paths"].values())
+        assert stale_figures(tmp_path / "out", "other-digest", list(FIGURES), dpi=20) == list(FIGURES)
+
+    def test_unknown_figure(self, tmp_path):
+        """Test requesting an unknown figure is rejected."""
+        results = tmp_path / "results.json"
+        write_results(results)
+        with pytest.raises(ValueError):
+            build_report(results, tmp_path / "out", load_results_frame, figures=["pie"])
@@ -0,0 +1,112 @@
+"""Tests for JSON and columnar NPZ experiment results."""
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.results_io import iter_result_chunks, load_results_frame, read_results, write_results
+
+
+def make_rows():
+    """Experiment-shaped rows with repeated originals and per-stage lists."""
+    rows = []
+    for sentence_id, original in enumerate(["the fox jumps", "naïve café über"]):
+        for run in range(3):
+            rows.append({
+                "sentence_id": sentence_id,
+                "original": original,
+                "error_rate": 0.1 * run,
+                "run": run,
+                "corrupted": f"{original} {run}",
+                "final": original.upper(),
+                "distance": 0.05 * run + sentence_id,
+                "stage_outputs": [f"fr {run}", f"he {run}", original],
+                "hop_distances": [0.1, 0.2, 0.3 + run],
+            })
+    return rows
+
+
+class TestResultsIO:
+    """Test writing and reading results."""
+
+    def test_npz_round_trip(self, tmp_path):
+        """Test an archive reads back as the same rows."""
+        rows = make_rows()
+        write_results(rows, tmp_path / "results.npz")
+        assert read_results(tmp_path / "results.npz") == rows
+
+    def test_json_round_trip(self, tmp_path):
+        """Test JSON output keeps the previous pretty-printed layout."""
+        rows = make_rows()
+        write_results(rows, tmp_path / "results.json")
+        assert (tmp_path / "results.json").read_text(encoding="utf-8") == json.dumps(
+            rows, indent=2, ensure_ascii=False
+        )
+        assert read_results(tmp_path / "results.json", ["run"]) == [{"run": row["run"]} for row in rows]
+
+    def test_strings_are_dictionary_encoded(self, tmp_path):
+        """Test a repeated text column stores each distinct value once."""
+        write_results(make_rows(), tmp_path / "results.npz")
+        with np.load(tmp_path / "results.npz") as archive:
+            assert archive["original.codes"].tolist() == [0, 0, 0, 1, 1, 1]
+            assert len(archive["original.offsets"]) == 3
+            assert archive["sentence_id"].dtype == np.int64
+            assert archive["hop_distances"].shape == (6, 3)
+
+    def test_frame_projection(self, tmp_path):
+        """Test a projected frame has just the requested columns, text as categoricals."""
+        write_results(make_rows(), tmp_path / "results.npz")
+        frame = load_results_frame(tmp_path / "results.npz", ["error_rate", "original"])
+        assert list(frame.columns) == ["error_rate", "original"]
+        assert isinstance(frame["original"].dtype, pd.CategoricalDtype)
+        rows = make_rows()
+        assert frame["original"].tolist() == [row["original"] for row in rows]
+        assert frame["error_rate"].tolist() == [row["error_rate"] for row in rows]
+
+    def test_unknown_column(self, tmp_path):
+        """Test projecting a missing column raises KeyError."""
+        write_results(make_rows(), tmp_path / "results.npz")
+        with pytest.raises(KeyError):
+            load_results_frame(tmp_path / "results.npz", ["nope"])
+
+    def test_rejects_ragged_rows(self, tmp_path):
+        """Test rows with different columns or list lengths are rejected."""
+        with pytest.raises(ValueError):
+            write_results([{"a": 1}, {"b": 2}], tmp_path / "results.npz")
+        with pytest.raises(ValueError):
+            write_results([{"a": [1.0]}, {"a": [1.0, 2.0]}], tmp_path / "results.npz")
+
+    def test_unsupported_suffix(self, tmp_path):
+        """Test an unknown file suffix is rejected."""
+        with pytest.raises(ValueError):
+            write_results(make_rows(), tmp_path / "results.csv")
+
+
+class TestResultChunks:
+    """Test chunked column reading."""
+
+    @pytest.mark.parametrize("suffix", ["json", "jsonl", "npz"])
+    def test_chunks_cover_all_rows(self, tmp_path, suffix):
+        """Test chunks concatenate to the full columns in every format."""
+        rows = make_rows()
+        path = tmp_path / f"results.{suffix}"
+        write_results(rows, path)
+        chunks = list(iter_result_chunks(path, ["distance", "original"], chunk_size=4))
+        assert [len(chunk["distance"]) for chunk in chunks] == [4, 2]
+        assert np.concatenate([chunk["distance"] for chunk in chunks]).tolist() == [row["distance"] for row in rows]
+        assert np.concatenate([chunk["original"] for chunk in chunks]).tolist() == [row["original"] for row in rows]
+
+    def test_compressed_archive(self, tmp_path):
+        """Test chunks stream out of a compressed archive."""
+        rows = make_rows()
+        write_results(rows, tmp_path / "results.npz", compress=True)
+        chunks = list(iter_result_chunks(tmp_path / "results.npz", ["run"], chunk_size=5))
+        assert np.concatenate([chunk["run"] for chunk in chunks]).tolist() == [row["run"] for row in rows]
+
+    @pytest.mark.parametrize("suffix", ["json", "jsonl", "npz"])
+    def test_empty_results(self, tmp_path, suffix):
+        """Test results written from zero rows read back empty in every format."""
+        path = tmp_path / f"results.{suffix}"
+        write_results([], path)
+        assert list(iter_result_chunks(path, ["distance"])) == []
+        assert read_results(path, ["distance"]) == []
+        assert load_results_frame(path, ["distance"]).empty
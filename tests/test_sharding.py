@@ -0,0 +1,66 @@
+"""Tests for experiment sharding and merging."""
+import pytest
+from src.utils.sharding import assign_shards, cell_key, grid_keys, merge_shards, parse_shard
+
+SENTENCES = ["one two three", "four five six", "seven eight nine"]
+RATES = [0.0, 0.25, 0.5]
+
+
+def row(sentence, rate, run, **extra):
+    """Minimal experiment row for a cell."""
+    return {"original": sentence, "error_rate": rate, "run": run, **extra}
+
+
+class TestSharding:
+    """Test the split of the grid into shards."""
+
+    def test_parse_shard(self):
+        """Test i/N parsing and its bounds."""
+        assert parse_shard("2/4") == (2, 4)
+        for spec in ("0/4", "5/4", "2", "a/b"):
+            with pytest.raises(ValueError):
+                parse_shard(spec)
+
+    def test_cell_key_is_content_based(self):
+        """Test keys depend on sentence, rate and run, and treat 0 and 0.0 alike."""
+        assert cell_key("a", 0, 1) == cell_key("a", 0.0, 1)
+        assert len({cell_key("a", 0.1, 0), cell_key("a", 0.1, 1), cell_key("b", 0.1, 0)}) == 3
+
+    def test_shards_partition_grid(self):
+        """Test every cell lands in exactly one shard, whatever the key order."""
+        keys = grid_keys(SENTENCES, RATES, 3)
+        shards = assign_shards(keys, 4)
+        assert set(shards) == set(keys)
+        assert set(shards.values()) <= {1, 2, 3, 4}
+        assert assign_shards(list(reversed(keys)), 4) == shards
+
+    def test_growing_grid_keeps_assignments(self):
+        """Test adding a sentence or runs moves no existing cell to another shard."""
+        keys = grid_keys(SENTENCES, RATES, 3)
+        shards = assign_shards(keys, 3)
+        grown = assign_shards(grid_keys(SENTENCES + ["ten eleven twelve"], RATES, 5), 3)
+        assert {key: grown[key] for key in keys} == shards
+
+
+class TestMerge:
+    """Test combining shard outputs."""
+
+    def test_merge_restores_grid_order(self):
+        """Test rows from shards in any order come out in grid order."""
+        expected = grid_keys(SENTENCES, RATES, 1)
+        rows = [row(s, r, 0) for s in SENTENCES for r in RATES]
+        merged = merge_shards([rows[5:], rows[:2], rows[2:5]], expected)
+        assert merged["rows"] == rows
+        assert merged["duplicates"] == merged["missing"] == merged["unexpected"] == []
+
+    def test_merge_reports_problems(self):
+        """Test duplicate, missing and unexpected cells are reported by key."""
+        expected = grid_keys(SENTENCES[:1], RATES, 1)
+        merged = merge_shards([
+            [row(SENTENCES[0], 0.0, 0, distance=0.1), row(SENTENCES[0], 0.25, 0)],
+            [row(SENTENCES[0], 0.0, 0, distance=0.2), row("other", 0.0, 0)],
+        ], expected)
+        assert merged["duplicates"] == [cell_key(SENTENCES[0], 0.0, 0)]
+        assert merged["missing"] == [cell_key(SENTENCES[0], 0.5, 0)]
+        assert merged["unexpected"] == [cell_key("other", 0.0, 0)]
+        assert merged["rows"][0]["distance"] == 0.1
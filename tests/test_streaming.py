@@ -0,0 +1,83 @@
+"""Tests for streaming grouped statistics and the quantile sketch."""
+import numpy as np
+import pandas as pd
+from src.analysis.streaming import QuantileSketch, StreamingGroupStats
+
+
+def make_frame(n=20_000, seed=0):
+    """Results-shaped frame with 6 rates x 3 sentences."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "error_rate": rng.choice([0.0, 0.1, 0.2, 0.3, 0.4, 0.5], n),
+        "sentence_id": rng.integers(0, 3, n),
+        "distance": rng.gamma(2.0, 0.1, n),
+    })
+
+
+class TestQuantileSketch:
+    """Test the KLL-style sketch."""
+
+    def test_exact_below_capacity(self):
+        """Test quantiles are exact order statistics while nothing is compacted."""
+        values = np.arange(1.0, 101.0)
+        sketch = QuantileSketch(k=200)
+        sketch.update(values[::-1])
+        assert sketch.quantiles([0.0, 0.25, 0.5, 1.0]).tolist() == [1.0, 25.0, 50.0, 100.0]
+
+    def test_bounded_size_and_rank_error(self):
+        """Test a large stream keeps few values and ranks within a small error."""
+        values = np.random.default_rng(1).random(200_000)
+        sketch = QuantileSketch(k=200)
+        for start in range(0, len(values), 997):
+            sketch.update(values[start:start + 997])
+        assert sketch.count == len(values)
+        assert len(sketch) < 1000
+        estimates = sketch.quantiles([0.1, 0.5, 0.9])
+        ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+        np.testing.assert_allclose(ranks, [0.1, 0.5, 0.9], atol=0.02)
+
+    def test_merge(self):
+        """Test merging two sketches covers both streams."""
+        left, right = QuantileSketch(k=64), QuantileSketch(k=64, seed=1)
+        left.update(np.zeros(5000))
+        right.update(np.ones(5000))
+        left.merge(right)
+        assert left.count == 10_000
+        assert left.quantiles([0.25, 0.75]).tolist() == [0.0, 1.0]
+
+    def test_empty(self):
+        """Test an empty sketch has NaN quantiles."""
+        assert np.isnan(QuantileSketch().quantiles([0.5])).all()
+
+
+class TestStreamingGroupStats:
+    """Test chunked per-group aggregation."""
+
+    def test_matches_pandas_groupby(self):
+        """Test chunked count, mean, std, min and max match a full groupby."""
+        frame = make_frame()
+        stats = StreamingGroupStats().consume(
+            {column: frame[column].to_numpy()[start:start + 777] for column in frame}
+            for start in range(0, len(frame), 777)
+        )
+        result = stats.frame()
+        expected = frame.groupby(["error_rate", "sentence_id"])["distance"].agg(
+            ["count", "mean", "std", "min", "max"]
+        ).reset_index()
+        assert stats.rows == len(frame)
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_exact=False, rtol=1e-12)
+
+    def test_median_close_to_exact(self):
+        """Test the sketched median per group is near the exact one."""
+        frame = make_frame(60_000)
+        stats = StreamingGroupStats(sketch_k=256)
+        stats.update({column: frame[column].to_numpy() for column in frame})
+        exact = frame.groupby(["error_rate", "sentence_id"])["distance"].median().to_numpy()
+        np.testing.assert_allclose(stats.frame()["median"].to_numpy(), exact, atol=0.01)
+
+    def test_single_row_group_has_nan_std(self):
+        """Test a group with one value gets NaN std, like pandas."""
+        stats = StreamingGroupStats()
+        stats.update({"error_rate": np.array([0.1]), "sentence_id": np.array([0]), "distance": np.array([0.5])})
+        row = stats.frame().iloc[0]
+        assert row["count"] == 1 and row["mean"] == 0.5 and np.isnan(row["std"])
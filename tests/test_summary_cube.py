@@ -0,0 +1,74 @@
+"""Tests for the incrementally maintained summary cube."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.analysis.summary_cube import SummaryCube, summary_path
+
+
+def _rows(rng, n=300):
+    return [
+        {
+            "sentence_id": int(rng.integers(0, 3)),
+            "error_rate": float(rng.choice([0.0, 0.25, 0.5])),
+            "distance": float(rng.random()),
+            "stage_distances": [float(rng.random()), float(rng.random())],
+        }
+        for _ in range(n)
+    ]
+
+
+class TestSummaryCube:
+    """Test moments, rollups and persistence of the cube."""
+
+    def test_moments_match_pandas(self):
+        """Test count, mean, std, min and max equal a groupby over the rows."""
+        rows = _rows(np.random.default_rng(0))
+        cube = SummaryCube()
+        for start in range(0, len(rows), 37):
+            cube.add_rows(rows[start:start + 37], "m")
+
+        got = cube.frame(stage="final")
+        expected = (pd.DataFrame(rows).groupby(["error_rate", "sentence_id"])["distance"]
+                    .agg(["count", "mean", "std", "min", "max"]).reset_index())
+        assert got["count"].tolist() == expected["count"].tolist()
+        for column in ("mean", "std", "min", "max"):
+            np.testing.assert_allclose(got[column], expected[column], rtol=1e-9)
+
+    def test_rollup_across_models_and_stages(self):
+        """Test grouping by fewer dimensions pools the cells and filters apply."""
+        cube = SummaryCube()
+        cube.add(0, 0.1, "a", "final", [1.0, 2.0])
+        cube.add(0, 0.1, "b", "final", [3.0])
+        cube.add(1, 0.1, "a", "stage1", [10.0])
+
+        pooled = cube.frame(by=("error_rate",), stage="final")
+        assert pooled["count"].tolist() == [3]
+        assert pooled["mean"].tolist() == [2.0]
+        assert pooled["std"].tolist() == pytest.approx([1.0])
+        assert cube.frame(by=("model",), stage="final")["model"].tolist() == ["a", "b"]
+        assert cube.frame(by=("stage",))["count"].tolist() == [3, 1]
+
+    def test_unknown_dimension(self):
+        """Test grouping by a dimension the cube does not have is rejected."""
+        with pytest.raises(ValueError):
+            SummaryCube().frame(by=("run",))
+
+    def test_save_load_roundtrip(self, tmp_path):
+        """Test a saved cube loads with the same statistics and progress."""
+        cube = SummaryCube(total_cells=600)
+        cube.add_rows(_rows(np.random.default_rng(1)), "m")
+        path = summary_path(tmp_path / "experiment.json")
+        cube.save(path)
+
+        loaded = SummaryCube.load(path)
+        assert path.name == "experiment.summary.json"
+        assert loaded.status()["fraction_done"] == 0.5
+        pd.testing.assert_frame_equal(loaded.frame(by=("model", "stage")), cube.frame(by=("model", "stage")))
+        assert not (tmp_path / "experiment.summary.json.tmp").exists()
+
+    def test_quantiles_from_sketches(self):
+        """Test quartiles are exact while every group fits in its sketch."""
+        cube = SummaryCube()
+        cube.add(0, 0.0, "m", "final", np.arange(101, dtype=float))
+        row = cube.frame(stage="final").iloc[0]
+        assert (row["q25"], row["median"], row["q75"]) == pytest.approx((25.0, 50.0, 75.0), abs=1.0)
@@ -0,0 +1,76 @@
+"""Tests for sparse TF-IDF distances."""
+import math
+from collections import Counter
+import numpy as np
+import pytest
+from src.utils.tfidf import distances_to_first, tfidf_distances, tfidf_matrix, tokenize
+
+
+def dense_distances(original, finals):
+    """Reference: dense TF-IDF vectors and Euclidean distances in plain Python."""
+    corpus = [original, *finals]
+    tokenized = [tokenize(text) for text in corpus]
+    vocabulary = sorted({token for tokens in tokenized for token in tokens})
+    doc_freq = Counter(token for tokens in tokenized for token in set(tokens))
+    idf = {term: math.log((1 + len(corpus)) / (1 + doc_freq[term])) + 1.0 for term in vocabulary}
+    vectors = []
+    for tokens in tokenized:
+        counts = Counter(tokens)
+        vectors.append([counts[term] / max(len(tokens), 1) * idf[term] for term in vocabulary])
+    return [math.sqrt(sum((a - b) ** 2 for a, b in zip(vectors[0], vector))) for vector in vectors[1:]]
+
+
+ORIGINAL = "The quick brown fox jumps over the lazy dog near the river bank"
+FINALS = [
+    "The quick brown fox jumps over the lazy dog near the river bank",
+    "Teh quick brwn fox jumps ovr the lazy dog",
+    "",
+    "river river river bank_side",
+    "completely different words here",
+]
+
+
+class TestTfidfMatrix:
+    """Test the sparse TF-IDF matrix."""
+
+    def test_matches_dense_weights(self):
+        """Test each stored weight is tf * smoothed idf."""
+        matrix = tfidf_matrix(["a a b", "b c"])
+        idf_a = math.log(3 / 2) + 1.0
+        idf_b = math.log(3 / 3) + 1.0
+        np.testing.assert_array_equal(matrix.toarray()[0], [2 / 3 * idf_a, 1 / 3 * idf_b, 0.0])
+
+    def test_empty_document_row(self):
+        """Test a document without tokens gives an empty row."""
+        matrix = tfidf_matrix(["a", "!!"])
+        assert matrix[1].nnz == 0
+
+
+class TestTfidfDistances:
+    """Test distances to the original."""
+
+    def test_euclidean_identical_to_dense(self):
+        """Test Euclidean distances equal the dense computation bit for bit."""
+        assert tfidf_distances(ORIGINAL, FINALS) == dense_distances(ORIGINAL, FINALS)
+
+    def test_empty_vocabulary(self):
+        """Test texts without tokens are at distance 0."""
+        assert tfidf_distances("", ["", "123"]) == [0.0, 0.0]
+
+    def test_cosine(self):
+        """Test cosine distance is 0 for the same text and 1 without shared terms."""
+        distances = tfidf_distances(ORIGINAL, FINALS, metric="cosine")
+        assert distances[0] == pytest.approx(0.0, abs=1e-12)
+        assert distances[2] == 1.0
+        assert distances[4] == 1.0
+        assert 0.0 < distances[1] < 1.0
+
+    def test_cosine_both_empty(self):
+        """Test two empty rows are at cosine distance 0."""
+        matrix = tfidf_matrix(["", "", "a"])
+        np.testing.assert_array_equal(distances_to_first(matrix, "cosine"), [0.0, 1.0])
+
+    def test_unknown_metric(self):
+        """Test an unknown metric is rejected."""
+        with pytest.raises(ValueError):
+            tfidf_distances(ORIGINAL, FINALS, metric="manhattan")
@@ -0,0 +1,92 @@
+"""Tests for the alias-table typo engine."""
+import random
+from collections import Counter
+import numpy as np
+import pytest
+from src.utils.typo_engine import DEFAULT_ENGINE, OPERATIONS, build_alias_table
+
+
+def alias_probabilities(prob, alias):
+    """Probability of each outcome implied by an alias table."""
+    n = len(prob)
+    implied = np.array(prob, dtype=float) / n
+    for j in range(n):
+        implied[alias[j]] += (1.0 - prob[j]) / n
+    return implied
+
+
+class TestAliasTable:
+    """Test Vose alias table construction."""
+
+    @pytest.mark.parametrize("weights", [[1, 1, 1], [2, 1], [0.1, 5, 3, 0, 1.9]])
+    def test_exact_probabilities(self, weights):
+        """Test the table reproduces the normalized weights exactly."""
+        prob, alias = build_alias_table(weights)
+        expected = np.array(weights, dtype=float) / sum(weights)
+        np.testing.assert_allclose(alias_probabilities(prob, alias), expected, atol=1e-12)
+
+    def test_rejects_zero_weights(self):
+        """Test an all-zero distribution is rejected."""
+        with pytest.raises(ValueError):
+            build_alias_table([0, 0])
+
+    def test_operation_table(self):
+        """Test the default operation weights cover all four operations."""
+        implied = alias_probabilities(DEFAULT_ENGINE.operation_prob, DEFAULT_ENGINE.operation_alias)
+        np.testing.assert_allclose(implied, DEFAULT_ENGINE.operation_probs, atol=1e-12)
+        assert len(OPERATIONS) == 4
+
+
+class TestTypoEngine:
+    """Test word corruption."""
+
+    def test_word_always_changes(self):
+        """Test every word with a letter is modified."""
+        rng = random.Random(0)
+        for word in ["a", "ab", "hello", "aaaa", "Don't", "x1"]:
+            for _ in range(50):
+                assert DEFAULT_ENGINE.corrupt_word(word, rng) != word
+
+    def test_non_letters_untouched(self):
+        """Test words without letters and punctuation are left alone."""
+        rng = random.Random(1)
+        assert DEFAULT_ENGINE.corrupt_word("123!", rng) == "123!"
+        for _ in range(50):
+            assert DEFAULT_ENGINE.corrupt_word("word,", rng).endswith(",")
+
+    def test_neighbors_on_keyboard(self):
+        """Test substitutions draw from the keyboard neighbours."""
+        for u in np.linspace(0, 0.999, 50):
+            assert DEFAULT_ENGINE.sample_neighbor("g", u) in "ftyhbv"
+        assert DEFAULT_ENGINE.sample_neighbor("G", 0.5).isupper()
+        assert DEFAULT_ENGINE.sample_neighbor("\u212a", 0.5) in "JIOLM"  # Kelvin sign lowercases to k
+
+    def test_vectorized_neighbors_match_scalar(self):
+        """Test sample_neighbor_codes agrees with sample_neighbor."""
+        rng = np.random.default_rng(1)
+        codes = rng.integers(0, 26, 500)
+        u = rng.random(500)
+        sampled = DEFAULT_ENGINE.sample_neighbor_codes(codes, u)
+        expected = [DEFAULT_ENGINE.sample_neighbor("abcdefghijklmnopqrstuvwxyz"[c], x) for c, x in zip(codes, u)]
+        assert ["abcdefghijklmnopqrstuvwxyz"[c] for c in sampled] == expected
+
+    def test_same_row_neighbors_weighted_higher(self):
+        """Test same-row neighbours are drawn more often than other rows."""
+        counts = Counter(DEFAULT_ENGINE.sample_neighbor("g", u) for u in np.random.default_rng(0).random(20000))
+        assert counts["f"] > 1.5 * counts["t"]
+
+    def test_samples_match_distribution(self):
+        """Test corrupt_word follows variant_distribution."""
+        word = "data"
+        variants, probs = DEFAULT_ENGINE.variant_distribution(word)
+        expected = Counter()
+        for variant, p in zip(variants, probs):
+            expected[variant] += p
+        assert sum(expected.values()) == pytest.approx(1.0)
+
+        rng = np.random.default_rng(3)
+        n = 40000
+        observed = Counter(DEFAULT_ENGINE.corrupt_word(word, rng) for _ in range(n))
+        assert set(observed) <= set(expected)
+        total_variation = 0.5 * sum(abs(observed[v] / n - p) for v, p in expected.items())
+        assert total_variation < 0.03
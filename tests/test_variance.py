@@ -0,0 +1,55 @@
+"""Tests for curve variance statistics."""
+import numpy as np
+import pytest
+from src.analysis.variance import corruption_distance, curve_statistics, run_curves, variance_reduction_report
+
+RATES = [0.0, 0.2, 0.4]
+
+
+def make_records(curves):
+    """Experiment-shaped records from {sentence_id: [per-run distance lists]}."""
+    return [
+        {"sentence_id": sentence_id, "run": run, "error_rate": rate, "distance": distance}
+        for sentence_id, runs in curves.items()
+        for run, distances in enumerate(runs)
+        for rate, distance in zip(RATES, distances)
+    ]
+
+
+class TestCurveStatistics:
+    """Test slope and step variance."""
+
+    def test_run_curves_matrix(self):
+        """Test records are grouped into a runs x rates matrix."""
+        rates, distances = run_curves(make_records({0: [[0, 1, 2], [0, 2, 4]]}))[0]
+        np.testing.assert_array_equal(rates, RATES)
+        np.testing.assert_array_equal(distances, [[0, 1, 2], [0, 2, 4]])
+
+    def test_slopes_and_variances(self):
+        """Test slope mean/variance and step variance on exact lines."""
+        stats = curve_statistics(make_records({0: [[0, 0.2, 0.4], [0, 0.4, 0.8]]}))
+        assert stats["num_runs"] == 2
+        assert stats["slope_mean"] == pytest.approx(1.5)
+        assert stats["slope_variance"] == pytest.approx(0.5)
+        assert stats["step_variance"] == pytest.approx(0.02)
+
+    def test_report_ratios(self):
+        """Test variance ratios and the equal-precision run count."""
+        independent = make_records({0: [[0, 0.2, 0.4], [0, 0.4, 0.8]]})
+        nested = make_records({0: [[0, 0.2, 0.4], [0, 0.3, 0.6]]})
+        report = variance_reduction_report(independent, nested)
+        assert report["slope"]["variance_ratio"] == pytest.approx(0.25)
+        assert report["slope"]["runs_for_equal_precision"] == 1
+        assert report["step"]["variance_reduction"] == pytest.approx(0.75)
+
+    def test_single_run_has_no_variance(self):
+        """Test one run per sentence yields NaN variance and no run estimate."""
+        records = make_records({0: [[0, 0.1, 0.2]]})
+        report = variance_reduction_report(records, records)
+        assert np.isnan(report["independent"]["slope_variance"])
+        assert report["slope"]["runs_for_equal_precision"] is None
+
+    def test_corruption_distance(self):
+        """Test the proxy distance is zero for identical text."""
+        assert corruption_distance("same text", "same text") == 0.0
+        assert corruption_distance("abc", "xyz") == 1.0
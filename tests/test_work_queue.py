@@ -0,0 +1,103 @@
+"""Tests for the SQLite experiment work queue."""
+import threading
+import time
+from src.utils.work_queue import Heartbeat, WorkQueue, is_queue
+
+
+def fill(path, count=5, **kwargs):
+    """Queue with `count` jobs k0..k{count-1}."""
+    queue = WorkQueue(path, **kwargs)
+    queue.enqueue((f"k{i}", {"i": i}) for i in range(count))
+    return queue
+
+
+class TestWorkQueue:
+    """Test claiming, leases and completion."""
+
+    def test_enqueue_is_idempotent(self, tmp_path):
+        """Test enqueueing the same keys again adds nothing, and finished jobs start done."""
+        queue = fill(tmp_path / "q.sqlite")
+        assert queue.enqueue([("k0", {"i": 0}), ("k9", {"i": 9})], done={"k9": {"distance": 0.5}}) == 1
+        assert queue.counts() == {"pending": 5, "leased": 0, "done": 1, "failed": 0}
+        assert queue.results() == [{"distance": 0.5}]
+        assert is_queue(tmp_path / "q.sqlite") and not is_queue(tmp_path / "r.json")
+
+    def test_claims_in_order_without_overlap(self, tmp_path):
+        """Test claims follow grid order and a leased job is not handed out twice."""
+        queue = fill(tmp_path / "q.sqlite")
+        other = WorkQueue(tmp_path / "q.sqlite")
+        assert [key for key, _ in queue.claim("a", 2)] == ["k0", "k1"]
+        assert [key for key, _ in other.claim("b", 2)] == ["k2", "k3"]
+        assert queue.claim("a", 1)[0][1] == {"i": 4}
+        assert other.claim("b", 5) == []
+
+    def test_complete_only_by_lease_holder(self, tmp_path):
+        """Test results are stored in order, and only the worker holding the lease can complete."""
+        queue = fill(tmp_path / "q.sqlite", count=2)
+        queue.claim("a", 2)
+        assert not queue.complete("b", "k0", {"r": 0})
+        assert queue.complete("a", "k1", {"r": 1})
+        assert queue.complete("a", "k0", {"r": 0})
+        assert queue.results() == [{"r": 0}, {"r": 1}]
+
+    def test_expired_lease_is_retried(self, tmp_path):
+        """Test a job whose lease ran out goes to another worker, and the late result is rejected."""
+        queue = fill(tmp_path / "q.sqlite", count=1, lease_seconds=0.05)
+        assert queue.claim("slow", 1)
+        time.sleep(0.1)
+        assert [key for key, _ in queue.claim("fast", 1)] == ["k0"]
+        assert not queue.complete("slow", "k0", {"r": "late"})
+        assert queue.complete("fast", "k0", {"r": "on time"})
+
+    def test_heartbeat_keeps_lease(self, tmp_path):
+        """Test heartbeats extend a lease past its original expiry."""
+        queue = fill(tmp_path / "q.sqlite", count=1, lease_seconds=0.2)
+        queue.claim("a", 1)
+        with Heartbeat(tmp_path / "q.sqlite", "a", lease_seconds=0.2, interval=0.05) as heartbeat:
+            heartbeat.keys = ["k0"]
+            time.sleep(0.4)
+            assert queue.claim("b", 1) == []
+        assert heartbeat.lost == 0
+        assert queue.heartbeat("b", ["k0"]) == 0
+
+    def test_failures_retry_then_fail(self, tmp_path):
+        """Test a failing job returns to pending until max_attempts, then is marked failed."""
+        queue = fill(tmp_path / "q.sqlite", count=1, max_attempts=2)
+        for _ in range(2):
+            queue.claim("a", 1)
+            queue.fail("a", "k0", "backend down")
+        assert queue.counts()["failed"] == 1
+        assert queue.failures() == [("k0", "backend down")]
+        assert queue.claim("a", 1) == []
+
+    def test_expired_lease_counts_as_attempt(self, tmp_path):
+        """Test a job whose leases keep expiring is failed after max_attempts."""
+        queue = fill(tmp_path / "q.sqlite", count=1, lease_seconds=0.01, max_attempts=1)
+        queue.claim("a", 1)
+        time.sleep(0.05)
+        assert queue.claim("b", 1) == []
+        assert queue.failures() == [("k0", "lease expired")]
+
+    def test_concurrent_workers_claim_each_job_once(self, tmp_path):
+        """Test workers on separate connections together claim every job exactly once."""
+        fill(tmp_path / "q.sqlite", count=60).close()
+        claimed = []
+
+        def work(name):
+            queue = WorkQueue(tmp_path / "q.sqlite")
+            while True:
+                jobs = queue.claim(name, 3)
+                if not jobs:
+                    break
+                for key, _ in jobs:
+                    claimed.append(key)
+                    assert queue.complete(name, key, {"by": name})
+            queue.close()
+
+        threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(claimed) == sorted(f"k{i}" for i in range(60))
+        assert WorkQueue(tmp_path / "q.sqlite").counts()["done"] == 60
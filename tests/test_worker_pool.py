@@ -0,0 +1,63 @@
+"""Tests for batched encoding and the embedding worker pool."""
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from src.embeddings import worker_pool
+from src.embeddings.similarity import resolve_device
+
+
+class TestBatchedEncoding:
+    """Test config-driven batched encoding in SimilarityCalculator."""
+
+    def test_config_applied(self, fake_calculator):
+        """Test device and batch size come from the embedding config."""
+        assert fake_calculator.model.device == "cpu"
+        assert fake_calculator.batch_size == 8
+
+    def test_auto_device(self):
+        """Test `auto` defers to SentenceTransformer's device detection."""
+        assert resolve_device("auto") is None
+        assert resolve_device("cuda") == "cuda"
+
+    def test_encode_deduplicates_and_caches(self, fake_calculator):
+        """Test repeated texts are encoded once, in a single call."""
+        embeddings = fake_calculator.encode(["alpha", "beta", "alpha"])
+        assert embeddings.shape == (3, 4)
+        assert fake_calculator.model.encode_calls == [["alpha", "beta"]]
+        fake_calculator.encode(["beta"])
+        assert len(fake_calculator.model.encode_calls) == 1
+
+    def test_batch_matches_pairwise(self, fake_calculator):
+        """Test batched distances equal per-pair distances."""
+        pairs = [("alpha", "beta"), ("eagle", "apple"), ("same", "same")]
+        batched = fake_calculator.batch_calculate(pairs)
+        single = [fake_calculator.calculate_distance(a, b) for a, b in pairs]
+        assert batched == pytest.approx(single, abs=1e-6)
+
+
+class TestWorkerPool:
+    """Test shard layout and shared-memory hand-off."""
+
+    def test_shards_cover_rows(self):
+        """Test shards are contiguous and cover every row once."""
+        pool = worker_pool.EmbeddingPool.__new__(worker_pool.EmbeddingPool)
+        pool.num_workers, pool.batch_size = 4, 8
+        shards = pool._shards(100)
+        assert shards[0][0] == 0 and shards[-1][1] == 100
+        assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+
+    def test_encode_shard_writes_shared_memory(self, monkeypatch, fake_sentence_model):
+        """Test a worker writes its rows into the shared block."""
+        monkeypatch.setattr(worker_pool, "_worker_model", fake_sentence_model)
+        shm = shared_memory.SharedMemory(create=True, size=3 * 4 * 4)
+        try:
+            out = np.ndarray((3, 4), dtype=np.float32, buffer=shm.buf)
+            out[:] = 0
+            worker_pool._encode_shard(shm.name, (3, 4), 1, ["aa", "eee"])
+            assert out[0].tolist() == [0, 0, 0, 0]
+            assert out[1].tolist() == [2, 2, 0, 1]
+            assert out[2].tolist() == [3, 0, 3, 1]
+        finally:
+            del out
+            shm.close()
+            shm.unlink()